@@ -1,14 +1,26 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+import asyncio
+import json
 import sys
 import os
+import threading
 
 # 프로젝트 루트를 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from app.models.fallacy_detector import FallacyDetector, FallacyResult
+from app.models.fallacy_detector import FallacyDetector, FallacyResult, InferencePlan, TopicPrefix, build_context_prefix
 from app.models.translator import Translator
+from app.services.batch_scheduler import BatchScheduler
+from app.services import executors
+from app.services.executors import ExecutorBusyError
+from app.services.model_registry import ModelActivationError, ModelRegistry, ServingModel
+from app.services.result_cache import ResultCache
+from app.services.topic_registry import TOPICS_DIR, FileTopicStore, TopicArtifacts, TopicRegistry
+from app.services.startup import DEGRADED, READY, STARTING, StartupReport
+from app.services.training_jobs import FINISHED_STATES, SUCCEEDED, TrainingJobManager
 
 try:
     from config.settings import settings
@@ -17,7 +29,46 @@ except ImportError:
     class Settings:
         FALLACY_MODEL_PATH = os.getenv("FALLACY_MODEL_PATH", None)
         DEFAULT_MODEL_NAME = os.getenv("DEFAULT_MODEL_NAME", "distilbert-base-uncased")
+        MODEL_PRECISION = os.getenv("MODEL_PRECISION", "fp32").lower()
+        INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch").lower()
+        ONNX_EXPORT_ON_TRAIN = os.getenv("ONNX_EXPORT_ON_TRAIN", "true").lower() == "true"
+        MODEL_MMAP_WEIGHTS = os.getenv("MODEL_MMAP_WEIGHTS", "true").lower() == "true"
+        EARLY_EXIT_THRESHOLD = float(os.getenv("EARLY_EXIT_THRESHOLD", "0"))
+        EARLY_EXIT_LAYERS = os.getenv("EARLY_EXIT_LAYERS", "3,6,9")
         TRANSLATION_ENABLED = os.getenv("TRANSLATION_ENABLED", "true").lower() == "true"
+        BATCHING_ENABLED = os.getenv("BATCHING_ENABLED", "true").lower() == "true"
+        BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+        BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+        LENGTH_BUCKETS = os.getenv("LENGTH_BUCKETS", "32,64,128,256,512")
+        INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+        INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+        INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", "64"))
+        TORCH_INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+        TORCH_INTER_OP_THREADS = int(os.getenv("TORCH_INTER_OP_THREADS", "0"))
+        RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+        RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+        RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+        RESULT_CACHE_REDIS_URL = os.getenv("RESULT_CACHE_REDIS_URL", "")
+        CHUNK_CACHE_MAX_ENTRIES = int(os.getenv("CHUNK_CACHE_MAX_ENTRIES", "20000"))
+        TOPIC_RELEVANCE_MODEL = os.getenv("TOPIC_RELEVANCE_MODEL", "jhgan/ko-sroberta-multitask")
+        TOPIC_EMBEDDING_CACHE_SIZE = int(os.getenv("TOPIC_EMBEDDING_CACHE_SIZE", "1024"))
+        TOPIC_REGISTRY_MAX_TOPICS = int(os.getenv("TOPIC_REGISTRY_MAX_TOPICS", "10000"))
+        MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "./models/registry")
+        MODEL_REGISTRY_KEEP_VERSIONS = int(os.getenv("MODEL_REGISTRY_KEEP_VERSIONS", "3"))
+        MODEL_DRAIN_TIMEOUT_SECONDS = float(os.getenv("MODEL_DRAIN_TIMEOUT_SECONDS", "30"))
+        MODEL_WARMUP_FILE = os.getenv("MODEL_WARMUP_FILE", "")
+        TOKENIZED_CACHE_DIR = os.getenv("TOKENIZED_CACHE_DIR", "./data/tokenized_cache")
+        TRAINING_CPU_CORES = int(os.getenv("TRAINING_CPU_CORES", "0"))
+        TRAINING_NICE = int(os.getenv("TRAINING_NICE", "10"))
+        TRAINING_MAX_QUEUED_JOBS = int(os.getenv("TRAINING_MAX_QUEUED_JOBS", "4"))
+        TRAINING_JOB_HISTORY = int(os.getenv("TRAINING_JOB_HISTORY", "20"))
+        TRAINING_BATCHING = os.getenv("TRAINING_BATCHING", "length_grouped")
+        TRAINING_MAX_TOKENS_PER_BATCH = int(os.getenv("TRAINING_MAX_TOKENS_PER_BATCH", "8192"))
+        TRAINING_MODE = os.getenv("TRAINING_MODE", "full")
+        LORA_RANK = int(os.getenv("LORA_RANK", "8"))
+        LORA_TARGET_MODULES = os.getenv("LORA_TARGET_MODULES", "query,value")
+        READINESS_REQUIRE_MODEL = os.getenv("READINESS_REQUIRE_MODEL", "true").lower() == "true"
     settings = Settings()
 
 import logging
@@ -29,33 +80,231 @@ router = APIRouter()
 # 전역 인스턴스
 detector = None
 translator = None
+scheduler = None
+result_cache = None
+topic_registry = None
+model_registry = None
+training_jobs = None
+# 시작 단계별 소요 시간과 준비 상태 (모델은 백그라운드에서 로드)
+startup_report = StartupReport()
+
+def _detector_options() -> Dict:
+    """FallacyDetector 추론 옵션 (길이 버킷, 버킷별 최대 배치 크기, 정밀도, 추론 백엔드, 청크 캐시, 조기 종료, 주제 연관성, 가중치 매핑)"""
+    return {
+        "length_buckets": [int(b) for b in settings.LENGTH_BUCKETS.split(",") if b.strip()],
+        "max_batch_size": settings.INFERENCE_MAX_BATCH_SIZE,
+        "precision": settings.MODEL_PRECISION,
+        "backend": settings.INFERENCE_BACKEND,
+        "intra_op_threads": settings.TORCH_INTRA_OP_THREADS,
+        "chunk_cache_size": settings.CHUNK_CACHE_MAX_ENTRIES,
+        "early_exit_threshold": settings.EARLY_EXIT_THRESHOLD,
+        "relevance_model": settings.TOPIC_RELEVANCE_MODEL or None,
+        "relevance_cache_size": settings.TOPIC_EMBEDDING_CACHE_SIZE,
+        "mmap_weights": settings.MODEL_MMAP_WEIGHTS
+    }
+
+def _create_detector(model_path: Optional[str]) -> FallacyDetector:
+    """모델 디렉토리로 탐지기 생성 (주제 연관성 scorer는 서빙 중인 탐지기의 것을 재사용)"""
+    return FallacyDetector(
+        model_path=model_path,
+        model_name=settings.DEFAULT_MODEL_NAME,
+        relevance_scorer=detector.relevance_scorer if detector is not None else None,
+        **_detector_options()
+    )
+
+def _load_warmup_texts() -> Optional[List[str]]:
+    """워밍업 입력 (문자열 목록 또는 [{"text": ...}] JSON, 지정하지 않으면 내장 예시)"""
+    if not settings.MODEL_WARMUP_FILE:
+        return None
+    try:
+        with open(settings.MODEL_WARMUP_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        return [item["text"] if isinstance(item, dict) else item for item in items]
+    except Exception as e:
+        logger.warning(f"Could not load warm-up inputs, using built-in samples: {e}")
+        return None
+
+def _on_model_swap(new_detector: FallacyDetector):
+    """서빙 모델 교체 시 전역 참조 갱신 (이벤트 루프 안에서 한 번에 실행)"""
+    global detector
+    detector = new_detector
+    if scheduler is not None:
+        scheduler.detector = new_detector
+    # 등록된 토픽 산출물은 다음 조회 시 새 모델 기준으로 다시 계산
+    if topic_registry is not None:
+        topic_registry.detector = new_detector
+    # 새 모델 버전은 캐시 키가 달라지므로 이전 결과는 조회되지 않음 (로컬 메모리만 즉시 정리)
+    if result_cache is not None:
+        result_cache.clear()
+
+def _acquire_model() -> Optional[ServingModel]:
+    """요청 동안 사용할 서빙 모델 (요청이 끝나면 release, 그 사이 교체되어도 같은 모델로 완료)"""
+    if startup_report.loading:
+        # 로드 중에는 폴백 응답 대신 503으로 알려 클라이언트가 재시도하도록 함
+        raise HTTPException(status_code=503, detail="모델을 로드하는 중입니다.", headers={"Retry-After": "5"})
+    return model_registry.acquire() if model_registry is not None else None
+
+def _import_inference_libraries():
+    """추론 라이브러리 import (시작 보고서에서 가중치 로드와 구분하여 측정)"""
+    import transformers  # noqa: F401
+    if settings.INFERENCE_BACKEND == "onnx":
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            pass
+    else:
+        import torch  # noqa: F401
 
 def initialize_services():
-    """서비스 초기화"""
-    global detector, translator
+    """서비스 초기화 (모델 로드/워밍업 포함, 블로킹)
+    
+    단일 프로세스 서빙에서는 start_background_initialization으로 백그라운드 스레드에서 실행하고,
+    prefork 서버는 fork 전에 부모 프로세스에서 직접 호출합니다.
+    """
+    global detector, translator, scheduler, result_cache, topic_registry, model_registry, training_jobs
+    
+    if not startup_report.begin_loading():
+        return
+    warmed_up = False
+    error = None
+    
+    # 동일 논증 재제출/클라이언트 재시도는 모델을 다시 실행하지 않고 캐시에서 응답
+    if settings.RESULT_CACHE_ENABLED and result_cache is None:
+        result_cache = ResultCache(
+            max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+            ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+            redis_url=settings.RESULT_CACHE_REDIS_URL or None
+        )
     
     try:
+        with startup_report.phase("library_import"):
+            _import_inference_libraries()
+        
+        # 추론/재학습 전용 실행기 (이벤트 루프에서 블로킹 작업 분리)
+        executors.initialize_executors(
+            inference_workers=settings.INFERENCE_WORKERS,
+            inference_max_pending=settings.INFERENCE_MAX_PENDING,
+            intra_op_threads=settings.TORCH_INTRA_OP_THREADS,
+            inter_op_threads=settings.TORCH_INTER_OP_THREADS,
+            # ONNX 백엔드는 torch 없이 서빙 (스레드 수는 ORT 세션 옵션으로 설정)
+            configure_torch=settings.INFERENCE_BACKEND != "onnx"
+        )
+        
         # 모델 경로가 지정되어 있으면 로드 시도, 없으면 기본 모델명 사용
         model_path = settings.FALLACY_MODEL_PATH if hasattr(settings, 'FALLACY_MODEL_PATH') and settings.FALLACY_MODEL_PATH else None
-        detector = FallacyDetector(
-            model_path=model_path,
-            model_name=settings.DEFAULT_MODEL_NAME
+        # 재학습한 버전이 활성화되어 있으면 그 버전, 없으면 FALLACY_MODEL_PATH를 기본 버전으로 로드 후 워밍업
+        model_registry = ModelRegistry(
+            settings.MODEL_REGISTRY_DIR,
+            _create_detector,
+            executors.training_executor,
+            warmup_texts=_load_warmup_texts(),
+            keep_versions=settings.MODEL_REGISTRY_KEEP_VERSIONS,
+            drain_timeout=settings.MODEL_DRAIN_TIMEOUT_SECONDS
         )
-        translator = Translator()
+        detector = model_registry.load_initial(model_path)
+        model_registry.add_swap_callback(_on_model_swap)
+        initial_load = model_registry.last_activation
+        startup_report.record("weight_load", initial_load["load_seconds"])
+        startup_report.record("warmup", initial_load["warmup_seconds"])
+        warmed_up = initial_load["warmup_seconds"] is not None
+        if not warmed_up:
+            error = "Model could not be loaded or warm-up inference failed"
+        
+        with startup_report.phase("services"):
+            # 재학습은 작업으로 등록하고 별도 프로세스에서 실행 (끝나면 레지스트리에 등록 후 활성화)
+            training_jobs = TrainingJobManager(
+                model_registry,
+                train_options={
+                    "export_onnx": settings.ONNX_EXPORT_ON_TRAIN,
+                    "early_exit_layers": [int(layer) for layer in settings.EARLY_EXIT_LAYERS.split(",") if layer.strip()],
+                    "tokenized_cache_dir": settings.TOKENIZED_CACHE_DIR or None,
+                    "batching": settings.TRAINING_BATCHING,
+                    "max_tokens_per_batch": settings.TRAINING_MAX_TOKENS_PER_BATCH,
+                    "lora_rank": settings.LORA_RANK,
+                    "lora_target_modules": [name.strip() for name in settings.LORA_TARGET_MODULES.split(",") if name.strip()]
+                },
+                cpu_cores=settings.TRAINING_CPU_CORES,
+                nice=settings.TRAINING_NICE,
+                max_queued=settings.TRAINING_MAX_QUEUED_JOBS,
+                history=settings.TRAINING_JOB_HISTORY,
+                mode=settings.TRAINING_MODE
+            )
+            translator = Translator()
+            # 토픽 ID로 등록된 컨텍스트 접두어/키워드/임베딩 (워커 간 공유는 결과 캐시의 Redis, 없으면 파일 저장소)
+            topic_shared = result_cache.shared if result_cache is not None else None
+            if topic_shared is None:
+                topic_shared = FileTopicStore(os.path.join(settings.MODEL_REGISTRY_DIR, TOPICS_DIR))
+            topic_registry = TopicRegistry(
+                detector,
+                executors.inference_executor,
+                max_topics=settings.TOPIC_REGISTRY_MAX_TOPICS,
+                shared=topic_shared
+            )
+            if settings.BATCHING_ENABLED:
+                scheduler = BatchScheduler(
+                    detector,
+                    executors.inference_executor,
+                    max_batch_size=settings.BATCH_MAX_SIZE,
+                    max_wait_ms=settings.BATCH_MAX_WAIT_MS
+                )
         logger.info("Services initialized successfully")
     except Exception as e:
         logger.warning(f"Failed to initialize services: {e}. Service will run in fallback mode.")
         # 폴백 모드로 계속 진행
         detector = None
         translator = Translator()
+        scheduler = None
+        topic_registry = None
+        model_registry = None
+        training_jobs = None
+        warmed_up = False
+        error = str(e)
+    finally:
+        # 워밍업 추론까지 성공해야 준비 완료 (실패하면 폴백 모드로 degraded)
+        startup_report.finish(warmed_up, error)
+
+def start_background_initialization():
+    """백그라운드 스레드에서 서비스 초기화 (liveness는 바로 응답, 준비 상태는 /ready로 확인)"""
+    if startup_report.state != STARTING:
+        return
+    threading.Thread(target=initialize_services, name="model-loader", daemon=True).start()
+
+def start_service_tasks():
+    """이벤트 루프에서 도는 서비스 작업 시작 (prefork 워커는 부모가 초기화한 서비스를 받아 시작 시 호출)"""
+    if training_jobs is not None:
+        # 다른 워커로 등록된 재학습 작업도 대기열에서 가져갈 수 있도록 워커마다 대기열 확인 시작
+        training_jobs.start()
+    if model_registry is not None:
+        # 다른 워커가 교체/롤백한 활성 버전을 이 워커도 따라 서빙
+        model_registry.start_following()
+
+async def shutdown_services():
+    """서비스 종료 (배치 워커, 재학습 작업 및 실행기 정리)"""
+    if scheduler is not None:
+        await scheduler.stop()
+    if training_jobs is not None:
+        await training_jobs.stop()
+    if model_registry is not None:
+        model_registry.stop_following()
+    executors.shutdown_executors()
 
-# 서비스 초기화
-initialize_services()
+def _build_context_text(text: str, topic_title: Optional[str], topic_description: Optional[str]) -> str:
+    """논증 앞에 부모 토픽 정보를 자연스러운 한국어 형식으로 추가"""
+    return build_context_prefix(topic_title, topic_description) + text
+
+async def _resolve_topic(topic_id: str) -> TopicArtifacts:
+    """등록된 토픽 조회 (없으면 404)"""
+    topic = await topic_registry.get(topic_id) if topic_registry is not None else None
+    if topic is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 토픽입니다: {topic_id}")
+    return topic
 
 # Request/Response 모델
 class DetectRequest(BaseModel):
     text: str
     language: str = "ko"
+    topic_id: Optional[str] = None  # 등록된 토픽 ID (지정 시 topic_title/topic_description 대신 사용)
     topic_title: Optional[str] = None
     topic_description: Optional[str] = None
 
@@ -66,10 +315,37 @@ class DetectResponse(BaseModel):
     explanation: str
     topic_relevance: Optional[float] = None  # 주제 연관성 점수
     logical_structure: Optional[Dict] = None  # 논리 구조 정보
+    exit_layer: Optional[int] = None  # 조기 종료 사용 시 결과를 확정한 인코더 레이어
+
+class DetectStreamRequest(DetectRequest):
+    stop_confidence: Optional[float] = None  # 청크 하나의 오류 신뢰도가 이 값 이상이면 나머지 청크 생략
+
+class BatchDetectItem(BaseModel):
+    text: str
+    topic_id: Optional[str] = None
+    topic_title: Optional[str] = None
+    topic_description: Optional[str] = None
 
 class BatchDetectRequest(BaseModel):
-    texts: List[str]
+    texts: List[str] = []  # 토픽 없는 텍스트 목록 (하위 호환)
+    items: List[BatchDetectItem] = []  # 항목별 토픽 정보 포함
     language: str = "ko"
+    topic_id: Optional[str] = None  # 모든 항목 공통 토픽 (항목별 값이 우선)
+    topic_title: Optional[str] = None
+    topic_description: Optional[str] = None
+
+class TopicRequest(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+class TopicResponse(BaseModel):
+    topic_id: str
+    title: Optional[str]
+    description: Optional[str]
+    prefix_token_count: int
+    keyword_count: int
+    has_embedding: bool
+    registered_at: float
 
 class BatchDetectResponse(BaseModel):
     results: List[DetectResponse]
@@ -78,100 +354,341 @@ class RetrainRequest(BaseModel):
     training_data: List[Dict[str, str]]  # [{"text": "...", "label": "..."}]
 
 class RetrainResponse(BaseModel):
-    status: str
-    model_path: str
+    status: str  # queued (작업 상태는 /retrain/jobs/{job_id}로 조회)
+    job_id: str
     message: str
 
+def _detect_response(result: FallacyResult) -> DetectResponse:
+    return DetectResponse(
+        has_fallacy=result.has_fallacy,
+        fallacy_type=result.fallacy_type,
+        confidence=result.confidence,
+        explanation=result.explanation,
+        topic_relevance=result.topic_relevance,
+        logical_structure=result.logical_structure,
+        exit_layer=result.exit_layer
+    )
+
 class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
     translation_enabled: bool
+    active_version: Optional[str] = None  # 모델 레지스트리의 서빙 중인 버전
+    model_version: Optional[str] = None  # 가중치/백엔드/정밀도 기준 모델 버전 (결과 캐시 키에 포함)
+    startup_state: str = "ready"  # starting / loading / ready / degraded
+
+class ActivateModelRequest(BaseModel):
+    version: str
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    """서비스 상태 확인"""
+    """서비스 상태 확인 (liveness, 모델 로드 중에도 바로 응답)"""
     return HealthResponse(
         status="healthy",
         model_loaded=detector is not None and detector.model is not None,
-        translation_enabled=translator is not None and translator.enabled
+        translation_enabled=translator is not None and translator.enabled,
+        active_version=model_registry.active.version if model_registry is not None and model_registry.active else None,
+        model_version=detector.model_version if detector is not None else None,
+        startup_state=startup_report.state
+    )
+
+@router.get("/ready")
+async def readiness_check():
+    """준비 상태 (모델 로드와 워밍업 추론이 끝나야 200, 그 전에는 503)"""
+    report = startup_report.to_dict()
+    ready = startup_report.state == READY or (
+        startup_report.state == DEGRADED and not settings.READINESS_REQUIRE_MODEL
+    )
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, **report})
+
+@router.get("/startup")
+async def startup_metrics():
+    """시작 단계별 소요 시간 (앱 import, 추론 라이브러리 import, 가중치 로드, 워밍업, 서비스 구성)"""
+    return startup_report.to_dict()
+
+# 글자 수 제한 (이중 체크)
+MAX_CONTENT_LENGTH = 5000
+
+def _validate_length(text: str):
+    if len(text) > MAX_CONTENT_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"논증 내용은 최대 {MAX_CONTENT_LENGTH}자까지 작성할 수 있습니다. (현재: {len(text)}자)"
+        )
+
+def _fallback_response() -> DetectResponse:
+    """폴백 모드: 기본 응답"""
+    return DetectResponse(
+        has_fallacy=False,
+        fallacy_type=None,
+        confidence=0.0,
+        explanation="모델이 로드되지 않았습니다. 기본값을 반환합니다."
     )
 
+async def _resolve_request_topic(request: DetectRequest) -> Tuple[Optional[str], Optional[str], Optional[TopicPrefix]]:
+    """요청의 토픽 정보 (등록된 토픽이면 미리 토크나이징한 컨텍스트 접두어 포함)"""
+    if request.topic_id:
+        # 등록된 토픽: 미리 토크나이징한 컨텍스트 접두어를 논증 토큰 앞에 그대로 이어 붙임
+        topic = await _resolve_topic(request.topic_id)
+        return topic.title, topic.description, topic.prefix
+    return request.topic_title, request.topic_description, None
+
+def _context_for(detector: FallacyDetector, text: str, topic_title: Optional[str], topic_description: Optional[str],
+                 prefix: Optional[TopicPrefix]) -> Tuple[str, Optional[TopicPrefix]]:
+    """논증과 토픽 컨텍스트 접두어 (등록되지 않은 토픽도 접두어로 인코딩하여 논증과 분리)
+    
+    토크나이저가 없는 폴백 모드에서만 토픽 정보를 문자열로 논증 앞에 붙입니다.
+    """
+    if prefix is None:
+        prefix = detector.context_prefix(topic_title, topic_description)
+        if prefix is None:
+            return _build_context_text(text, topic_title, topic_description), None
+    return text, prefix
+
+async def _prepare_context_text(detector: FallacyDetector, request: DetectRequest, topic_title: Optional[str],
+                                topic_description: Optional[str],
+                                prefix: Optional[TopicPrefix]) -> Tuple[str, Optional[TopicPrefix], bool]:
+    """분석할 텍스트 구성 (토픽 컨텍스트 접두어, 영어 입력은 논증만 번역) -> (텍스트, 접두어, 번역 여부)"""
+    # 논증의 부모 토픽 정보를 컨텍스트로 추가 (자연스러운 한국어 형식)
+    # 토픽 정보가 있으면 항상 컨텍스트에 포함하여 분석 정확도 향상
+    context_text, prefix = _context_for(detector, request.text, topic_title, topic_description, prefix)
+    if topic_title or topic_description:
+        logger.info("논증의 부모 토픽 정보가 컨텍스트에 포함되었습니다 (주제: %s)", topic_title or "제목 없음")
+    else:
+        # 토픽 정보가 없는 경우 (일반적으로 발생하지 않아야 함)
+        logger.warning("논증의 부모 토픽 정보가 제공되지 않았습니다. 논증 내용만 분석합니다.")
+    
+    # 한국어 모델을 사용하므로 번역 불필요 (한국어 그대로 분석)
+    # 영어 입력인 경우에만 한국어로 번역 (초기 학습 데이터 준비용)
+    if request.language == "en" and settings.TRANSLATION_ENABLED and translator and translator.enabled:
+        # 영어 입력은 한국어로 번역 후 분석 (선택적)
+        translated = await asyncio.to_thread(translator.translate_to_korean, context_text, "en")
+        if translated:
+            logger.info("영어 텍스트를 한국어로 번역하여 분석합니다")
+            return translated, prefix, True
+        logger.warning("번역 실패: 원본 영어 텍스트를 사용합니다")
+    return context_text, prefix, False
+
 @router.post("/detect", response_model=DetectResponse)
 async def detect_fallacy(request: DetectRequest):
     """단일 텍스트 논리 오류 탐지"""
+    serving = _acquire_model()
+    detector = serving.detector if serving is not None else None
     try:
-        # 글자 수 제한 검증 (이중 체크)
-        MAX_CONTENT_LENGTH = 5000
-        if len(request.text) > MAX_CONTENT_LENGTH:
-            raise HTTPException(
-                status_code=400,
-                detail=f"논증 내용은 최대 {MAX_CONTENT_LENGTH}자까지 작성할 수 있습니다. (현재: {len(request.text)}자)"
-            )
+        _validate_length(request.text)
         
         if detector is None:
-            # 폴백 모드: 기본 응답 반환
-            return DetectResponse(
-                has_fallacy=False,
-                fallacy_type=None,
-                confidence=0.0,
-                explanation="모델이 로드되지 않았습니다. 기본값을 반환합니다."
+            return _fallback_response()
+        
+        topic_title, topic_description, prefix = await _resolve_request_topic(request)
+        
+        # 같은 모델 버전에서 같은 논증/토픽/언어로 탐지한 결과가 있으면 재사용
+        cache_key = None
+        if result_cache is not None:
+            cache_key = ResultCache.make_key(
+                detector.model_version, request.text, topic_title, topic_description, request.language
             )
+            cached = await result_cache.get(cache_key)
+            if cached is not None:
+                return DetectResponse(**cached)
         
-        text = request.text
-        
-        # 논증의 부모 토픽 정보를 컨텍스트로 추가 (자연스러운 한국어 형식)
-        # 토픽 정보가 있으면 항상 컨텍스트에 포함하여 분석 정확도 향상
-        context_text = text
-        if request.topic_title or request.topic_description:
-            context_parts = []
-            if request.topic_title:
-                context_parts.append(f"토론 주제: {request.topic_title}")
-            if request.topic_description:
-                context_parts.append(f"주제 설명: {request.topic_description}")
-            context_parts.append(f"다음은 위 주제에 대한 논증입니다: {text}")
-            context_text = "\n\n".join(context_parts)
-            logger.info("논증의 부모 토픽 정보가 컨텍스트에 포함되었습니다 (주제: %s)", request.topic_title or "제목 없음")
-        else:
-            # 토픽 정보가 없는 경우 (일반적으로 발생하지 않아야 함)
-            logger.warning("논증의 부모 토픽 정보가 제공되지 않았습니다. 논증 내용만 분석합니다.")
-        
-        # 한국어 모델을 사용하므로 번역 불필요 (한국어 그대로 분석)
-        # 영어 입력인 경우에만 한국어로 번역 (초기 학습 데이터 준비용)
-        if request.language == "en" and settings.TRANSLATION_ENABLED and translator and translator.enabled:
-            # 영어 입력은 한국어로 번역 후 분석 (선택적)
-            translated = translator.translate_to_korean(context_text, "en")
-            if translated:
-                context_text = translated
-                logger.info("영어 텍스트를 한국어로 번역하여 분석합니다")
-            else:
-                logger.warning("번역 실패: 원본 영어 텍스트를 사용합니다")
+        context_text, prefix, _ = await _prepare_context_text(detector, request, topic_title, topic_description, prefix)
         
         # 논리 오류 탐지 (한국어 모델로 직접 분석, 계층적 분석 포함)
-        result = detector.predict(
-            context_text,
-            topic_title=request.topic_title,
-            topic_description=request.topic_description
-        )
+        # 배칭이 켜져 있으면 동시 요청과 함께 한 번의 forward pass로 처리
+        if scheduler is not None:
+            result = await scheduler.submit(
+                context_text,
+                topic_title=topic_title,
+                topic_description=topic_description,
+                prefix=prefix,
+                detector=detector
+            )
+        else:
+            result = await executors.inference_executor.run(
+                detector.predict,
+                context_text,
+                topic_title=topic_title,
+                topic_description=topic_description,
+                prefix=prefix
+            )
         
-        return DetectResponse(
-            has_fallacy=result.has_fallacy,
-            fallacy_type=result.fallacy_type,
-            confidence=result.confidence,
-            explanation=result.explanation,
-            topic_relevance=result.topic_relevance,
-            logical_structure=result.logical_structure
-        )
+        response = _detect_response(result)
+        if cache_key is not None:
+            await result_cache.set(cache_key, response.model_dump())
+        return response
     
     except HTTPException:
         raise
+    except ExecutorBusyError as e:
+        logger.warning(f"Detection rejected: {e}")
+        raise HTTPException(status_code=503, detail="추론 요청이 많아 잠시 후 다시 시도해주세요.")
     except Exception as e:
         logger.error(f"Detection failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if serving is not None:
+            serving.release()
+
+def _chunk_outputs(detector: FallacyDetector, plan: InferencePlan):
+    """청크별 (인덱스, 확률, 종료 레이어)를 계산되는 대로 반환하는 비동기 이터레이터"""
+    if scheduler is not None:
+        # 동시 요청의 청크와 함께 마이크로 배칭
+        return scheduler.stream_chunks(plan, detector)
+    
+    async def sequential():
+        for index, chunk in enumerate(plan.chunks):
+            probabilities, exit_layers = await executors.inference_executor.run(
+                detector.predict_chunk_proba, [chunk.input_ids], True
+            )
+            yield index, probabilities[0], None if exit_layers is None else int(exit_layers[0])
+    return sequential()
+
+def _stream_record(record: Dict, sse: bool) -> str:
+    """스트림 레코드 직렬화 (NDJSON 한 줄 또는 SSE 이벤트)"""
+    payload = json.dumps(record, ensure_ascii=False)
+    if sse:
+        return f"event: {record['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+async def _stream_detection(serving: Optional[ServingModel], detector: FallacyDetector, request: DetectStreamRequest,
+                            topic_title: Optional[str], topic_description: Optional[str],
+                            prefix: Optional[TopicPrefix], sse: bool):
+    """청크 결과를 계산되는 대로 내보내고 마지막에 집계 결과를 내보내는 스트림 (끝나면 서빙 모델 반환)"""
+    try:
+        cache_key = None
+        if result_cache is not None:
+            cache_key = ResultCache.make_key(
+                detector.model_version, request.text, topic_title, topic_description, request.language
+            )
+            cached = await result_cache.get(cache_key)
+            if cached is not None:
+                yield _stream_record({"type": "result", **cached, "completed_chunks": 0, "total_chunks": 0,
+                                      "stopped_early": False, "cached": True}, sse)
+                return
+        
+        context_text, prefix, _ = await _prepare_context_text(
+            detector, request, topic_title, topic_description, prefix
+        )
+        
+        if detector.model is None or detector.tokenizer is None:
+            result = await executors.inference_executor.run(
+                detector.predict, context_text, topic_title, topic_description, prefix
+            )
+            yield _stream_record({"type": "result", **_detect_response(result).model_dump(), "completed_chunks": 0,
+                                  "total_chunks": 0, "stopped_early": False, "cached": False}, sse)
+            return
+        
+        plan = await executors.inference_executor.run(detector.plan_inference, context_text, prefix=prefix)
+        total = len(plan.chunks)
+        # 청크 구간은 논증 원문 기준 (토픽 컨텍스트 제외, 번역한 경우에는 번역문 기준)
+        offset = plan.prefix_length
+        
+        rows: List = [None] * total
+        exit_layers: List[Optional[int]] = [None] * total
+        stopped_early = False
+        outputs = _chunk_outputs(detector, plan)
+        try:
+            async for index, row, exit_layer in outputs:
+                rows[index] = row
+                exit_layers[index] = exit_layer
+                chunk = plan.chunks[index]
+                if chunk.end <= offset:
+                    # 토픽 컨텍스트 안에만 걸친 청크는 논증 구간이 없으므로 내보내지 않음 (집계에는 포함)
+                    continue
+                record = {
+                    "type": "chunk",
+                    "index": index,
+                    "total_chunks": total,
+                    "start": max(0, chunk.start - offset),
+                    "end": min(len(plan.argument_text), chunk.end - offset),
+                    **detector.describe_probabilities(row),
+                    "exit_layer": exit_layer
+                }
+                yield _stream_record(record, sse)
+                # 신뢰도 높은 오류가 나오면 나머지 청크는 추론하지 않고 지금까지의 결과로 집계
+                if (
+                    request.stop_confidence is not None
+                    and record["has_fallacy"]
+                    and record["confidence"] >= request.stop_confidence
+                ):
+                    stopped_early = any(r is None for r in rows)
+                    break
+        finally:
+            # 중단/연결 종료 시 대기 중인 청크 취소
+            await outputs.aclose()
+        
+        completed = [i for i in range(total) if rows[i] is not None]
+        if len(completed) < total:
+            plan = InferencePlan(
+                text=plan.text,
+                chunks=[plan.chunks[i] for i in completed],
+                is_long=plan.is_long,
+                analysis=plan.analysis,
+                prefix_length=plan.prefix_length
+            )
+        layers = [exit_layers[i] for i in completed]
+        result = await executors.inference_executor.run(
+            detector.build_result, plan, [rows[i] for i in completed], topic_title, topic_description,
+            None if any(layer is None for layer in layers) else layers
+        )
+        response = _detect_response(result)
+        if cache_key is not None and not stopped_early:
+            await result_cache.set(cache_key, response.model_dump())
+        yield _stream_record({"type": "result", **response.model_dump(), "completed_chunks": len(completed),
+                              "total_chunks": total, "stopped_early": stopped_early, "cached": False}, sse)
+    
+    except ExecutorBusyError as e:
+        logger.warning(f"Streaming detection rejected: {e}")
+        yield _stream_record({"type": "error", "status_code": 503, "detail": "추론 요청이 많아 잠시 후 다시 시도해주세요."}, sse)
+    except Exception as e:
+        logger.error(f"Streaming detection failed: {e}", exc_info=True)
+        yield _stream_record({"type": "error", "status_code": 500, "detail": str(e)}, sse)
+    finally:
+        if serving is not None:
+            serving.release()
+
+@router.post("/detect/stream")
+async def detect_fallacy_stream(request: DetectStreamRequest, http_request: Request):
+    """긴 논증 스트리밍 탐지 (청크별 결과를 계산되는 대로, 마지막에 집계 결과)
+    
+    Accept: text/event-stream이면 SSE, 아니면 NDJSON으로 응답합니다.
+    """
+    _validate_length(request.text)
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    
+    serving = _acquire_model()
+    detector = serving.detector if serving is not None else None
+    if detector is None:
+        if serving is not None:
+            serving.release()
+        response = _fallback_response()
+        async def fallback():
+            yield _stream_record({"type": "result", **response.model_dump(), "completed_chunks": 0,
+                                  "total_chunks": 0, "stopped_early": False, "cached": False}, sse)
+        return StreamingResponse(fallback(), media_type=media_type)
+    
+    try:
+        # 등록되지 않은 토픽은 스트림 시작 전에 404
+        topic_title, topic_description, prefix = await _resolve_request_topic(request)
+    except BaseException:
+        serving.release()
+        raise
+    return StreamingResponse(
+        _stream_detection(serving, detector, request, topic_title, topic_description, prefix, sse),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/detect/batch", response_model=BatchDetectResponse)
 async def batch_detect_fallacy(request: BatchDetectRequest):
-    """여러 텍스트 일괄 논리 오류 탐지"""
+    """여러 텍스트 일괄 논리 오류 탐지 (항목별 토픽 컨텍스트 포함, 배치 forward pass)"""
+    serving = _acquire_model()
+    detector = serving.detector if serving is not None else None
     try:
+        items = request.items + [BatchDetectItem(text=text) for text in request.texts]
+        
         if detector is None:
             # 폴백 모드: 기본 응답 반환
             results = [DetectResponse(
@@ -179,59 +696,221 @@ async def batch_detect_fallacy(request: BatchDetectRequest):
                 fallacy_type=None,
                 confidence=0.0,
                 explanation="모델이 로드되지 않았습니다. 기본값을 반환합니다."
-            ) for _ in request.texts]
+            ) for _ in items]
             return BatchDetectResponse(results=results)
         
-        texts = request.texts
-        
-        # 한국어 모델을 사용하므로 번역 불필요 (한국어 그대로 분석)
-        # 영어 입력인 경우에만 한국어로 번역
-        if request.language == "en" and settings.TRANSLATION_ENABLED and translator and translator.enabled:
-            translated_texts = translator.translate_batch_to_korean(texts, "en")
-            texts = translated_texts
-        
-        # 일괄 탐지
-        results = []
-        for text in texts:
-            result = detector.predict(text)
-            results.append(DetectResponse(
-                has_fallacy=result.has_fallacy,
-                fallacy_type=result.fallacy_type,
-                confidence=result.confidence,
-                explanation=result.explanation
-            ))
-        
-        return BatchDetectResponse(results=results)
+        # 등록된 토픽은 토픽 ID별로 한 번만 조회하고 미리 토크나이징한 접두어 사용
+        registered: Dict[str, TopicArtifacts] = {}
+        topics = []
+        prefixes = []
+        for item in items:
+            topic_id = item.topic_id or request.topic_id
+            if topic_id:
+                if topic_id not in registered:
+                    registered[topic_id] = await _resolve_topic(topic_id)
+                topic = registered[topic_id]
+                topics.append((topic.title, topic.description))
+                prefixes.append(topic.prefix)
+            else:
+                topics.append((item.topic_title or request.topic_title, item.topic_description or request.topic_description))
+                prefixes.append(None)
+        
+        # 캐시에 있는 항목은 재사용하고 나머지만 추론
+        responses: List[Optional[DetectResponse]] = [None] * len(items)
+        cache_keys: List[Optional[str]] = [None] * len(items)
+        if result_cache is not None:
+            for index, (item, (title, description)) in enumerate(zip(items, topics)):
+                cache_keys[index] = ResultCache.make_key(
+                    detector.model_version, item.text, title, description, request.language
+                )
+                cached = await result_cache.get(cache_keys[index])
+                if cached is not None:
+                    responses[index] = DetectResponse(**cached)
+        pending = [index for index, response in enumerate(responses) if response is None]
+        
+        if pending:
+            # 단일 탐지와 같은 방식으로 항목별 토픽 컨텍스트 추가
+            pending_topics = [topics[index] for index in pending]
+            pending_prefixes = [prefixes[index] for index in pending]
+            texts = []
+            for position, index in enumerate(pending):
+                title, description = pending_topics[position]
+                text, pending_prefixes[position] = _context_for(
+                    detector, items[index].text, title, description, pending_prefixes[position]
+                )
+                texts.append(text)
+            
+            # 한국어 모델을 사용하므로 번역 불필요 (한국어 그대로 분석)
+            # 영어 입력인 경우에만 한국어로 번역
+            if request.language == "en" and settings.TRANSLATION_ENABLED and translator and translator.enabled:
+                translated_texts = await asyncio.to_thread(translator.translate_batch_to_korean, texts, "en")
+                texts = translated_texts
+            
+            # 일괄 탐지 (배치 토크나이징 + 길이 버킷별 배치 forward pass)
+            results = await executors.inference_executor.run(detector.predict_batch, texts, pending_topics, pending_prefixes)
+            
+            for index, result in zip(pending, results):
+                responses[index] = _detect_response(result)
+                if cache_keys[index] is not None:
+                    await result_cache.set(cache_keys[index], responses[index].model_dump())
+        
+        return BatchDetectResponse(results=responses)
     
     except HTTPException:
         raise
+    except ExecutorBusyError as e:
+        logger.warning(f"Batch detection rejected: {e}")
+        raise HTTPException(status_code=503, detail="추론 요청이 많아 잠시 후 다시 시도해주세요.")
     except Exception as e:
         logger.error(f"Batch detection failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if serving is not None:
+            serving.release()
+
+@router.put("/topics/{topic_id}", response_model=TopicResponse)
+async def register_topic(topic_id: str, request: TopicRequest):
+    """토픽 등록/수정 (컨텍스트 접두어 토큰, 키워드, 연관성 임베딩을 미리 계산)"""
+    if not request.title and not request.description:
+        raise HTTPException(status_code=400, detail="토픽 제목 또는 설명이 필요합니다.")
+    if topic_registry is None:
+        raise HTTPException(status_code=503, detail="모델이 로드되지 않아 토픽을 등록할 수 없습니다.")
+    try:
+        topic = await topic_registry.register(topic_id, request.title, request.description)
+        return TopicResponse(**topic.to_dict())
+    except ExecutorBusyError as e:
+        logger.warning(f"Topic registration rejected: {e}")
+        raise HTTPException(status_code=503, detail="추론 요청이 많아 잠시 후 다시 시도해주세요.")
+
+@router.get("/topics/{topic_id}", response_model=TopicResponse)
+async def get_topic(topic_id: str):
+    """등록된 토픽 조회"""
+    topic = await _resolve_topic(topic_id)
+    return TopicResponse(**topic.to_dict())
+
+@router.delete("/topics/{topic_id}")
+async def delete_topic(topic_id: str):
+    """토픽 삭제"""
+    if topic_registry is None or not await topic_registry.evict(topic_id):
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 토픽입니다: {topic_id}")
+    return {"status": "deleted", "topic_id": topic_id}
+
+@router.get("/metrics/batching")
+async def batching_metrics():
+    """마이크로 배칭 통계 (대기열 깊이, 배치 크기 분포)"""
+    if scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **scheduler.get_stats()}
+
+@router.get("/metrics/executors")
+async def executor_metrics():
+    """추론/모델 로드 실행기 상태 (작업자 수, 대기 작업 수)와 재학습 작업 대기열"""
+    return {
+        "inference": executors.inference_executor.get_stats() if executors.inference_executor else None,
+        "training": executors.training_executor.get_stats() if executors.training_executor else None,
+        "training_jobs": await training_jobs.get_stats() if training_jobs is not None else None
+    }
+
+@router.get("/metrics/cache")
+async def cache_metrics():
+    """탐지 결과 캐시 / 청크 캐시 / 토픽 임베딩 캐시 통계 (히트/미스, 항목 수, 메모리 사용량)"""
+    chunk_cache = detector.chunk_cache if detector is not None else None
+    chunk_stats = chunk_cache.get_stats() if chunk_cache is not None else {"enabled": False}
+    topic_stats = detector.relevance_scorer.get_stats() if detector is not None else None
+    if topic_stats is not None and topic_registry is not None:
+        topic_stats["registry"] = topic_registry.get_stats()
+    if result_cache is None:
+        return {"enabled": False, "chunks": chunk_stats, "topics": topic_stats}
+    return {
+        "enabled": True,
+        "model_version": detector.model_version if detector is not None else None,
+        **result_cache.get_stats(),
+        "chunks": chunk_stats,
+        "topics": topic_stats
+    }
 
 @router.post("/retrain", response_model=RetrainResponse)
 async def retrain_model(request: RetrainRequest):
-    """모델 재학습 (한국어 데이터 그대로 사용)"""
+    """모델 재학습 작업 등록 (한국어 데이터 그대로 사용, 작업 ID를 바로 반환)"""
+    # 재학습 데이터는 이미 한국어이므로 번역 불필요
+    logger.info(f"한국어 샘플 {len(request.training_data)}개로 재학습 작업을 등록합니다 (번역 불필요)")
+    
+    if training_jobs is None:
+        raise HTTPException(status_code=503, detail="모델 레지스트리가 초기화되지 않았습니다.")
     try:
-        from app.services.training_service import TrainingService
-        
-        # 재학습 데이터는 이미 한국어이므로 번역 불필요
-        logger.info(f"한국어 샘플 {len(request.training_data)}개로 재학습을 시작합니다 (번역 불필요)")
-        
-        training_service = TrainingService()
-        model_path = training_service.train_model(request.training_data)
-        
-        # 모델 재로드
-        global detector
-        detector = FallacyDetector(model_path=model_path)
-        
-        return RetrainResponse(
-            status="success",
-            model_path=model_path,
-            message=f"Model retrained with {len(request.training_data)} Korean samples"
-        )
+        job = await training_jobs.submit(request.training_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorBusyError:
+        raise HTTPException(status_code=409, detail="대기 중인 재학습 작업이 너무 많습니다.")
     
-    except Exception as e:
-        logger.error(f"Retraining failed: {e}", exc_info=True)
+    return RetrainResponse(
+        status=job.status,
+        job_id=job.job_id,
+        message=f"Retraining job queued with {job.samples} Korean samples"
+    )
+
+async def _get_training_job(job_id: str):
+    job = await training_jobs.get(job_id) if training_jobs is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"재학습 작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+@router.get("/retrain/jobs")
+async def list_training_jobs():
+    """재학습 작업 목록 (최근 작업부터)과 대기열 상태"""
+    if training_jobs is None:
+        raise HTTPException(status_code=503, detail="모델 레지스트리가 초기화되지 않았습니다.")
+    return {"jobs": await training_jobs.list_jobs(), **(await training_jobs.get_stats())}
+
+@router.get("/retrain/jobs/{job_id}")
+async def get_training_job(job_id: str):
+    """재학습 작업 상태와 진행 상황 (단계, step, loss, 남은 시간)"""
+    return (await _get_training_job(job_id)).to_dict()
+
+@router.post("/retrain/jobs/{job_id}/cancel")
+async def cancel_training_job(job_id: str):
+    """재학습 작업 취소 (대기 중이면 즉시, 학습 중이면 다음 step에서 중단)"""
+    await _get_training_job(job_id)
+    return (await training_jobs.cancel(job_id)).to_dict()
+
+@router.get("/retrain/jobs/{job_id}/result")
+async def get_training_job_result(job_id: str):
+    """끝난 재학습 작업의 결과 (모델 버전, 경로, 활성화 정보 또는 오류)"""
+    job = await _get_training_job(job_id)
+    if job.status not in FINISHED_STATES:
+        raise HTTPException(status_code=409, detail=f"재학습 작업이 아직 끝나지 않았습니다 ({job.status})")
+    return {**job.result(), "success": job.status == SUCCEEDED}
+
+@router.get("/models")
+async def list_models():
+    """모델 버전 목록, 활성화 이력, 서빙/드레인 중인 모델"""
+    if model_registry is None:
+        raise HTTPException(status_code=503, detail="모델 레지스트리가 초기화되지 않았습니다.")
+    return {**model_registry.list_versions(), **model_registry.get_stats()}
+
+@router.post("/models/activate")
+async def activate_model(request: ActivateModelRequest):
+    """지정한 버전으로 무중단 교체 (로드/워밍업 후 교체, 실패 시 현재 모델 유지)"""
+    if model_registry is None:
+        raise HTTPException(status_code=503, detail="모델 레지스트리가 초기화되지 않았습니다.")
+    try:
+        return await model_registry.activate(request.version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 모델 버전입니다: {request.version}")
+    except ModelActivationError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    except ExecutorBusyError:
+        raise HTTPException(status_code=409, detail="재학습 또는 모델 교체가 진행 중입니다.")
 
+@router.post("/models/rollback")
+async def rollback_model():
+    """직전 활성 버전으로 롤백"""
+    if model_registry is None:
+        raise HTTPException(status_code=503, detail="모델 레지스트리가 초기화되지 않았습니다.")
+    try:
+        return await model_registry.rollback()
+    except ModelActivationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ExecutorBusyError:
+        raise HTTPException(status_code=409, detail="재학습 또는 모델 교체가 진행 중입니다.")
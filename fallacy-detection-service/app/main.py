@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 import sys
 import os
+import time
 
 # 프로젝트 루트를 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -18,7 +19,10 @@ except ImportError:
         API_PORT = int(os.getenv("API_PORT", "8000"))
     settings = Settings()
 
+# 라우트 모듈은 가벼운 import만 수행 (torch/transformers와 모델은 시작 후 백그라운드에서 로드)
+_import_started = time.perf_counter()
 from app.api import routes
+routes.startup_report.record("app_import", time.perf_counter() - _import_started)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -44,6 +48,16 @@ app.add_middleware(
 # 라우터 등록
 app.include_router(routes.router, prefix="/api/v1", tags=["fallacy-detection"])
 
+@app.on_event("startup")
+async def startup():
+    # 소켓을 바로 열어 liveness(/health)에 응답하고, 모델 로드와 워밍업은 백그라운드에서 진행
+    routes.start_background_initialization()
+    routes.start_service_tasks()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await routes.shutdown_services()
+
 @app.get("/")
 async def root():
     return {
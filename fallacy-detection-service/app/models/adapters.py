@@ -0,0 +1,94 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, Optional, Sequence, Union
+
+from app.models.model_artifact import ArtifactError, WEIGHTS_FILE, read_manifest
+
+logger = logging.getLogger(__name__)
+
+# LoRA 어댑터 아티팩트 (peft 저장 형식 + label_mapping.json + 기본 모델 참조가 담긴 artifact.json)
+ADAPTER_CONFIG_FILE = "adapter_config.json"
+ADAPTER_WEIGHTS_FILE = "adapter_model.safetensors"
+# ELECTRA self-attention의 query/value 투영에만 저차원 행렬 추가 (분류 헤드는 전체 학습)
+DEFAULT_TARGET_MODULES = ("query", "value")
+
+
+def is_adapter_dir(path: Optional[str]) -> bool:
+    return bool(path) and os.path.exists(os.path.join(path, ADAPTER_CONFIG_FILE))
+
+
+def adapter_base(adapter_dir: str) -> Dict:
+    """어댑터를 학습한 기본 모델 정보 (경로, 모델 버전)"""
+    manifest = read_manifest(adapter_dir)
+    base = (manifest or {}).get("base_model")
+    if not base or not base.get("path"):
+        raise ArtifactError(f"Adapter artifact has no base model reference: {adapter_dir}")
+    return base
+
+
+def resolve_base_model(adapter_dir: str) -> str:
+    """기본 모델 디렉토리 (없거나 어댑터 학습 후 가중치가 바뀌었으면 ArtifactError)"""
+    from app.models.inference_backend import model_version
+
+    base = adapter_base(adapter_dir)
+    base_dir = base["path"]
+    if not os.path.isdir(base_dir):
+        raise ArtifactError(f"Base model of adapter is missing: {base_dir}")
+    if base.get("version") and model_version(base_dir) != base["version"]:
+        raise ArtifactError(f"Base model weights changed since the adapter was trained: {base_dir}")
+    return base_dir
+
+
+def adapter_version(adapter_dir: str) -> Optional[str]:
+    """기본 모델 버전 + 어댑터 가중치 기준 모델 버전 문자열 (결과 캐시 키)"""
+    manifest = read_manifest(adapter_dir)
+    if manifest is None or ADAPTER_WEIGHTS_FILE not in manifest["files"]:
+        return None
+    payload = {"base": manifest["base_model"].get("version"), "adapter": manifest["files"][ADAPTER_WEIGHTS_FILE]["sha256"]}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _is_target(name: str, target_modules: Union[str, Sequence[str]]) -> bool:
+    """peft와 같은 규칙으로 LoRA 대상 모듈 판별 (문자열이면 정규식 전체 일치, 목록이면 이름 또는 접미사 일치)"""
+    if isinstance(target_modules, str):
+        return re.fullmatch(target_modules, name) is not None
+    return any(name == target or name.endswith(f".{target}") for target in target_modules)
+
+
+def load_adapter_model(adapter_dir: str, mmap_weights: bool = True):
+    """기본 모델 위에 LoRA 어댑터를 병합한 모델 (peft 필요)
+
+    기본 모델 가중치는 읽기 전용 매핑으로 올려 다른 버전/프로세스와 페이지 캐시를 공유하고,
+    어댑터가 바꾸는 대상 Linear 가중치만 복사한 뒤 병합합니다. 병합 후에는 추가 연산 없이 일반 모델과 같은 속도로 추론합니다.
+    """
+    import torch
+    from peft import PeftModel
+    from transformers import AutoModelForSequenceClassification
+    from app.models.model_artifact import load_mmap_model
+
+    base_dir = resolve_base_model(adapter_dir)
+    with open(os.path.join(adapter_dir, ADAPTER_CONFIG_FILE), "r", encoding="utf-8") as f:
+        target_modules = json.load(f).get("target_modules") or list(DEFAULT_TARGET_MODULES)
+
+    model = None
+    if mmap_weights and os.path.exists(os.path.join(base_dir, WEIGHTS_FILE)):
+        try:
+            model = load_mmap_model(base_dir)
+        except Exception as e:
+            logger.warning(f"Could not memory-map base model weights, loading normally: {e}")
+    if model is None:
+        model = AutoModelForSequenceClassification.from_pretrained(base_dir)
+
+    # 병합은 가중치를 제자리에서 수정하므로 대상 가중치만 매핑에서 분리 (나머지는 기본 모델과 공유)
+    copied = 0
+    for name, module in model.named_modules():
+        if isinstance(module, torch.nn.Linear) and _is_target(name, target_modules):
+            module.weight = torch.nn.Parameter(module.weight.detach().clone(), requires_grad=False)
+            copied += module.weight.numel() * module.weight.element_size()
+
+    model = PeftModel.from_pretrained(model, adapter_dir).merge_and_unload()
+    logger.info(f"Merged adapter {adapter_dir} into base model {base_dir} ({copied / 1024 / 1024:.1f}MB private weights)")
+    return model
@@ -0,0 +1,60 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class ChunkCache:
+    """청크별 추론 결과 캐시 (토큰 ID 해시 → (확률 벡터, 종료 레이어), LRU)
+
+    탐지기 인스턴스마다 하나씩 생성되므로 모델이 바뀌면 캐시도 함께 교체됩니다.
+    """
+
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(input_ids: Sequence[int]) -> bytes:
+        return hashlib.blake2b(np.asarray(input_ids, dtype=np.int32).tobytes(), digest_size=16).digest()
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[Any]]:
+        """여러 청크 조회 (없는 청크는 None)"""
+        values = []
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is None:
+                    self._misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                values.append(value)
+        return values
+
+    def put_many(self, keys: List[bytes], values: List[Any]):
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from torch import nn
+
+from app.models.inference_backend import model_version
+
+logger = logging.getLogger(__name__)
+
+# 중간 레이어 분류 헤드는 모델 디렉토리 아래에 모델 버전과 함께 저장
+EARLY_EXIT_DIR = "early_exit"
+HEADS_FILE = "heads.pt"
+CONFIG_FILE = "config.json"
+DEFAULT_EXIT_LAYERS = (3, 6, 9)
+
+
+class ExitHead(nn.Module):
+    """중간 레이어의 [CLS] 표현을 받는 경량 분류 헤드 (ELECTRA 분류 헤드와 같은 구조)"""
+
+    def __init__(self, hidden_size: int, num_labels: int, dropout: float = 0.1):
+        super().__init__()
+        self.dense = nn.Linear(hidden_size, hidden_size)
+        self.dropout = nn.Dropout(dropout)
+        self.out_proj = nn.Linear(hidden_size, num_labels)
+
+    def forward(self, cls_states: torch.Tensor) -> torch.Tensor:
+        x = self.dropout(cls_states)
+        x = nn.functional.gelu(self.dense(x))
+        x = self.dropout(x)
+        return self.out_proj(x)
+
+
+def supports_early_exit(model) -> bool:
+    """레이어 단위 실행이 가능한 인코더 구조인지 확인 (임베딩 → encoder.layer → classifier)"""
+    base = getattr(model, "base_model", None)
+    encoder = getattr(base, "encoder", None)
+    return (
+        encoder is not None
+        and hasattr(encoder, "layer")
+        and hasattr(base, "embeddings")
+        and hasattr(model, "classifier")
+    )
+
+
+def build_exit_heads(model, exit_layers: Sequence[int]) -> nn.ModuleDict:
+    config = model.config
+    dropout = getattr(config, "hidden_dropout_prob", 0.1)
+    return nn.ModuleDict({
+        str(layer): ExitHead(config.hidden_size, config.num_labels, dropout) for layer in exit_layers
+    })
+
+
+def save_exit_heads(model_dir: str, heads: nn.ModuleDict, exit_layers: Sequence[int], metrics: Optional[Dict] = None):
+    """헤드 가중치와 설정(종료 레이어, 기반 모델 버전, 학습 지표) 저장"""
+    output_dir = os.path.join(model_dir, EARLY_EXIT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    torch.save(heads.state_dict(), os.path.join(output_dir, HEADS_FILE))
+    with open(os.path.join(output_dir, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "exit_layers": list(exit_layers),
+            "model_version": model_version(model_dir),
+            "metrics": metrics or {}
+        }, f, indent=2)
+    logger.info(f"Early-exit heads saved: {output_dir} (layers={list(exit_layers)})")
+
+
+def load_early_exit(model, model_dir: str) -> Optional["EarlyExitRunner"]:
+    """저장된 헤드 로드 (없거나 기반 가중치와 버전이 다르면 None)"""
+    config_path = os.path.join(model_dir, EARLY_EXIT_DIR, CONFIG_FILE)
+    heads_path = os.path.join(model_dir, EARLY_EXIT_DIR, HEADS_FILE)
+    if not os.path.exists(config_path) or not os.path.exists(heads_path):
+        logger.warning(f"Early-exit heads not found in {model_dir}, using full-depth inference")
+        return None
+    if not supports_early_exit(model):
+        logger.warning(f"Early exit is not supported for {type(model).__name__}, using full-depth inference")
+        return None
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if config.get("model_version") != model_version(model_dir):
+        logger.warning("Early-exit heads were trained for different weights, using full-depth inference")
+        return None
+
+    exit_layers = config["exit_layers"]
+    heads = build_exit_heads(model, exit_layers)
+    heads.load_state_dict(torch.load(heads_path, map_location="cpu"))
+    heads.to(model.dtype)
+    heads.eval()
+    logger.info(f"Early-exit heads loaded (layers={exit_layers})")
+    return EarlyExitRunner(model, heads, exit_layers)
+
+
+class EarlyExitRunner:
+    """인코더를 레이어 단위로 실행하며 종료 레이어마다 헤드 신뢰도를 확인
+
+    신뢰도가 임계값을 넘은 행은 그 레이어에서 결과를 확정하고 배치에서 빼므로
+    남은 레이어는 확신하지 못한 입력만 계산합니다.
+    """
+
+    def __init__(self, model, heads: nn.ModuleDict, exit_layers: Sequence[int]):
+        self.model = model
+        self.heads = heads
+        self.num_layers = len(model.base_model.encoder.layer)
+        self.exit_layers = sorted(layer for layer in exit_layers if 0 < layer < self.num_layers)
+
+    @torch.no_grad()
+    def __call__(self, input_ids: np.ndarray, attention_mask: np.ndarray,
+                 threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(로짓 (배치 크기, 라벨 수), 행별 종료 레이어) 반환"""
+        base = self.model.base_model
+        mask = torch.from_numpy(attention_mask)
+        hidden = base.embeddings(input_ids=torch.from_numpy(input_ids))
+        if hasattr(base, "embeddings_project"):
+            hidden = base.embeddings_project(hidden)
+        extended_mask = self.model.get_extended_attention_mask(mask, mask.shape)
+
+        logits = np.zeros((len(input_ids), self.model.config.num_labels), dtype=np.float32)
+        exit_layers = np.full(len(input_ids), self.num_layers, dtype=np.int64)
+        active = np.arange(len(input_ids))
+
+        for index, layer in enumerate(base.encoder.layer, start=1):
+            # transformers 버전에 따라 레이어 출력이 튜플 또는 텐서
+            output = layer(hidden, attention_mask=extended_mask)
+            hidden = output[0] if isinstance(output, tuple) else output
+            if index not in self.exit_layers:
+                continue
+
+            head_logits = self.heads[str(index)](hidden[:, 0, :]).float()
+            confident = (torch.softmax(head_logits, dim=-1).max(dim=-1).values >= threshold).numpy()
+            if not confident.any():
+                continue
+
+            logits[active[confident]] = head_logits.numpy()[confident]
+            exit_layers[active[confident]] = index
+            remaining = ~confident
+            if not remaining.any():
+                return logits, exit_layers
+            keep = torch.from_numpy(remaining)
+            active = active[remaining]
+            hidden = hidden[keep]
+            extended_mask = extended_mask[keep]
+
+        logits[active] = self.model.classifier(hidden).float().numpy()
+        return logits, exit_layers
+
+
+def collect_cls_states(model, batches: List[Dict[str, torch.Tensor]], exit_layers: Sequence[int]) -> Dict[int, torch.Tensor]:
+    """종료 레이어별 [CLS] 표현 수집 (백본은 고정하므로 한 번만 계산해 두고 헤드 학습에 재사용)"""
+    states: Dict[int, List[torch.Tensor]] = {layer: [] for layer in exit_layers}
+    model.eval()
+    with torch.no_grad():
+        for batch in batches:
+            outputs = model.base_model(
+                input_ids=batch["input_ids"],
+                attention_mask=batch["attention_mask"],
+                output_hidden_states=True
+            )
+            # hidden_states[0]은 임베딩 출력, hidden_states[i]는 i번째 레이어 출력
+            for layer in exit_layers:
+                states[layer].append(outputs.hidden_states[layer][:, 0, :].float())
+    return {layer: torch.cat(tensors) for layer, tensors in states.items()}
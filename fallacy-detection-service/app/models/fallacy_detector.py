@@ -1,11 +1,17 @@
-import torch
-from transformers import (
-    AutoTokenizer, AutoModelForSequenceClassification
-)
+import numpy as np
+from app.models.adapters import adapter_version, is_adapter_dir, resolve_base_model
+from app.models.inference_backend import InferenceBackend, create_backend, model_version
+from app.models.model_artifact import verify_artifact
+from app.models.chunk_cache import ChunkCache
+from app.models.topic_relevance import TopicRelevanceScorer
+from app.models.text_analyzer import TextAnalysis, TextAnalyzer
 import json
 import logging
-import re
-from typing import Dict, Optional, List
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
@@ -19,13 +25,93 @@ class FallacyResult:
     explanation: str
     topic_relevance: Optional[float] = None  # 주제 연관성 점수 (0.0 ~ 1.0)
     logical_structure: Optional[Dict] = field(default_factory=dict)  # 논리 구조 정보
+    exit_layer: Optional[int] = None  # 조기 종료 사용 시 결과를 확정한 인코더 레이어 (긴 텍스트는 청크 중 가장 깊은 레이어)
+
+@dataclass
+class TextChunk:
+    """추론 단위 청크 (특수 토큰이 포함된 토큰 ID와 원문 내 문자 구간)"""
+    input_ids: List[int]
+    start: int
+    end: int
+
+@dataclass
+class InferencePlan:
+    """추론 계획: 모델에 넣을 단위(짧은 텍스트는 전체 하나, 긴 텍스트는 청크 목록)"""
+    text: str
+    chunks: List[TextChunk]
+    is_long: bool = False
+    analysis: Optional[TextAnalysis] = None  # 청크 분할에 쓴 논증 스캔 결과 (논리 구조 분석에서 재사용)
+    prefix_length: int = 0  # text 앞에 붙은 토픽 컨텍스트 접두어의 문자 수
+    
+    @property
+    def argument_text(self) -> str:
+        """토픽 컨텍스트 접두어를 제외한 논증 원문"""
+        return self.text[self.prefix_length:]
+    
+    def chunk_text(self, chunk: TextChunk) -> str:
+        return self.text[chunk.start:chunk.end]
+
+@dataclass
+class TopicPrefix:
+    """미리 토크나이징한 토픽 컨텍스트 접두어 (논증 토큰 ID 앞에 그대로 이어 붙임)"""
+    text: str
+    input_ids: List[int]
+    offsets: List[Tuple[int, int]]
+    # 청크 길이 한도(max_length)별로 줄인 접두어 토큰 ID (긴 접두어를 요청마다 다시 자르거나 로그하지 않도록)
+    fitted_ids: Dict[int, List[int]] = field(default_factory=dict, repr=False, compare=False)
+
+def build_context_prefix(topic_title: Optional[str], topic_description: Optional[str]) -> str:
+    """논증 앞에 붙일 부모 토픽 정보 (자연스러운 한국어 형식, 토픽이 없으면 빈 문자열)"""
+    if not topic_title and not topic_description:
+        return ""
+    context_parts = []
+    if topic_title:
+        context_parts.append(f"토론 주제: {topic_title}")
+    if topic_description:
+        context_parts.append(f"주제 설명: {topic_description}")
+    context_parts.append("다음은 위 주제에 대한 논증입니다: ")
+    return "\n\n".join(context_parts)
+
+# 추론 중 예외가 나서 점수 없이 돌려주는 결과의 설명 (워밍업/재점수화에서 실패 판별에 사용)
+ANALYSIS_ERROR_EXPLANATION = "분석 중 오류가 발생했습니다."
+
+# 길이 버킷 경계 (토큰 수). 같은 버킷의 입력끼리 묶어 버킷 내 최장 길이까지만 패딩
+DEFAULT_LENGTH_BUCKETS = (32, 64, 128, 256, 512)
+
+# 짧은 단락 묶음의 경계 기준: 단락 토큰 ID 해시가 이 값으로 나누어떨어지면 그 단락 뒤에서 묶음을 끊음 (평균 4단락)
+CHUNK_ANCHOR_MODULUS = 4
+
+# 접두어를 줄일 때 문장 끝으로 보는 문자
+PREFIX_SENTENCE_ENDS = ".?!。\n"
 
 class FallacyDetector:
-    def __init__(self, model_path: str = None, model_name: str = "monologg/koelectra-base-v3-discriminator"):
+    def __init__(self, model_path: str = None, model_name: str = "monologg/koelectra-base-v3-discriminator",
+                 length_buckets: Optional[List[int]] = None, max_batch_size: int = 32, precision: str = "fp32",
+                 backend: str = "torch", intra_op_threads: int = 0, chunk_cache_size: int = 20000,
+                 early_exit_threshold: float = 0.0, relevance_model: Optional[str] = None,
+                 relevance_cache_size: int = 1024, relevance_scorer: Optional[TopicRelevanceScorer] = None,
+                 mmap_weights: bool = True):
         self.model_name = model_name
         self.model_path = model_path
+        self.precision = precision.lower() if precision else "fp32"  # fp32 / int8 / bf16
+        self.backend_name = backend  # torch / onnx
+        self.intra_op_threads = intra_op_threads  # ONNX Runtime 세션 intra-op 스레드 수 (0이면 기본값)
+        self.early_exit_threshold = early_exit_threshold  # 중간 레이어 헤드 신뢰도 임계값 (0이면 사용 안 함)
+        self.mmap_weights = mmap_weights  # safetensors 가중치를 읽기 전용 매핑으로 로드 (프로세스 간 페이지 캐시 공유)
+        self.backend: Optional[InferenceBackend] = None
+        self.model_version: Optional[str] = None  # 결과 캐시 키에 포함 (가중치/백엔드/정밀도가 바뀌면 달라짐)
+        self.length_buckets = sorted(length_buckets) if length_buckets else list(DEFAULT_LENGTH_BUCKETS)
+        self.max_batch_size = max(1, max_batch_size)
+        # 청크 단위 결과 메모이제이션 (수정된 논증은 바뀐 청크만 다시 추론, 0이면 사용 안 함)
+        self.chunk_cache = ChunkCache(chunk_cache_size) if chunk_cache_size > 0 else None
+        # 주제 연관성 (문장 임베딩 모델이 없으면 글자 bigram 겹침, 토픽 쪽 계산은 캐시)
+        # 재학습 후 새 탐지기는 기존 scorer를 넘겨받아 임베딩 모델과 토픽 캐시를 재사용
+        self.relevance_scorer = relevance_scorer or TopicRelevanceScorer(relevance_model, relevance_cache_size)
+        # 문장/단락 경계와 논리 연결어를 한 번에 스캔 (청크 분할과 논리 구조 분석에서 공유)
+        self.text_analyzer = TextAnalyzer()
         self.tokenizer = None
-        self.model = None
+        # fast tokenizer는 truncation/padding 설정을 내부 상태로 바꾸므로 여러 추론 스레드의 동시 호출을 직렬화
+        self._tokenizer_lock = threading.Lock()
         self.label_to_id = {}
         self.id_to_label = {}
         
@@ -52,15 +138,26 @@ class FallacyDetector:
             self._load_model()
         except Exception as e:
             logger.warning(f"Model loading failed, using fallback mode: {e}")
-            self.model = None
+            self.backend = None
+    
+    @property
+    def model(self):
+        """추론 백엔드의 실제 모델 객체 (torch 모듈 또는 ORT 세션, 로드 실패 시 None)"""
+        return self.backend.model if self.backend is not None else None
     
     def _load_model(self):
-        """모델 로드"""
+        """모델 로드 (토크나이저/라벨 매핑은 프런트엔드, 가중치는 추론 백엔드에서 로드)"""
+        # transformers는 import만으로 수 초가 걸리므로 모델을 로드할 때 가져옴
+        from transformers import AutoTokenizer
+        
         try:
             if self.model_path:
                 logger.info(f"Loading model from {self.model_path}")
-                self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+                # 서빙 아티팩트면 파일 목록/크기 확인 (해시 검증은 모델 교체 전에 레지스트리에서 수행)
+                verify_artifact(self.model_path)
+                # LoRA 어댑터는 기본 모델의 토크나이저 사용 (가중치는 백엔드에서 기본 모델 위에 병합)
+                tokenizer_path = resolve_base_model(self.model_path) if is_adapter_dir(self.model_path) else self.model_path
+                self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
                 
                 # 라벨 매핑 로드
                 try:
@@ -72,17 +169,41 @@ class FallacyDetector:
                 except Exception as e:
                     logger.warning(f"Could not load label mapping: {e}")
                     self._initialize_default_labels()
+                
+                self.backend = create_backend(
+                    self.backend_name,
+                    self.model_path,
+                    model_dir=self.model_path,
+                    precision=self.precision,
+                    intra_op_threads=self.intra_op_threads,
+                    early_exit_threshold=self.early_exit_threshold,
+                    mmap_weights=self.mmap_weights
+                )
             else:
                 logger.info(f"Using default model: {self.model_name}")
                 self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model = AutoModelForSequenceClassification.from_pretrained(
+                self.backend = create_backend(
+                    self.backend_name,
                     self.model_name,
-                    num_labels=11
+                    num_labels=11,
+                    precision=self.precision
                 )
                 self._initialize_default_labels()
             
-            self.model.eval()
-            logger.info("Model loaded successfully")
+            self.backend_name = self.backend.name
+            self.precision = self.backend.precision
+            self.early_exit_threshold = self.backend.early_exit_threshold
+            if is_adapter_dir(self.model_path):
+                weights_version = adapter_version(self.model_path)
+            else:
+                weights_version = model_version(self.model_path) if self.model_path else None
+            self.model_version = f"{weights_version or self.model_name}:{self.backend_name}:{self.precision}"
+            if self.early_exit_threshold > 0:
+                self.model_version += f":exit{self.early_exit_threshold}"
+            if self.relevance_scorer.model is not None:
+                self.model_version += f":relevance={self.relevance_scorer.model_name}"
+            logger.info(f"Model loaded successfully (backend={self.backend_name}, precision={self.precision}, "
+                        f"early_exit_threshold={self.early_exit_threshold})")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
@@ -97,8 +218,9 @@ class FallacyDetector:
         self.label_to_id = {label: idx for idx, label in enumerate(labels)}
         self.id_to_label = {idx: label for label, idx in self.label_to_id.items()}
     
-    def predict(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None) -> FallacyResult:
-        """논리 오류 예측 (계층적 분석 및 청크 집계)"""
+    def predict(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None,
+                prefix: Optional[TopicPrefix] = None) -> FallacyResult:
+        """논리 오류 예측 (계층적 분석 및 청크 집계, prefix가 있으면 토픽 접두어 토큰을 앞에 이어 붙임)"""
         if self.model is None or self.tokenizer is None:
             logger.warning("Model not loaded, returning default result")
             return FallacyResult(
@@ -110,17 +232,16 @@ class FallacyDetector:
             )
         
         try:
-            # 긴 텍스트 여부 확인
-            max_length = 512
-            tokenized = self.tokenizer(text, return_tensors="pt", truncation=False, padding=False)
-            token_count = tokenized["input_ids"].shape[1]
+            # 전체 텍스트를 한 번만 토크나이징하고 라우팅/청크 분할/추론 모두 토큰 ID로 처리
+            plan = self.plan_inference(text, prefix=prefix)
             
-            if token_count <= max_length:
+            if not plan.is_long:
                 # 짧은 텍스트: 일반 분석
-                return self._predict_single(text, topic_title, topic_description)
+                probabilities, exit_layers = self.predict_chunk_proba([plan.chunks[0].input_ids], return_exit_layers=True)
+                return self.build_result(plan, probabilities, topic_title, topic_description, exit_layers)
             else:
                 # 긴 텍스트: 계층적 분석 및 청크 집계
-                return self._predict_long_text(text, topic_title, topic_description, max_length)
+                return self._predict_long_text(plan, topic_title, topic_description)
                 
         except Exception as e:
             logger.error(f"Prediction failed: {e}")
@@ -129,24 +250,271 @@ class FallacyDetector:
                 has_fallacy=False,
                 fallacy_type=None,
                 confidence=0.0,
-                explanation="분석 중 오류가 발생했습니다."
+                explanation=ANALYSIS_ERROR_EXPLANATION
             )
     
     def _predict_single(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None) -> FallacyResult:
-        """단일 텍스트 분석"""
-        inputs = self.tokenizer(
-            text,
-            return_tensors="pt",
-            truncation=True,
-            padding="max_length",
-            max_length=512
+        """단일 텍스트 분석 (512 토큰 초과분은 잘라냄)"""
+        input_ids = self._tokenize(text, truncation=True, max_length=512, padding=False)["input_ids"]
+        return self.build_result(
+            InferencePlan(text=text, chunks=[TextChunk(input_ids, 0, len(text))]),
+            self.predict_proba_from_ids([input_ids]),
+            topic_title,
+            topic_description
+        )
+    
+    def encode_prefix(self, prefix_text: str) -> TopicPrefix:
+        """토픽 접두어를 특수 토큰 없이 오프셋 매핑과 함께 인코딩 (토픽 등록 시 한 번만 수행)"""
+        encoding = self._tokenize(
+            prefix_text,
+            add_special_tokens=False,
+            truncation=False,
+            padding=False,
+            return_offsets_mapping=True
+        )
+        return TopicPrefix(prefix_text, list(encoding["input_ids"]), [tuple(offset) for offset in encoding["offset_mapping"]])
+    
+    def context_prefix(self, topic_title: Optional[str], topic_description: Optional[str]) -> Optional[TopicPrefix]:
+        """등록되지 않은 토픽 정보를 컨텍스트 접두어로 인코딩 (토픽 정보나 토크나이저가 없으면 None)"""
+        prefix_text = build_context_prefix(topic_title, topic_description)
+        if not prefix_text or self.tokenizer is None:
+            return None
+        return self.encode_prefix(prefix_text)
+    
+    def plan_inference(self, text: str, max_length: int = 512, prefix: Optional[TopicPrefix] = None) -> InferencePlan:
+        """추론 단위 결정: 텍스트를 오프셋 매핑과 함께 한 번만 인코딩 (짧은 텍스트는 그대로, 긴 텍스트는 청크 분할)"""
+        return self.plan_batch([text], max_length, [prefix])[0]
+    
+    def plan_batch(self, texts: List[str], max_length: int = 512,
+                   prefixes: Optional[List[Optional[TopicPrefix]]] = None) -> List[InferencePlan]:
+        """여러 텍스트를 한 번의 토크나이저 호출로 인코딩하여 각각의 추론 계획 생성
+        
+        prefixes의 토픽 접두어는 다시 토크나이징하지 않고 토큰 ID를 논증 앞에 이어 붙입니다.
+        긴 논증은 논증만 청크로 나누고 모든 청크 앞에 접두어 토큰을 붙이므로, 접두어가 따로 청크가 되지 않고
+        모든 청크가 토픽 컨텍스트와 함께 분류됩니다.
+        """
+        encodings = self._tokenize(
+            texts,
+            add_special_tokens=False,
+            truncation=False,
+            padding=False,
+            return_offsets_mapping=True
         )
         
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            predicted_class = torch.argmax(predictions, dim=-1).item()
-            confidence = torch.max(predictions).item()
+        plans = []
+        for text, input_ids, offsets, prefix in zip(
+            texts, encodings["input_ids"], encodings["offset_mapping"], prefixes or [None] * len(texts)
+        ):
+            prefix_text = prefix.text if prefix is not None else ""
+            prefix_ids = prefix.input_ids if prefix is not None else []
+            full_text = prefix_text + text
+            if len(prefix_ids) + len(input_ids) + self.tokenizer.num_special_tokens_to_add() <= max_length:
+                plans.append(InferencePlan(
+                    text=full_text,
+                    chunks=[TextChunk(self._with_special_tokens(prefix_ids + list(input_ids)), len(prefix_text), len(full_text))],
+                    prefix_length=len(prefix_text)
+                ))
+            else:
+                analysis = self.text_analyzer.analyze(text)
+                plans.append(InferencePlan(
+                    text=full_text,
+                    chunks=self._split_into_chunks(
+                        text, list(input_ids), offsets, max_length, analysis=analysis,
+                        prefix_ids=self._fit_prefix(prefix, max_length) if prefix is not None else None,
+                        char_shift=len(prefix_text)
+                    ),
+                    is_long=True,
+                    analysis=analysis,
+                    prefix_length=len(prefix_text)
+                ))
+        return plans
+    
+    def predict_batch(self, texts: List[str], topics: Optional[List[Tuple[Optional[str], Optional[str]]]] = None,
+                      prefixes: Optional[List[Optional[TopicPrefix]]] = None) -> List[FallacyResult]:
+        """여러 텍스트 일괄 예측: 배치 토크나이징 후 모든 청크를 길이 버킷별 배치 forward pass로 처리"""
+        topics = topics or [(None, None)] * len(texts)
+        prefixes = prefixes or [None] * len(texts)
+        if self.model is None or self.tokenizer is None:
+            return [
+                self.predict(text, title, description, prefix)
+                for text, (title, description), prefix in zip(texts, topics, prefixes)
+            ]
+        if not texts:
+            return []
+        
+        try:
+            plans = self.plan_batch(texts, prefixes=prefixes)
+            probabilities, exit_layers = self.predict_chunk_proba(
+                [chunk.input_ids for plan in plans for chunk in plan.chunks],
+                return_exit_layers=True
+            )
+        except Exception as e:
+            logger.error(f"Batch prediction failed: {e}")
+            return [FallacyResult(
+                text=text,
+                has_fallacy=False,
+                fallacy_type=None,
+                confidence=0.0,
+                explanation=ANALYSIS_ERROR_EXPLANATION
+            ) for text in texts]
+        
+        # 주제 연관성은 모든 논증(토픽 컨텍스트 접두어 제외)을 한 번에 인코딩하여 계산
+        relevances = self.relevance_scorer.score_batch([plan.argument_text for plan in plans], topics)
+        
+        # 평탄화된 청크 확률을 텍스트별로 다시 나누어 집계
+        results = []
+        offset = 0
+        for plan, (title, description), relevance in zip(plans, topics, relevances):
+            chunk_count = len(plan.chunks)
+            results.append(self.build_result(
+                plan,
+                probabilities[offset:offset + chunk_count],
+                title,
+                description,
+                exit_layers[offset:offset + chunk_count] if exit_layers is not None else None,
+                relevance
+            ))
+            offset += chunk_count
+        return results
+    
+    def _tokenize(self, *args, **kwargs):
+        """스레드 안전한 토크나이저 호출"""
+        with self._tokenizer_lock:
+            return self.tokenizer(*args, **kwargs)
+    
+    def _with_special_tokens(self, input_ids: List[int]) -> List[int]:
+        """[CLS] ... [SEP] 등 모델별 특수 토큰 추가"""
+        return self.tokenizer.build_inputs_with_special_tokens(input_ids)
+    
+    def predict_proba(self, texts: List[str], return_exit_layers: bool = False):
+        """여러 텍스트를 길이 버킷별 배치 forward pass로 분석하여 라벨별 확률 반환"""
+        encodings = self._tokenize(texts, truncation=True, max_length=512, padding=False)
+        return self.predict_proba_from_ids(encodings["input_ids"], return_exit_layers)
+    
+    def predict_chunk_proba(self, input_ids_list: List[List[int]], return_exit_layers: bool = False):
+        """청크별 확률 (캐시에 없는 청크만 추론, 같은 요청 내 중복 청크도 한 번만 추론)
+        
+        return_exit_layers가 True이면 (확률, 청크별 종료 레이어 또는 None) 반환
+        """
+        if self.chunk_cache is None or not input_ids_list:
+            return self.predict_proba_from_ids(input_ids_list, return_exit_layers)
+        
+        keys = [ChunkCache.make_key(input_ids) for input_ids in input_ids_list]
+        cached = self.chunk_cache.get_many(keys)  # (확률, 종료 레이어) 또는 None
+        
+        missing: Dict[bytes, int] = {}  # key -> 처음 등장한 입력 인덱스
+        for i, (key, value) in enumerate(zip(keys, cached)):
+            if value is None and key not in missing:
+                missing[key] = i
+        
+        if missing:
+            computed, computed_layers = self.predict_proba_from_ids(
+                [input_ids_list[i] for i in missing.values()],
+                return_exit_layers=True
+            )
+            if computed_layers is None:
+                computed_layers = [None] * len(missing)
+            entries = [(row.copy(), None if layer is None else int(layer)) for row, layer in zip(computed, computed_layers)]
+            self.chunk_cache.put_many(list(missing), entries)
+            entries_by_key = dict(zip(missing, entries))
+            cached = [entries_by_key[key] if value is None else value for key, value in zip(keys, cached)]
+        
+        probabilities = np.stack([row for row, _ in cached]).astype(np.float32, copy=False)
+        if not return_exit_layers:
+            return probabilities
+        layers = [layer for _, layer in cached]
+        return probabilities, (None if any(layer is None for layer in layers) else np.array(layers, dtype=np.int64))
+    
+    def predict_proba_from_ids(self, input_ids_list: List[List[int]], return_exit_layers: bool = False):
+        """토큰 ID 목록을 길이 버킷으로 묶어 버킷 내 최장 길이까지만 패딩 후 추론 (입력 순서대로 (N, 라벨 수) 반환)
+        
+        return_exit_layers가 True이면 (확률, 행별 종료 레이어 또는 None) 반환 (조기 종료를 사용하지 않으면 None)
+        """
+        probabilities: Optional[np.ndarray] = None
+        exit_layers: Optional[np.ndarray] = None
+        
+        for indices in self._group_by_length(input_ids_list):
+            input_ids, attention_mask = self._pad_batch([input_ids_list[i] for i in indices])
+            logits, layers = self.backend.predict_logits_with_exit(input_ids, attention_mask)
+            predictions = self._softmax(logits)
+            if probabilities is None:
+                probabilities = np.empty((len(input_ids_list), predictions.shape[1]), dtype=np.float32)
+            probabilities[indices] = predictions
+            if layers is not None:
+                if exit_layers is None:
+                    exit_layers = np.zeros(len(input_ids_list), dtype=np.int64)
+                exit_layers[indices] = layers
+        
+        if return_exit_layers:
+            return probabilities, exit_layers
+        return probabilities
+    
+    def _group_by_length(self, input_ids_list: List[List[int]]) -> List[List[int]]:
+        """입력 인덱스를 길이 버킷별로 묶고 버킷마다 max_batch_size 단위로 분할"""
+        buckets: Dict[int, List[int]] = {}
+        for i in sorted(range(len(input_ids_list)), key=lambda i: len(input_ids_list[i])):
+            length = len(input_ids_list[i])
+            bucket = next((b for b in self.length_buckets if length <= b), self.length_buckets[-1])
+            buckets.setdefault(bucket, []).append(i)
+        
+        groups = []
+        for bucket in sorted(buckets):
+            indices = buckets[bucket]
+            for start in range(0, len(indices), self.max_batch_size):
+                groups.append(indices[start:start + self.max_batch_size])
+        return groups
+    
+    def _pad_batch(self, sequences: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """배치 내 최장 길이까지만 오른쪽 패딩 (동적 패딩)"""
+        max_len = max(len(seq) for seq in sequences)
+        pad_id = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else 0
+        input_ids = np.full((len(sequences), max_len), pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(sequences), max_len), dtype=np.int64)
+        for row, seq in enumerate(sequences):
+            input_ids[row, :len(seq)] = seq
+            attention_mask[row, :len(seq)] = 1
+        return input_ids, attention_mask
+    
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+    
+    def build_result(self, plan: InferencePlan, probabilities, topic_title: Optional[str] = None, topic_description: Optional[str] = None,
+                     exit_layers=None, topic_relevance: Optional[float] = None) -> FallacyResult:
+        """추론 계획과 청크별 확률((청크 수, 라벨 수)), 청크별 종료 레이어로 최종 결과 생성"""
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        if plan.is_long:
+            result = self._aggregate_chunk_results(probabilities, self._calculate_chunk_weights(plan), plan.text)
+        else:
+            result = self._result_from_probabilities(plan.text, probabilities[0])
+        
+        # 논리 구조 분석 및 주제 연관성 계산 (전체 텍스트 기준 1회, 청크별 계산 없음)
+        result.logical_structure = self._analyze_logical_structure(plan.argument_text, plan.analysis)
+        if topic_relevance is None:
+            topic_relevance = self._calculate_topic_relevance(plan.argument_text, topic_title, topic_description)
+        result.topic_relevance = topic_relevance
+        if exit_layers is not None and len(exit_layers) > 0:
+            result.exit_layer = int(max(exit_layers))
+        return result
+    
+    def describe_probabilities(self, probabilities) -> Dict:
+        """청크 하나의 라벨별 확률 요약 (스트리밍 응답의 청크 레코드용)"""
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        result = self._result_from_probabilities("", probabilities)
+        return {
+            'label': result.fallacy_type or "no_fallacy",
+            'has_fallacy': result.has_fallacy,
+            'confidence': result.confidence,
+            'probabilities': {
+                self.id_to_label.get(i, str(i)): float(p) for i, p in enumerate(probabilities)
+            }
+        }
+    
+    def _result_from_probabilities(self, text: str, probabilities: np.ndarray) -> FallacyResult:
+        """라벨별 확률에서 예측 라벨과 신뢰도 결정"""
+        predicted_class = int(np.argmax(probabilities))
+        confidence = probabilities[predicted_class]
         
         predicted_label = self.id_to_label.get(predicted_class, "no_fallacy")
         has_fallacy = predicted_label != "no_fallacy"
@@ -156,156 +524,195 @@ class FallacyDetector:
             "알 수 없는 오류 타입"
         )
         
-        # 주제 연관성 계산
-        topic_relevance = self._calculate_topic_relevance(text, topic_title, topic_description)
-        
-        # 논리 구조 분석
-        logical_structure = self._analyze_logical_structure(text)
-        
         return FallacyResult(
             text=text,
             has_fallacy=has_fallacy,
             fallacy_type=predicted_label if has_fallacy else None,
             confidence=float(confidence),
-            explanation=explanation,
-            topic_relevance=topic_relevance,
-            logical_structure=logical_structure
+            explanation=explanation
         )
     
-    def _predict_long_text(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None, max_length: int = 512) -> FallacyResult:
+    def _predict_long_text(self, plan: InferencePlan, topic_title: Optional[str] = None, topic_description: Optional[str] = None) -> FallacyResult:
         """긴 텍스트 계층적 분석 및 청크 집계"""
-        # 1. 청크 분할 (슬라이딩 윈도우 방식)
-        chunks = self._split_into_chunks(text, max_length)
-        
-        # 2. 각 청크 분석
-        chunk_results = []
-        for i, chunk in enumerate(chunks):
-            try:
-                result = self._predict_single(chunk, topic_title, topic_description)
-                chunk_results.append({
-                    'chunk_index': i,
-                    'result': result,
-                    'weight': self._calculate_chunk_weight(i, len(chunks), chunk)
-                })
-            except Exception as e:
-                logger.warning(f"Chunk {i} analysis failed: {e}")
-        
-        if not chunk_results:
-            return FallacyResult(
-                text=text,
-                has_fallacy=False,
-                fallacy_type=None,
-                confidence=0.0,
-                explanation="청크 분석 실패"
-            )
-        
-        # 3. 결과 집계 (가중 평균)
-        aggregated_result = self._aggregate_chunk_results(chunk_results, text)
-        
-        # 4. 논리 구조 분석 (전체 텍스트)
-        logical_structure = self._analyze_logical_structure(text)
-        aggregated_result.logical_structure = logical_structure
-        
-        # 5. 주제 연관성 계산 (전체 텍스트)
-        aggregated_result.topic_relevance = self._calculate_topic_relevance(text, topic_title, topic_description)
+        # 1. 청크 분할은 plan_inference에서 토큰 ID 기준으로 완료됨 (슬라이딩 윈도우 방식)
+        # 2. 캐시에 없는 청크만 길이 버킷별 배치 forward pass로 한 번에 분석 (수정된 논증은 바뀐 단락만 추론)
+        probabilities, exit_layers = self.predict_chunk_proba(
+            [chunk.input_ids for chunk in plan.chunks],
+            return_exit_layers=True
+        )
         
-        return aggregated_result
+        # 3. 결과 집계 (가중 평균) + 전체 텍스트 기준 논리 구조/주제 연관성
+        return self.build_result(plan, probabilities, topic_title, topic_description, exit_layers)
     
-    def _split_into_chunks(self, text: str, max_length: int, overlap: int = 100) -> List[str]:
-        """텍스트를 청크로 분할 (슬라이딩 윈도우 방식)"""
-        # 먼저 문장 단위로 분할
-        sentences = self._split_into_sentences(text)
-        
-        if not sentences:
-            return [text]
-        
-        chunks = []
+    def _fit_prefix(self, prefix: TopicPrefix, max_length: int) -> List[int]:
+        """긴 논증 청크에 붙일 접두어 토큰 ID (접두어가 길이 예산 대부분을 차지하지 않도록 max_length // 4로 제한)
+
+        한도를 넘으면 마지막 안내 문단("다음은 위 주제에 대한 논증입니다")은 유지하고, 앞부분은 한도 안의 마지막 문장 끝에서
+        자른 뒤 경고를 남깁니다. 결과는 접두어 객체에 저장하므로 등록된 토픽은 한 번만 자르고 로그합니다.
+        """
+        limit = max_length // 4
+        fitted = prefix.fitted_ids.get(max_length)
+        if fitted is not None:
+            return fitted
+        input_ids, offsets, text = prefix.input_ids, prefix.offsets, prefix.text
+        if len(input_ids) <= limit:
+            fitted = list(input_ids)
+        else:
+            tail_char = text.rfind("\n\n")
+            tail_start = bisect_left([start for start, _ in offsets], tail_char + 2) if tail_char >= 0 else len(input_ids)
+            if len(input_ids) - tail_start >= limit:
+                tail_start = len(input_ids)  # 안내 문단만으로 한도를 넘으면 앞부분만 유지
+            head_limit = limit - (len(input_ids) - tail_start)
+            head_end = head_limit
+            for index in range(min(head_limit, tail_start), 0, -1):
+                end = offsets[index - 1][1]
+                if end > 0 and text[end - 1] in PREFIX_SENTENCE_ENDS or text[end:end + 1] == "\n":
+                    head_end = index
+                    break
+            head_end = min(head_end, tail_start)
+            fitted = list(input_ids[:head_end]) + list(input_ids[tail_start:])
+            logger.warning(
+                f"Topic context prefix truncated from {len(input_ids)} to {len(fitted)} tokens "
+                f"(limit {limit}): kept {text[:offsets[head_end - 1][1]] if head_end > 0 else ''!r}"
+            )
+        prefix.fitted_ids[max_length] = fitted
+        return fitted
+    
+    def _split_into_chunks(self, text: str, input_ids: List[int], offsets: List[Tuple[int, int]],
+                           max_length: int, overlap_sentences: int = 3,
+                           analysis: Optional[TextAnalysis] = None, prefix_ids: Optional[List[int]] = None,
+                           char_shift: int = 0) -> List[TextChunk]:
+        """논증 토큰 ID를 단락/문장 경계 기준 청크로 분할 (슬라이딩 윈도우 방식, 재토크나이징 없음)
+        
+        짧은 단락은 내용으로 정한 경계(토큰 ID 해시가 CHUNK_ANCHOR_MODULUS로 나누어떨어지는 단락) 사이에서만
+        길이 예산(max_length - 50)까지 이어서 한 청크로 묶습니다. 경계가 단락 내용으로 정해지므로 한 단락을 수정해도
+        그 단락이 속한 묶음(과 경계 여부가 바뀌면 바로 다음 묶음)만 달라지고, 나머지 청크의 토큰 ID는 그대로 유지되어
+        청크 캐시에서 재사용됩니다. 예산보다 긴 단락만 문장 단위 슬라이딩 윈도우로 나눕니다.
+        prefix_ids(토픽 컨텍스트, _fit_prefix로 제한)는 모든 청크 앞에 붙이고,
+        청크의 문자 구간은 char_shift만큼 밀어 접두어를 포함한 계획 텍스트 기준으로 기록합니다.
+        """
+        prefix_ids = list(prefix_ids or [])
+        
+        # 단락별 문장의 문자 구간을 오프셋 매핑으로 토큰 구간에 대응
+        analysis = analysis or self.text_analyzer.analyze(text)
+        token_starts = [start for start, _ in offsets]
+        paragraphs = []
+        for sentence_spans in analysis.sentences_by_paragraph():
+            sentences = []
+            for char_start, char_end in sentence_spans:
+                token_start = bisect_left(token_starts, char_start)
+                token_end = bisect_left(token_starts, char_end)
+                if token_end > token_start:
+                    sentences.append((token_start, token_end, char_start, char_end))
+            if sentences:
+                paragraphs.append(sentences)
+        
+        if not paragraphs:
+            paragraphs = [[(0, len(input_ids), 0, len(text))]]
+        
+        budget = max_length - 50 - len(prefix_ids)  # 여유 공간
+        groups = []
         current_chunk = []
         current_length = 0
-        
-        for sentence in sentences:
-            try:
-                sentence_tokens = self.tokenizer(sentence, return_tensors="pt", truncation=False, padding=False)
-                sentence_length = sentence_tokens["input_ids"].shape[1]
-            except:
-                # 토크나이징 실패 시 대략적인 길이 추정
-                sentence_length = len(sentence) // 2  # 대략적인 토큰 수 추정
+        for sentences in paragraphs:
+            paragraph_length = sentences[-1][1] - sentences[0][0]
             
-            if current_length + sentence_length > max_length - 50:  # 여유 공간
-                if current_chunk:
-                    chunks.append(" ".join(current_chunk))
-                # 오버랩: 이전 청크의 마지막 2-3개 문장 포함
-                overlap_count = min(3, len(current_chunk))
-                overlap_sentences = current_chunk[-overlap_count:] if overlap_count > 0 else []
-                current_chunk = overlap_sentences + [sentence]
-                # 현재 청크 길이 재계산
-                try:
-                    current_length = sum([
-                        len(self.tokenizer(s, return_tensors="pt", truncation=False, padding=False)["input_ids"][0]) 
-                        for s in current_chunk
-                    ])
-                except:
-                    current_length = sum([len(s) // 2 for s in current_chunk])
-            else:
-                current_chunk.append(sentence)
-                current_length += sentence_length
+            # 예산 안에 들어가는 단락은 다음 경계 단락까지 앞 단락들과 이어서 묶음
+            if current_chunk and current_length + paragraph_length > budget:
+                groups.append(current_chunk)
+                current_chunk = []
+                current_length = 0
+            if paragraph_length <= budget:
+                current_chunk.extend(sentences)
+                current_length += paragraph_length
+                paragraph_ids = array("q", input_ids[sentences[0][0]:sentences[-1][1]])
+                if zlib.crc32(paragraph_ids.tobytes()) % CHUNK_ANCHOR_MODULUS == 0:
+                    groups.append(current_chunk)
+                    current_chunk = []
+                    current_length = 0
+                continue
+            
+            # 예산보다 긴 단락: 문장 단위 슬라이딩 윈도우
+            for sentence in sentences:
+                sentence_length = sentence[1] - sentence[0]
+                
+                if current_length + sentence_length > budget:
+                    if current_chunk:
+                        groups.append(current_chunk)
+                    # 오버랩: 같은 단락 이전 청크의 마지막 2-3개 문장 포함 (토큰 수는 구간 길이로 바로 계산)
+                    overlap_count = min(overlap_sentences, len(current_chunk))
+                    current_chunk = (current_chunk[-overlap_count:] if overlap_count > 0 else []) + [sentence]
+                    current_length = sum(s[1] - s[0] for s in current_chunk)
+                else:
+                    current_chunk.append(sentence)
+                    current_length += sentence_length
+            
+            # 긴 단락의 마지막 청크는 다음 단락과 묶지 않음 (오버랩 문장이 다음 단락으로 넘어가지 않도록)
+            groups.append(current_chunk)
+            current_chunk = []
+            current_length = 0
         
         if current_chunk:
-            chunks.append(" ".join(current_chunk))
+            groups.append(current_chunk)
         
-        return chunks if chunks else [text]
-    
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """텍스트를 문장 단위로 분할 (한국어 최적화)"""
-        # 한국어 문장 종결 기호로 분할
-        # 마침표, 느낌표, 물음표, 한자 마침표 등
-        sentences = re.split(r'[.!?。！？]\s*', text)
-        # 빈 문장 제거 및 공백 정리
-        sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 1]
-        
-        # 문장이 없으면 전체 텍스트를 하나의 문장으로 처리
-        return sentences if sentences else [text]
+        # 문장 그룹을 토큰 윈도우로 변환 (한 문장이 최대 길이를 넘으면 윈도우 단위로 분할)
+        window = max_length - self.tokenizer.num_special_tokens_to_add() - len(prefix_ids)
+        chunks = []
+        for group in groups:
+            token_start, token_end = group[0][0], group[-1][1]
+            for start in range(token_start, token_end, window):
+                end = min(start + window, token_end)
+                char_start = group[0][2] if start == token_start else offsets[start][0]
+                char_end = group[-1][3] if end == token_end else offsets[end - 1][1]
+                chunks.append(TextChunk(
+                    self._with_special_tokens(prefix_ids + input_ids[start:end]),
+                    char_start + char_shift,
+                    char_end + char_shift
+                ))
+        
+        return chunks
     
-    def _calculate_chunk_weight(self, chunk_index: int, total_chunks: int, chunk_text: str) -> float:
-        """청크의 가중치 계산 (위치와 길이 고려)"""
+    def _calculate_chunk_weights(self, plan: InferencePlan) -> np.ndarray:
+        """청크별 가중치 계산 (위치와 길이 고려)"""
         # 첫 부분과 끝 부분에 더 높은 가중치
-        if chunk_index == 0:
-            position_weight = 1.5  # 첫 부분
-        elif chunk_index == total_chunks - 1:
-            position_weight = 1.3  # 끝 부분
-        else:
-            position_weight = 1.0  # 중간 부분
+        position_weights = np.ones(len(plan.chunks), dtype=np.float32)  # 중간 부분
+        position_weights[-1] = 1.3  # 끝 부분
+        position_weights[0] = 1.5  # 첫 부분
         
         # 길이 가중치 (긴 청크에 더 높은 가중치)
-        length_weight = min(len(chunk_text) / 200, 1.2)
+        chunk_lengths = np.array([chunk.end - chunk.start for chunk in plan.chunks], dtype=np.float32)
+        length_weights = np.minimum(chunk_lengths / 200, 1.2)
         
-        return position_weight * length_weight
+        return position_weights * length_weights
     
-    def _aggregate_chunk_results(self, chunk_results: List[Dict], full_text: str) -> FallacyResult:
-        """청크 결과를 집계하여 최종 결과 생성"""
-        total_weight = sum(r['weight'] for r in chunk_results)
+    def _aggregate_chunk_results(self, probabilities: np.ndarray, weights: np.ndarray, full_text: str) -> FallacyResult:
+        """청크별 확률((청크 수, 라벨 수))을 벡터 연산으로 집계하여 최종 결과 생성"""
+        chunk_count = probabilities.shape[0]
+        total_weight = float(weights.sum())
+        
+        predicted_classes = probabilities.argmax(axis=1)
+        weighted_confidences = probabilities.max(axis=1) * weights
         
         # 가중 평균 신뢰도 계산
-        weighted_confidence = sum(
-            r['result'].confidence * r['weight'] for r in chunk_results
-        ) / total_weight if total_weight > 0 else 0.0
-        
-        # 가장 높은 신뢰도를 가진 오류 타입 선택
-        fallacy_types = {}
-        for r in chunk_results:
-            if r['result'].has_fallacy and r['result'].fallacy_type:
-                fallacy_type = r['result'].fallacy_type
-                weighted_conf = r['result'].confidence * r['weight']
-                if fallacy_type not in fallacy_types or fallacy_types[fallacy_type] < weighted_conf:
-                    fallacy_types[fallacy_type] = weighted_conf
+        weighted_confidence = float(weighted_confidences.sum()) / total_weight if total_weight > 0 else 0.0
+        
+        # 오류 타입별로 가장 높은 가중 신뢰도 선택
+        is_fallacy_class = np.array([
+            self.id_to_label.get(class_id, "no_fallacy") != "no_fallacy"
+            for class_id in range(probabilities.shape[1])
+        ])
+        fallacy_chunks = is_fallacy_class[predicted_classes]
         
         # 최종 오류 타입 결정
-        if fallacy_types:
-            final_fallacy_type = max(fallacy_types.items(), key=lambda x: x[1])[0]
+        if fallacy_chunks.any():
+            type_scores = np.zeros(probabilities.shape[1], dtype=np.float32)
+            np.maximum.at(type_scores, predicted_classes[fallacy_chunks], weighted_confidences[fallacy_chunks])
+            final_class = int(type_scores.argmax())
+            final_fallacy_type = self.id_to_label[final_class]
             has_fallacy = True
-            final_confidence = fallacy_types[final_fallacy_type] / total_weight
+            final_confidence = float(type_scores[final_class]) / total_weight if total_weight > 0 else 0.0
             explanation = self.fallacy_definitions.get(final_fallacy_type, "알 수 없는 오류 타입")
-            explanation += f" (긴 논증 분석: {len(chunk_results)}개 구간 분석 결과 집계)"
+            explanation += f" (긴 논증 분석: {chunk_count}개 구간 분석 결과 집계)"
         else:
             final_fallacy_type = None
             has_fallacy = False
@@ -321,52 +728,21 @@ class FallacyDetector:
         )
     
     def _calculate_topic_relevance(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None) -> Optional[float]:
-        """주제 연관성 점수 계산 (간단한 키워드 기반)"""
-        if not topic_title and not topic_description:
-            return None
-        
-        # 간단한 키워드 매칭 방식 (향후 개선 가능)
-        topic_keywords = set()
-        if topic_title:
-            topic_keywords.update(topic_title.split())
-        if topic_description:
-            topic_keywords.update(topic_description.split())
-        
-        text_words = set(text.split())
-        
-        # 공통 키워드 비율 계산
-        common_keywords = topic_keywords.intersection(text_words)
-        if len(topic_keywords) > 0:
-            relevance = len(common_keywords) / len(topic_keywords)
-            return min(relevance, 1.0)
-        
-        return 0.5  # 기본값
+        """주제 연관성 점수 계산 (토픽 임베딩 코사인 유사도, 임베딩 모델이 없으면 글자 bigram 겹침)"""
+        return self.relevance_scorer.score(text, topic_title, topic_description)
     
-    def _analyze_logical_structure(self, text: str) -> Dict:
-        """논리 구조 분석 (문장 수, 단락 수, 논리 연결어 등)"""
-        sentences = self._split_into_sentences(text)
-        paragraphs = text.split('\n\n')
-        
-        # 논리 연결어 탐지
-        logical_connectors = ['따라서', '그러므로', '그런데', '하지만', '그러나', '또한', '또', '그리고', '또한', '또한', '그러나', '하지만', '반면', '그러므로', '따라서', '결론적으로', '요약하면']
-        connector_count = sum(1 for s in sentences for connector in logical_connectors if connector in s)
-        
-        return {
-            'sentence_count': len(sentences),
-            'paragraph_count': len([p for p in paragraphs if p.strip()]),
-            'logical_connector_count': connector_count,
-            'avg_sentence_length': sum(len(s) for s in sentences) / len(sentences) if sentences else 0,
-            'text_length': len(text)
-        }
+    def _analyze_logical_structure(self, text: str, analysis: Optional[TextAnalysis] = None) -> Dict:
+        """논리 구조 분석 (문장 수, 단락 수, 논리 연결어 등, 청크 분할 때 스캔한 결과가 있으면 재사용)"""
+        return (analysis or self.text_analyzer.analyze(text)).logical_structure()
     
     def _prepare_inputs(self, text: str, max_length: int = 512):
         """텍스트를 토크나이징 (이제는 _predict_long_text에서 처리)"""
-        # 이 메서드는 이제 사용되지 않지만 호환성을 위해 유지
-        return self.tokenizer(
+        # 이 메서드는 이제 사용되지 않지만 호환성을 위해 유지 (512 고정 패딩 대신 실제 길이 사용)
+        return self._tokenize(
             text,
-            return_tensors="pt",
+            return_tensors="np",
             truncation=True,
-            padding="max_length",
+            padding="longest",
             max_length=max_length
         )
 
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("torch", "onnx")
+
+# 원본 가중치 파일 (버전/캐시 유효성 검사용)
+WEIGHT_FILES = ("model.safetensors", "pytorch_model.bin")
+
+# ONNX 내보내기 결과는 모델 디렉토리 아래에 모델과 함께 버전 관리
+ONNX_DIR = "onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+ONNX_MANIFEST_FILE = "manifest.json"
+ONNX_OPSET = 17
+
+
+def source_fingerprint(model_dir: str) -> Optional[Dict]:
+    """원본 가중치 파일의 이름/크기/수정 시각 (가중치가 바뀌면 파생 산출물 무효화)"""
+    for name in WEIGHT_FILES:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            return {"weights": name, "size": stat.st_size, "mtime": int(stat.st_mtime)}
+    return None
+
+
+def model_version(model_dir: str) -> Optional[str]:
+    """원본 가중치 기준 모델 버전 문자열"""
+    fingerprint = source_fingerprint(model_dir)
+    if fingerprint is None:
+        return None
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class InferenceBackend:
+    """추론 백엔드: 패딩된 토큰 ID 배치를 받아 로짓 (배치 크기, 라벨 수) 반환"""
+
+    name = "base"
+    model = None  # 백엔드별 실제 모델 객체 (torch 모듈, ORT 세션)
+
+    def __init__(self):
+        self.precision = "fp32"
+        self.early_exit_threshold = 0.0  # 0이면 조기 종료 없이 전체 레이어 실행
+
+    def predict_logits(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def predict_logits_with_exit(self, input_ids: np.ndarray,
+                                 attention_mask: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """로짓과 행별 종료 레이어 (조기 종료를 사용하지 않으면 종료 레이어는 None)"""
+        return self.predict_logits(input_ids, attention_mask), None
+
+
+class TorchBackend(InferenceBackend):
+    """PyTorch 백엔드 (정밀도 모드 지원: fp32 / int8 / bf16)"""
+
+    name = "torch"
+
+    def __init__(self, source: str, model_dir: Optional[str] = None, num_labels: Optional[int] = None,
+                 precision: str = "fp32", early_exit_threshold: float = 0.0, mmap_weights: bool = True):
+        super().__init__()
+        import torch
+        from transformers import AutoModelForSequenceClassification
+        from app.models.adapters import is_adapter_dir, load_adapter_model
+        from app.models.model_artifact import WEIGHTS_FILE, load_mmap_model
+        from app.models.quantization import (
+            SUPPORTED_PRECISIONS, cpu_supports_bf16, quantize_int8, load_cached_int8, save_cached_int8
+        )
+
+        self._torch = torch
+        self.early_exit = None
+        self.precision = precision.lower() if precision else "fp32"
+        if self.precision not in SUPPORTED_PRECISIONS:
+            logger.warning(f"Unknown precision '{self.precision}', using fp32")
+            self.precision = "fp32"
+
+        # INT8 모드는 모델 디렉토리에 캐시된 양자화 모델이 있으면 fp32 가중치 로드/재양자화 생략
+        self.model = load_cached_int8(model_dir) if self.precision == "int8" and model_dir else None
+        adapter = is_adapter_dir(model_dir)
+        if self.model is None:
+            if adapter:
+                # LoRA 어댑터: 기본 모델 위에 병합 (어댑터 디렉토리에는 원본 가중치가 없으므로 INT8 결과는 캐시되지 않음)
+                self.model = load_adapter_model(model_dir, mmap_weights=mmap_weights)
+            # safetensors 가중치는 읽기 전용으로 매핑 (fp32는 페이지 캐시를 그대로 사용, int8/bf16은 변환 결과만 메모리에 둠)
+            elif mmap_weights and model_dir and os.path.exists(os.path.join(model_dir, WEIGHTS_FILE)):
+                try:
+                    self.model = load_mmap_model(model_dir)
+                    logger.info(f"Memory-mapped model weights from {model_dir}")
+                except Exception as e:
+                    logger.warning(f"Could not memory-map model weights, loading normally: {e}")
+            if self.model is None:
+                kwargs = {"num_labels": num_labels} if num_labels else {}
+                self.model = AutoModelForSequenceClassification.from_pretrained(source, **kwargs)
+
+            if self.precision == "int8":
+                self.model = quantize_int8(self.model)
+                if model_dir:
+                    save_cached_int8(self.model, model_dir)
+            elif self.precision == "bf16":
+                if cpu_supports_bf16():
+                    self.model = self.model.to(torch.bfloat16)
+                else:
+                    logger.warning("CPU does not support bf16, using fp32")
+                    self.precision = "fp32"
+        self.model.eval()
+
+        # 조기 종료: 학습된 중간 레이어 헤드가 있을 때만 사용 (어댑터는 중간 레이어 표현이 달라 헤드를 쓸 수 없음)
+        if early_exit_threshold > 0 and adapter:
+            logger.warning("Early exit is not supported for adapter models, using full-depth inference")
+        elif early_exit_threshold > 0 and model_dir:
+            from app.models.early_exit import load_early_exit
+            self.early_exit = load_early_exit(self.model, model_dir)
+            if self.early_exit is not None:
+                self.early_exit_threshold = early_exit_threshold
+
+    def predict_logits(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        torch = self._torch
+        with torch.no_grad():
+            outputs = self.model(
+                input_ids=torch.from_numpy(input_ids),
+                attention_mask=torch.from_numpy(attention_mask)
+            )
+        return outputs.logits.float().numpy()
+
+    def predict_logits_with_exit(self, input_ids: np.ndarray,
+                                 attention_mask: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self.early_exit is None:
+            return super().predict_logits_with_exit(input_ids, attention_mask)
+        return self.early_exit(input_ids, attention_mask, self.early_exit_threshold)
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime 백엔드 (동적 배치/시퀀스 축으로 내보낸 그래프 실행, torch 불필요)"""
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, precision: str = "fp32", intra_op_threads: int = 0):
+        super().__init__()
+        self.onnx_path = os.path.join(model_dir, ONNX_DIR, ONNX_MODEL_FILE)
+        if precision == "int8":
+            self.onnx_path = quantize_onnx_int8(model_dir)
+            self.precision = "int8"
+        elif precision not in (None, "", "fp32"):
+            logger.warning(f"Precision '{precision}' is not supported by the ONNX backend, using fp32")
+        self.intra_op_threads = intra_op_threads
+        self._session = None
+        self._input_names = set()
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """ORT 세션 (첫 사용 시 생성: 세션 스레드 풀은 fork 후 안전하지 않으므로 워커 프로세스에서 생성)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._create_session()
+        return self._session
+
+    def set_intra_op_threads(self, threads: int):
+        """스레드 수 변경 (이미 만든 세션은 버리고 다음 사용 시 새 스레드 수로 다시 생성)"""
+        with self._lock:
+            self.intra_op_threads = threads
+            self._session = None
+
+    def _create_session(self):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads > 0:
+            options.intra_op_num_threads = self.intra_op_threads
+        session = ort.InferenceSession(self.onnx_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in session.get_inputs()}
+        self._session = session
+        logger.info(f"ONNX Runtime session created: {self.onnx_path}")
+
+    def predict_logits(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        session = self.model
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        return session.run(["logits"], feeds)[0].astype(np.float32)
+
+
+def _read_onnx_manifest(model_dir: str) -> Optional[Dict]:
+    manifest_path = os.path.join(model_dir, ONNX_DIR, ONNX_MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def onnx_export_is_current(model_dir: str) -> bool:
+    """ONNX 내보내기 결과가 현재 가중치와 같은 버전인지 확인"""
+    manifest = _read_onnx_manifest(model_dir)
+    return (
+        manifest is not None
+        and manifest.get("model_version") == model_version(model_dir)
+        and os.path.exists(os.path.join(model_dir, ONNX_DIR, ONNX_MODEL_FILE))
+    )
+
+
+def export_onnx(model_dir: str, opset: int = ONNX_OPSET) -> str:
+    """학습된 모델을 동적 축(batch, sequence) ONNX 그래프로 내보내고 모델 버전을 manifest에 기록"""
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    version = model_version(model_dir)
+    output_dir = os.path.join(model_dir, ONNX_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    onnx_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.config.return_dict = False
+    model.eval()
+
+    dummy_input_ids = torch.ones((1, 16), dtype=torch.long)
+    dummy_attention_mask = torch.ones((1, 16), dtype=torch.long)
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch"}
+    }
+
+    started = time.time()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy_input_ids, dummy_attention_mask),
+            onnx_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+
+    # 이전 버전의 파생 산출물(INT8 등) 제거
+    int8_path = os.path.join(output_dir, ONNX_INT8_MODEL_FILE)
+    if os.path.exists(int8_path):
+        os.remove(int8_path)
+
+    with open(os.path.join(output_dir, ONNX_MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "model_version": version,
+            "source": source_fingerprint(model_dir),
+            "opset": opset,
+            "num_labels": model.config.num_labels,
+            "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }, f, indent=2)
+
+    logger.info(f"ONNX model exported in {time.time() - started:.1f}s: {onnx_path} (version={version})")
+    return onnx_path
+
+
+def quantize_onnx_int8(model_dir: str) -> str:
+    """ONNX 그래프 동적 INT8 양자화 (결과를 ONNX 디렉토리에 캐시)"""
+    source_path = os.path.join(model_dir, ONNX_DIR, ONNX_MODEL_FILE)
+    int8_path = os.path.join(model_dir, ONNX_DIR, ONNX_INT8_MODEL_FILE)
+    if not os.path.exists(int8_path) or os.path.getmtime(int8_path) < os.path.getmtime(source_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(source_path, int8_path, weight_type=QuantType.QInt8)
+        logger.info(f"ONNX INT8 model cached: {int8_path}")
+    return int8_path
+
+
+def create_backend(kind: str, source: str, model_dir: Optional[str] = None, num_labels: Optional[int] = None,
+                   precision: str = "fp32", intra_op_threads: int = 0, early_exit_threshold: float = 0.0,
+                   mmap_weights: bool = True) -> InferenceBackend:
+    """설정에 맞는 추론 백엔드 생성 (ONNX 사용 불가 시 PyTorch로 대체)"""
+    kind = (kind or "torch").lower()
+    if kind not in SUPPORTED_BACKENDS:
+        logger.warning(f"Unknown inference backend '{kind}', using torch")
+        kind = "torch"
+
+    if kind == "onnx":
+        from app.models.adapters import is_adapter_dir
+
+        if is_adapter_dir(model_dir):
+            logger.warning("ONNX backend does not support adapter models, using torch")
+        elif not model_dir:
+            logger.warning("ONNX backend requires a trained model directory, using torch")
+        else:
+            try:
+                if not onnx_export_is_current(model_dir):
+                    logger.info("ONNX export missing or stale, exporting now")
+                    export_onnx(model_dir)
+                if early_exit_threshold > 0:
+                    logger.warning("Early exit is only supported by the torch backend, using full-depth inference")
+                return OnnxBackend(model_dir, precision=precision, intra_op_threads=intra_op_threads)
+            except Exception as e:
+                logger.warning(f"ONNX backend unavailable, using torch: {e}")
+
+    return TorchBackend(
+        source,
+        model_dir=model_dir,
+        num_labels=num_labels,
+        precision=precision,
+        early_exit_threshold=early_exit_threshold,
+        mmap_weights=mmap_weights
+    )
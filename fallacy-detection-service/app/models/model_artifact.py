@@ -0,0 +1,222 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 서빙용 모델 아티팩트: safetensors 가중치 + config + 토크나이저 + 라벨 매핑 + 파일별 해시 매니페스트
+ARTIFACT_MANIFEST_FILE = "artifact.json"
+ARTIFACT_FORMAT_VERSION = 1
+WEIGHTS_FILE = "model.safetensors"
+LEGACY_WEIGHTS_FILE = "pytorch_model.bin"
+SHARDED_INDEX_FILE = "model.safetensors.index.json"
+
+# 가중치 외에 아티팩트에 포함하는 파일 (있는 것만)
+ARTIFACT_FILE_PATTERNS = (
+    "config.json", "label_mapping.json", "tokenizer*.json", "special_tokens_map.json", "added_tokens.json",
+    "vocab.txt", "vocab.json", "merges.txt", "*.model"
+)
+# 모델 버전으로 유효성을 검사하는 파생 산출물 (다른 디렉토리로 내보낼 때 함께 복사)
+DERIVED_DIRS = ("early_exit", "onnx")
+# Trainer 체크포인트/옵티마이저 상태 등 서빙에 필요 없는 학습 산출물
+TRAINING_LEFTOVERS = ("training_args.bin", "optimizer.pt", "scheduler.pt", "rng_state.pth", "trainer_state.json")
+TRAINING_LEFTOVER_DIRS = ("checkpoint-*", "runs")
+
+# safetensors 헤더의 dtype 이름
+_SAFETENSORS_DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool"
+}
+
+
+class ArtifactError(ValueError):
+    """아티팩트 파일이 매니페스트와 다름 (누락, 크기/해시 불일치)"""
+
+
+def _sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _artifact_files(model_dir: str) -> List[str]:
+    names = set()
+    for pattern in ARTIFACT_FILE_PATTERNS:
+        names.update(os.path.basename(path) for path in glob.glob(os.path.join(model_dir, pattern)))
+    names.discard(ARTIFACT_MANIFEST_FILE)
+    return sorted(names)
+
+
+def read_manifest(model_dir: str) -> Optional[Dict]:
+    path = os.path.join(model_dir, ARTIFACT_MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_artifact(model_dir: str, output_dir: Optional[str] = None) -> Dict:
+    """학습 결과 디렉토리를 서빙용 아티팩트로 정리 (output_dir이 없으면 제자리에서 정리)
+
+    가중치가 pytorch_model.bin이면 safetensors로 변환하고, 제자리 정리 시 Trainer 학습 산출물은 삭제합니다.
+    다른 디렉토리로 내보낼 때는 수정 시각을 유지하여 복사하므로 조기 종료 헤드/ONNX 그래프의 모델 버전이 그대로 유효합니다.
+    """
+    output_dir = output_dir or model_dir
+    in_place = os.path.abspath(output_dir) == os.path.abspath(model_dir)
+    if os.path.exists(os.path.join(model_dir, SHARDED_INDEX_FILE)):
+        raise ArtifactError("Sharded checkpoints are not supported as serving artifacts")
+    os.makedirs(output_dir, exist_ok=True)
+
+    weights_path = os.path.join(model_dir, WEIGHTS_FILE)
+    if not os.path.exists(weights_path):
+        if not os.path.exists(os.path.join(model_dir, LEGACY_WEIGHTS_FILE)):
+            raise ArtifactError(f"No model weights found in {model_dir}")
+        from transformers import AutoModelForSequenceClassification
+
+        logger.info(f"Converting {LEGACY_WEIGHTS_FILE} to {WEIGHTS_FILE}")
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        model.save_pretrained(output_dir, safe_serialization=True)
+        if in_place:
+            os.remove(os.path.join(model_dir, LEGACY_WEIGHTS_FILE))
+    elif not in_place:
+        shutil.copy2(weights_path, os.path.join(output_dir, WEIGHTS_FILE))
+
+    names = _artifact_files(model_dir)
+    if in_place:
+        _clean_training_leftovers(model_dir)
+    else:
+        for name in names:
+            if not os.path.exists(os.path.join(output_dir, name)):
+                shutil.copy2(os.path.join(model_dir, name), os.path.join(output_dir, name))
+        for name in DERIVED_DIRS:
+            source = os.path.join(model_dir, name)
+            if os.path.isdir(source):
+                shutil.copytree(source, os.path.join(output_dir, name), dirs_exist_ok=True)
+
+    return _write_manifest(output_dir, WEIGHTS_FILE, names)
+
+
+def _clean_training_leftovers(model_dir: str):
+    for name in TRAINING_LEFTOVERS:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    for pattern in TRAINING_LEFTOVER_DIRS:
+        for path in glob.glob(os.path.join(model_dir, pattern)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _write_manifest(output_dir: str, weights: str, names: List[str], **extra) -> Dict:
+    files = {}
+    for name in [weights] + names:
+        path = os.path.join(output_dir, name)
+        files[name] = {"size": os.path.getsize(path), "sha256": _sha256(path)}
+    manifest = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "weights": weights,
+        "files": files,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **extra
+    }
+    path = os.path.join(output_dir, ARTIFACT_MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+    total = sum(entry["size"] for entry in files.values())
+    logger.info(f"Model artifact written: {output_dir} ({len(files)} files, {total / 1024 / 1024:.1f}MB)")
+    return manifest
+
+
+def write_adapter_artifact(adapter_dir: str, base_model_dir: str) -> Dict:
+    """peft로 저장한 LoRA 어댑터 디렉토리를 아티팩트로 정리 (제자리, 기본 모델 경로/버전을 매니페스트에 기록)
+
+    어댑터는 학습한 기본 모델 위에서만 의미가 있으므로, 로드할 때 기본 모델 버전이 다르면 거부합니다.
+    """
+    from app.models.adapters import ADAPTER_CONFIG_FILE, ADAPTER_WEIGHTS_FILE
+    from app.models.inference_backend import model_version
+
+    if not os.path.exists(os.path.join(adapter_dir, ADAPTER_WEIGHTS_FILE)):
+        raise ArtifactError(f"No adapter weights found in {adapter_dir}")
+    _clean_training_leftovers(adapter_dir)
+    return _write_manifest(
+        adapter_dir,
+        ADAPTER_WEIGHTS_FILE,
+        [ADAPTER_CONFIG_FILE] + _artifact_files(adapter_dir),
+        kind="adapter",
+        base_model={"path": os.path.abspath(base_model_dir), "version": model_version(base_model_dir)}
+    )
+
+
+def verify_artifact(model_dir: str, check_hashes: bool = False) -> Optional[Dict]:
+    """매니페스트의 파일 목록/크기(check_hashes이면 sha256까지) 확인 (매니페스트가 없으면 None)"""
+    manifest = read_manifest(model_dir)
+    if manifest is None:
+        return None
+    for name, entry in manifest["files"].items():
+        path = os.path.join(model_dir, name)
+        if not os.path.exists(path):
+            raise ArtifactError(f"Artifact file is missing: {name}")
+        if os.path.getsize(path) != entry["size"]:
+            raise ArtifactError(f"Artifact file size mismatch: {name}")
+        if check_hashes and _sha256(path) != entry["sha256"]:
+            raise ArtifactError(f"Artifact file hash mismatch: {name}")
+    return manifest
+
+
+def mmap_safetensors(path: str) -> Dict:
+    """safetensors 파일을 읽기 전용(MAP_PRIVATE)으로 매핑하여 복사 없이 텐서 생성
+
+    텐서는 페이지 캐시를 직접 가리키므로 로드 시간은 헤더 파싱뿐이고, 실제 읽기는 첫 추론 때 페이지 폴트로 일어납니다.
+    같은 호스트의 여러 프로세스가 같은 파일을 매핑하면 물리 메모리를 공유합니다.
+    """
+    import torch
+
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+    data_start = 8 + header_size
+
+    storage = torch.UntypedStorage.from_file(path, shared=False, nbytes=os.path.getsize(path))
+    buffer = torch.empty(0, dtype=torch.uint8).set_(storage)
+    tensors = {}
+    for name, info in header.items():
+        dtype = getattr(torch, _SAFETENSORS_DTYPES[info["dtype"]])
+        start, end = info["data_offsets"]
+        raw = buffer[data_start + start:data_start + end]
+        if (data_start + start) % torch.empty((), dtype=dtype).element_size():
+            raw = raw.clone()  # 정렬되지 않은 텐서만 복사
+        tensors[name] = raw.view(dtype).reshape(info["shape"])
+    return tensors
+
+
+def load_mmap_model(model_dir: str):
+    """config로 모델 구조만 만들고(가중치 초기화 생략) 매핑한 safetensors 텐서를 그대로 파라미터로 사용"""
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+
+    config = AutoConfig.from_pretrained(model_dir)
+    try:
+        from transformers.modeling_utils import no_init_weights
+    except ImportError:
+        model = AutoModelForSequenceClassification.from_config(config)
+    else:
+        # 초기화하지 않은 파라미터는 곧 매핑된 텐서로 교체되므로 메모리에 닿지 않음
+        with no_init_weights():
+            model = AutoModelForSequenceClassification.from_config(config)
+
+    state_dict = mmap_safetensors(os.path.join(model_dir, WEIGHTS_FILE))
+    missing, unexpected = model.load_state_dict(state_dict, strict=False, assign=True)
+    if missing:
+        raise ArtifactError(f"Weights are missing parameters: {missing[:5]}")
+    if unexpected:
+        logger.warning(f"Ignoring unexpected weights: {unexpected[:5]}")
+    return model
@@ -0,0 +1,87 @@
+import io
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+import torch
+
+from app.models.inference_backend import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_PRECISIONS = ("fp32", "int8", "bf16")
+
+# 양자화 결과는 label_mapping.json과 같은 모델 디렉토리 아래에 캐시
+QUANTIZED_DIR = "quantized"
+INT8_MODEL_FILE = "int8_dynamic.pt"
+INT8_META_FILE = "int8_dynamic.json"
+
+
+def cpu_supports_bf16() -> bool:
+    """CPU의 bf16 연산 지원 여부 (AVX512-BF16 또는 AMX)"""
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            flags = f.read()
+        return "avx512_bf16" in flags or "amx_bf16" in flags
+    except OSError:
+        return False
+
+
+def _source_fingerprint(model_dir: str) -> Optional[Dict]:
+    """원본 가중치 파일의 크기/수정 시각과 torch 버전 (원본이 바뀌면 캐시 무효화)"""
+    fingerprint = source_fingerprint(model_dir)
+    if fingerprint is None:
+        return None
+    return {**fingerprint, "torch": torch.__version__}
+
+
+def quantize_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """Linear 레이어 동적 INT8 양자화"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_cached_int8(model_dir: str) -> Optional[torch.nn.Module]:
+    """캐시된 INT8 모델 로드 (원본 가중치가 바뀌었으면 None)"""
+    model_file = os.path.join(model_dir, QUANTIZED_DIR, INT8_MODEL_FILE)
+    meta_file = os.path.join(model_dir, QUANTIZED_DIR, INT8_META_FILE)
+    if not os.path.exists(model_file) or not os.path.exists(meta_file):
+        return None
+
+    try:
+        with open(meta_file, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta != _source_fingerprint(model_dir):
+            logger.info("Quantized model cache is stale, re-quantizing")
+            return None
+        # 직접 생성한 로컬 캐시이므로 모듈 전체를 역직렬화
+        model = torch.load(model_file, weights_only=False)
+        logger.info(f"Loaded cached INT8 model from {model_file}")
+        return model
+    except Exception as e:
+        logger.warning(f"Could not load quantized model cache: {e}")
+        return None
+
+
+def save_cached_int8(model: torch.nn.Module, model_dir: str):
+    """INT8 모델을 모델 디렉토리에 캐시 (다음 시작 시 재양자화 생략)"""
+    fingerprint = _source_fingerprint(model_dir)
+    if fingerprint is None:
+        return
+
+    try:
+        cache_dir = os.path.join(model_dir, QUANTIZED_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        torch.save(model, os.path.join(cache_dir, INT8_MODEL_FILE))
+        with open(os.path.join(cache_dir, INT8_META_FILE), "w", encoding="utf-8") as f:
+            json.dump(fingerprint, f, indent=2)
+        logger.info(f"Cached INT8 model in {cache_dir}")
+    except Exception as e:
+        logger.warning(f"Could not cache quantized model: {e}")
+
+
+def model_size_bytes(model: torch.nn.Module) -> int:
+    """직렬화된 state_dict 크기 (양자화된 packed 가중치 포함)"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
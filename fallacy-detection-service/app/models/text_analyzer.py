@@ -0,0 +1,122 @@
+import re
+from itertools import chain
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+# 논리 연결어 (중복 없음)
+LOGICAL_CONNECTORS = (
+    "따라서", "그러므로", "그런데", "하지만", "그러나", "또한", "또",
+    "그리고", "반면", "결론적으로", "요약하면"
+)
+
+# 문장 종결 기호 (마침표, 느낌표, 물음표, 한자 마침표 등)
+SENTENCE_END_CHARS = ".!?。！？"
+
+# 스캔 패턴의 그룹 번호
+_PARAGRAPH, _SENTENCE_END, _CONNECTOR = 1, 2, 3
+
+
+def _compile_scanner(connectors: Sequence[str]) -> "re.Pattern":
+    """단락 구분, 문장 종결 기호, 연결어를 한 번에 찾는 패턴 (연결어는 긴 것부터 매칭)
+
+    맨 앞의 전방 탐색 문자 집합으로 후보가 아닌 위치는 분기를 시도하지 않고 건너뛰고,
+    각 분기 끝의 빈 그룹 번호(lastindex)로 매칭 종류를 구분합니다.
+    """
+    ordered = sorted(set(connectors), key=len, reverse=True)
+    first_chars = re.escape("".join(sorted({c[0] for c in ordered})))
+    alternatives = "|".join(re.escape(c) for c in ordered)
+    return re.compile(
+        rf"(?=[\n{SENTENCE_END_CHARS}{first_chars}])"
+        r"(?:\n\s*\n()"
+        rf"|[{SENTENCE_END_CHARS}]()[^\S\n]*"
+        rf"|(?:{alternatives})())"
+    )
+
+
+@dataclass
+class TextAnalysis:
+    """텍스트 한 번 스캔 결과 (문자열 복사 없이 오프셋만 보관)"""
+    text: str
+    sentence_spans: List[Tuple[int, int]] = field(default_factory=list)  # 종결 기호 포함, 앞뒤 공백 제외
+    sentence_lengths: List[int] = field(default_factory=list)  # 종결 기호를 제외한 문장 길이
+    sentence_paragraphs: List[int] = field(default_factory=list)  # 문장별 단락 인덱스
+    paragraph_spans: List[Tuple[int, int]] = field(default_factory=list)  # 공백만 있는 단락 제외
+    connector_hits: List[Tuple[int, str]] = field(default_factory=list)  # (위치, 연결어)
+
+    def sentences_by_paragraph(self) -> List[List[Tuple[int, int]]]:
+        """단락별 문장 구간 목록"""
+        grouped: Dict[int, List[Tuple[int, int]]] = {}
+        for span, paragraph in zip(self.sentence_spans, self.sentence_paragraphs):
+            grouped.setdefault(paragraph, []).append(span)
+        return [grouped[paragraph] for paragraph in sorted(grouped)]
+
+    def logical_structure(self) -> Dict:
+        """논리 구조 요약 (문장 수, 단락 수, 논리 연결어 수 등)"""
+        if self.sentence_lengths:
+            sentence_count = len(self.sentence_lengths)
+            avg_sentence_length = sum(self.sentence_lengths) / sentence_count
+        else:
+            # 문장이 없으면 전체 텍스트를 하나의 문장으로 처리
+            sentence_count = 1
+            avg_sentence_length = len(self.text)
+        return {
+            'sentence_count': sentence_count,
+            'paragraph_count': len(self.paragraph_spans),
+            'logical_connector_count': len(self.connector_hits),
+            'avg_sentence_length': avg_sentence_length,
+            'text_length': len(self.text)
+        }
+
+
+class TextAnalyzer:
+    """문장/단락 경계와 논리 연결어를 한 번의 정규식 스캔으로 추출 (청크 분할, 논리 구조 분석에서 공유)"""
+
+    def __init__(self, connectors: Sequence[str] = LOGICAL_CONNECTORS):
+        self.connectors = tuple(dict.fromkeys(connectors))
+        self._scanner = _compile_scanner(self.connectors)
+
+    def analyze(self, text: str) -> TextAnalysis:
+        analysis = TextAnalysis(text=text)
+        sentence_spans = analysis.sentence_spans
+        sentence_lengths = analysis.sentence_lengths
+        sentence_paragraphs = analysis.sentence_paragraphs
+        paragraph_spans = analysis.paragraph_spans
+        connector_hits = analysis.connector_hits
+        paragraph_index = 0
+        paragraph_start = 0
+        sentence_start = 0
+
+        # 마지막 문장은 텍스트 끝을 단락 구분으로 보고 같은 방식으로 처리
+        for match in chain(self._scanner.finditer(text), (None,)):
+            if match is None:
+                kind, body_end, end = _PARAGRAPH, len(text), len(text)
+            else:
+                kind = match.lastindex
+                body_end = match.start()
+                if kind == _CONNECTOR:
+                    connector_hits.append((body_end, match.group()))
+                    continue
+                end = match.end()
+
+            # 종결 기호는 문장 구간에 포함하고 앞뒤 공백은 제외
+            span_end = body_end + 1 if kind == _SENTENCE_END else body_end
+            start = sentence_start
+            while start < body_end and text[start].isspace():
+                start += 1
+            while body_end > start and text[body_end - 1].isspace():
+                body_end -= 1
+            # 너무 짧은 문장(1글자 이하)은 제외
+            if body_end - start > 1:
+                sentence_spans.append((start, span_end if span_end > body_end else body_end))
+                sentence_lengths.append(body_end - start)
+                sentence_paragraphs.append(paragraph_index)
+            sentence_start = end
+
+            if kind == _PARAGRAPH:
+                # 공백만 있는 단락은 제외
+                paragraph_end = span_end
+                if paragraph_end > paragraph_start and not text[paragraph_start:paragraph_end].isspace():
+                    paragraph_spans.append((paragraph_start, paragraph_end))
+                    paragraph_index += 1
+                paragraph_start = end
+        return analysis
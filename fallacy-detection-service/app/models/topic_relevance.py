@@ -0,0 +1,113 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+
+TopicKey = Tuple[str, str]
+
+
+def char_bigrams(text: str) -> FrozenSet[str]:
+    """공백을 제외한 글자 bigram 집합 (조사가 붙어도 어간 bigram은 그대로 매칭)"""
+    compact = "".join(text.split())
+    if len(compact) < 2:
+        return frozenset([compact]) if compact else frozenset()
+    return frozenset(compact[i:i + 2] for i in range(len(compact) - 1))
+
+
+class TopicRelevanceScorer:
+    """논증-토픽 연관성 점수 (문장 임베딩 코사인 유사도, 임베딩 모델이 없으면 글자 bigram 겹침)
+
+    토픽 쪽 계산(임베딩, bigram 집합)은 (제목, 설명)별로 한 번만 하고 LRU로 캐시합니다.
+    """
+
+    def __init__(self, model_name: Optional[str] = DEFAULT_EMBEDDING_MODEL, cache_size: int = 1024):
+        self.model_name = model_name
+        self.cache_size = max(1, cache_size)
+        self.model = None
+        self._embeddings: "OrderedDict[TopicKey, np.ndarray]" = OrderedDict()
+        self._bigrams: "OrderedDict[TopicKey, FrozenSet[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if model_name:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self.model = SentenceTransformer(model_name, device="cpu")
+                logger.info(f"Topic relevance embedding model loaded: {model_name}")
+            except Exception as e:
+                logger.warning(f"Could not load topic embedding model, using bigram overlap: {e}")
+                self.model = None
+
+    @staticmethod
+    def topic_key(topic_title: Optional[str], topic_description: Optional[str]) -> Optional[TopicKey]:
+        if not topic_title and not topic_description:
+            return None
+        return (topic_title or "", topic_description or "")
+
+    @staticmethod
+    def topic_text(key: TopicKey) -> str:
+        return " ".join(part for part in key if part)
+
+    def _cached(self, cache: OrderedDict, key: TopicKey, compute):
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = compute()
+        with self._lock:
+            cache[key] = value
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return value
+
+    def topic_embedding(self, key: TopicKey) -> np.ndarray:
+        """토픽 임베딩 (정규화된 벡터, 캐시)"""
+        return self._cached(
+            self._embeddings, key,
+            lambda: self.model.encode([self.topic_text(key)], normalize_embeddings=True)[0]
+        )
+
+    def topic_bigrams(self, key: TopicKey) -> FrozenSet[str]:
+        return self._cached(self._bigrams, key, lambda: char_bigrams(self.topic_text(key)))
+
+    def score(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None) -> Optional[float]:
+        return self.score_batch([text], [(topic_title, topic_description)])[0]
+
+    def score_batch(self, texts: List[str], topics: List[Tuple[Optional[str], Optional[str]]]) -> List[Optional[float]]:
+        """여러 논증의 연관성 점수 (논증 임베딩은 한 번의 배치 인코딩, 유사도는 벡터 연산)"""
+        keys = [self.topic_key(title, description) for title, description in topics]
+        scored = [i for i, key in enumerate(keys) if key is not None]
+        scores: List[Optional[float]] = [None] * len(texts)
+        if not scored:
+            return scores
+
+        if self.model is not None:
+            try:
+                text_embeddings = self.model.encode([texts[i] for i in scored], normalize_embeddings=True)
+                topic_embeddings = np.stack([self.topic_embedding(keys[i]) for i in scored])
+                similarities = np.clip(np.einsum("ij,ij->i", text_embeddings, topic_embeddings), 0.0, 1.0)
+                for i, similarity in zip(scored, similarities):
+                    scores[i] = float(similarity)
+                return scores
+            except Exception as e:
+                logger.warning(f"Embedding relevance failed, using bigram overlap: {e}")
+
+        for i in scored:
+            topic_bigrams = self.topic_bigrams(keys[i])
+            if not topic_bigrams:
+                scores[i] = 0.5  # 기본값
+                continue
+            scores[i] = min(len(topic_bigrams & char_bigrams(texts[i])) / len(topic_bigrams), 1.0)
+        return scores
+
+    def get_stats(self):
+        return {
+            "model": self.model_name if self.model is not None else None,
+            "cached_topic_embeddings": len(self._embeddings),
+            "cached_topic_bigrams": len(self._bigrams)
+        }
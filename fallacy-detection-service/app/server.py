@@ -0,0 +1,179 @@
+"""
+프로덕션 서빙 모드 (멀티 프로세스)
+
+부모 프로세스에서 KoELECTRA 가중치를 한 번 로드한 뒤 워커 프로세스를 fork합니다.
+워커들은 가중치 페이지를 copy-on-write로 공유하므로 워커 수만큼 메모리가 늘지 않습니다.
+각 워커는 지정된 CPU 코어에 고정되고 torch 스레드 수도 워커별 예산으로 제한됩니다.
+
+사용법:
+    python -m app.server --workers 4 --threads-per-worker 4
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+
+def _assign_cores(workers: int, threads_per_worker: int) -> List[List[int]]:
+    """사용 가능한 코어를 워커별로 겹치지 않게 분배 (부족하면 순환 배정)"""
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    assignments = []
+    for worker_index in range(workers):
+        start = worker_index * threads_per_worker
+        assignments.append([available[(start + i) % len(available)] for i in range(threads_per_worker)])
+    return assignments
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    """부모 프로세스에서 리스닝 소켓을 열고 워커들이 공유"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(worker_index: int, sock: socket.socket, cores: Optional[List[int]], threads: int, log_level: str):
+    """fork된 워커: 코어 고정, 추론 스레드 예산 설정 후 uvicorn 실행"""
+    import uvicorn
+    from app.main import app
+    from app.api import routes
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    backend = routes.detector.backend if routes.detector is not None else None
+    if backend is not None and backend.name == "onnx":
+        # 부모의 워밍업에서 만든 ORT 세션(기본 스레드 수, fork 후 안전하지 않음)은 버리고
+        # 워커의 스레드 예산으로 세션을 다시 만들어 워밍업 (첫 요청이 세션 생성 비용을 내지 않도록)
+        backend.set_intra_op_threads(threads)
+        try:
+            routes.detector.predict_batch(routes.model_registry.warmup_texts)
+        except Exception as e:
+            logger.warning(f"Worker {worker_index} warm-up failed: {e}")
+    else:
+        import torch
+        torch.set_num_threads(threads)
+    logger.info(f"Worker {worker_index} (pid={os.getpid()}) started: cores={cores}, inference_threads={threads}")
+
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def main():
+    try:
+        from config.settings import settings
+    except ImportError:
+        settings = None
+
+    parser = argparse.ArgumentParser(description="Fallacy Detection Service 멀티 프로세스 서빙")
+    parser.add_argument("--host", default=getattr(settings, "API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=getattr(settings, "API_PORT", 8000))
+    parser.add_argument("--workers", type=int, default=getattr(settings, "SERVING_WORKERS", 2))
+    parser.add_argument("--threads-per-worker", type=int, default=getattr(settings, "SERVING_THREADS_PER_WORKER", 0),
+                        help="워커별 torch 스레드 수 (0이면 코어 수 / 워커 수)")
+    parser.add_argument("--no-pin", action="store_true", help="워커를 CPU 코어에 고정하지 않음")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    workers = max(1, args.workers)
+    cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    threads = args.threads_per_worker or max(1, cpu_count // workers)
+    pin_cores = not args.no_pin and getattr(settings, "SERVING_PIN_CORES", True)
+    core_assignments = _assign_cores(workers, threads) if pin_cores else [None] * workers
+
+    # 모델 로드 (fork한 워커가 가중치를 공유하도록 부모 프로세스에서 워밍업까지 동기적으로 완료)
+    started = time.time()
+    from app.main import app  # noqa: F401
+    from app.api import routes
+
+    if routes.settings.INFERENCE_BACKEND != "onnx":
+        # 부모 프로세스는 torch 스레드 풀을 만들지 않도록 로드 전에 1스레드로 제한
+        # (OpenMP 스레드 풀은 fork 후 자식에서 안전하지 않음, 설정은 이미 읽혔으므로 환경 변수가 아닌 torch에 직접 적용)
+        import torch
+        torch.set_num_threads(1)
+        torch.set_num_interop_threads(1)
+        # 서비스 초기화가 TORCH_*_THREADS 설정으로 부모의 스레드 수를 다시 늘리지 않도록 현재 값 유지(0)로 변경
+        routes.settings.TORCH_INTRA_OP_THREADS = 0
+        routes.settings.TORCH_INTER_OP_THREADS = 0
+    routes.initialize_services()
+    logger.info(f"Model loaded in parent process in {time.time() - started:.1f}s: {routes.startup_report.to_dict()}")
+
+    # 부모의 객체를 GC 추적에서 제외하여 fork 후 GC가 공유 페이지를 건드려 복사되는 것 방지
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind_socket(args.host, args.port)
+    children: Dict[int, int] = {}  # pid -> worker index
+    shutting_down = False
+
+    def spawn(worker_index: int):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                _run_worker(worker_index, sock, core_assignments[worker_index], threads, args.log_level)
+            except Exception as e:
+                logger.error(f"Worker {worker_index} crashed: {e}", exc_info=True)
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        children[pid] = worker_index
+
+    def terminate(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, terminate)
+
+    for worker_index in range(workers):
+        spawn(worker_index)
+    logger.info(f"Serving on {args.host}:{args.port} with {workers} workers ({threads} torch threads each)")
+
+    # 워커 감시: 비정상 종료된 워커는 다시 fork (부모에 모델이 남아 있어 재시작 비용이 작음)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        worker_index = children.pop(pid, None)
+        if worker_index is None:
+            continue
+        if not shutting_down:
+            logger.warning(f"Worker {worker_index} (pid={pid}) exited with status {status}, restarting")
+            time.sleep(1)
+            spawn(worker_index)
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.fallacy_detector import (
+    ANALYSIS_ERROR_EXPLANATION, FallacyDetector, FallacyResult, InferencePlan, TopicPrefix
+)
+from app.services.executors import BoundedExecutor, ExecutorBusyError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BatchItem:
+    """배치 대기열 항목 (청크 하나의 토큰 ID와 (확률, 종료 레이어, 주제 연관성) 결과를 받을 future)"""
+    input_ids: List[int]
+    future: asyncio.Future
+    detector: FallacyDetector  # 요청을 시작한 모델 (모델 교체 중에도 같은 요청의 청크는 같은 모델로 추론)
+    relevance_input: Optional[Tuple[str, Optional[str], Optional[str]]] = None  # (논증, 토픽 제목, 설명): 요청의 첫 청크에만 지정
+
+
+class BatchStats:
+    """배칭 통계 (대기열 깊이, 배치 크기 분포)"""
+
+    def __init__(self):
+        self.batch_count = 0
+        self.item_count = 0
+        self.max_queue_depth = 0
+        self.batch_size_histogram: Counter = Counter()
+        self.queue_depth_histogram: Counter = Counter()
+
+    def record_enqueue(self, queue_depth: int):
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+
+    def record_batch(self, batch_size: int, queue_depth: int):
+        self.batch_count += 1
+        self.item_count += batch_size
+        self.batch_size_histogram[batch_size] += 1
+        self.queue_depth_histogram[queue_depth] += 1
+
+    def to_dict(self, current_queue_depth: int) -> Dict:
+        return {
+            'batch_count': self.batch_count,
+            'item_count': self.item_count,
+            'avg_batch_size': self.item_count / self.batch_count if self.batch_count else 0.0,
+            'queue_depth': current_queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'batch_size_histogram': dict(sorted(self.batch_size_histogram.items())),
+            'queue_depth_histogram': dict(sorted(self.queue_depth_histogram.items()))
+        }
+
+
+class BatchScheduler:
+    """동시 요청(및 긴 논증의 청크)을 모아 한 번의 forward pass로 처리하는 마이크로 배칭 스케줄러"""
+
+    def __init__(self, detector: FallacyDetector, executor: BoundedExecutor,
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        self.detector = detector
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.stats = BatchStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._batch_tasks = set()
+
+    def _ensure_worker(self):
+        """이벤트 루프 안에서 처음 호출될 때 대기열과 워커 시작"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            # 추론 작업자 수만큼 배치를 동시에 실행
+            self._inflight = asyncio.Semaphore(self.executor.max_workers)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, text: str, topic_title: Optional[str] = None, topic_description: Optional[str] = None,
+                     prefix: Optional[TopicPrefix] = None, detector: Optional[FallacyDetector] = None) -> FallacyResult:
+        """텍스트를 배치 대기열에 넣고 결과를 기다림 (prefix: 등록된 토픽의 컨텍스트 접두어, detector: 요청이 사용 중인 모델)"""
+        detector = detector or self.detector
+        if detector.model is None or detector.tokenizer is None:
+            return detector.predict(text, topic_title, topic_description, prefix)
+
+        try:
+            # 토크나이징/결과 집계도 CPU 작업이므로 추론 실행기에서 처리
+            plan = await self.executor.run(detector.plan_inference, text, prefix=prefix)
+            # 주제 연관성은 같은 마이크로 배치의 다른 요청과 함께 한 번에 계산
+            items = self._enqueue(plan, detector, (plan.argument_text, topic_title, topic_description))
+            outputs = await asyncio.gather(*(item.future for item in items))
+            probabilities = [row for row, _, _ in outputs]
+            exit_layers = [layer for _, layer, _ in outputs]
+            if any(layer is None for layer in exit_layers):
+                exit_layers = None
+            return await self.executor.run(
+                detector.build_result, plan, probabilities, topic_title, topic_description, exit_layers, outputs[0][2]
+            )
+        except (asyncio.CancelledError, ExecutorBusyError):
+            raise
+        except Exception as e:
+            logger.error(f"Batched prediction failed: {e}")
+            return FallacyResult(
+                text=text,
+                has_fallacy=False,
+                fallacy_type=None,
+                confidence=0.0,
+                explanation=ANALYSIS_ERROR_EXPLANATION
+            )
+
+    def _enqueue(self, plan: InferencePlan, detector: FallacyDetector,
+                 relevance_input: Optional[Tuple[str, Optional[str], Optional[str]]] = None) -> List[_BatchItem]:
+        """추론 계획의 청크를 순서대로 배치 대기열에 넣음 (relevance_input은 첫 청크와 함께 배치에서 계산)"""
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        items = [
+            _BatchItem(input_ids=chunk.input_ids, future=loop.create_future(), detector=detector)
+            for chunk in plan.chunks
+        ]
+        if items:
+            items[0].relevance_input = relevance_input
+        for item in items:
+            self._queue.put_nowait(item)
+        self.stats.record_enqueue(self._queue.qsize())
+        return items
+
+    async def stream_chunks(self, plan: InferencePlan,
+                            detector: Optional[FallacyDetector] = None) -> AsyncIterator[Tuple[int, np.ndarray, Optional[int]]]:
+        """청크별 (인덱스, 확률, 종료 레이어)를 계산되는 대로 반환
+
+        호출자가 도중에 반복을 멈추면(스트림 취소, 조기 중단) 아직 배치에 들어가지 않은 청크는 추론하지 않습니다.
+        """
+        items = self._enqueue(plan, detector or self.detector)
+        pending = {item.future: index for index, item in enumerate(items)}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=pending.get):
+                    index = pending.pop(future)
+                    row, exit_layer, _ = future.result()
+                    yield index, row, exit_layer
+        finally:
+            # 완료되지 않은 청크 취소 (배치 수집 시 완료된 항목은 제외됨)
+            for future in pending:
+                future.cancel()
+
+    async def _collect_batch(self) -> List[_BatchItem]:
+        """첫 항목 도착 후 max_wait 동안 또는 max_batch_size까지 항목 수집"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # 호출자가 이미 취소한 항목은 제외
+        return [item for item in batch if not item.future.done()]
+
+    async def _run(self):
+        """배치 워커 루프 (배치를 모아 추론 실행기로 넘기고 바로 다음 배치 수집)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            if not batch:
+                continue
+
+            self.stats.record_batch(len(batch), self._queue.qsize())
+            await self._inflight.acquire()
+            task = loop.create_task(self._process_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _process_batch(self, batch: List[_BatchItem]):
+        """배치 하나를 한 번의 forward pass로 처리하고 각 호출자에게 결과 전달 (모델 교체 중이면 모델별로 나누어 처리)"""
+        try:
+            groups: Dict[int, List[_BatchItem]] = {}
+            for item in batch:
+                groups.setdefault(id(item.detector), []).append(item)
+            for items in groups.values():
+                await self._process_group(items)
+        finally:
+            self._inflight.release()
+
+    @staticmethod
+    def _predict_group(batch: List[_BatchItem]):
+        """배치 forward pass + 첫 청크 항목들의 주제 연관성을 한 번의 score_batch로 계산 (추론 실행기에서 실행)"""
+        detector = batch[0].detector
+        probabilities, exit_layers = detector.predict_chunk_proba([item.input_ids for item in batch], True)
+        relevances: List[Optional[float]] = [None] * len(batch)
+        scored = [index for index, item in enumerate(batch) if item.relevance_input is not None]
+        if scored:
+            try:
+                values = detector.relevance_scorer.score_batch(
+                    [batch[index].relevance_input[0] for index in scored],
+                    [batch[index].relevance_input[1:] for index in scored]
+                )
+                for index, value in zip(scored, values):
+                    relevances[index] = value
+            except Exception as e:
+                # 연관성 계산 실패는 결과 집계 단계에서 요청별로 다시 계산
+                logger.warning(f"Batch topic relevance failed (size={len(scored)}): {e}")
+        return probabilities, exit_layers, relevances
+
+    async def _process_group(self, batch: List[_BatchItem]):
+        try:
+            # forward pass는 블로킹 연산이므로 이벤트 루프 밖에서 실행
+            probabilities, exit_layers, relevances = await self.executor.run(self._predict_group, batch)
+        except Exception as e:
+            logger.error(f"Batch forward pass failed (size={len(batch)}): {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for index, item in enumerate(batch):
+            if not item.future.done():
+                # (확률, 종료 레이어, 주제 연관성) 전달 (조기 종료를 사용하지 않으면 종료 레이어는 None)
+                item.future.set_result((
+                    probabilities[index],
+                    None if exit_layers is None else int(exit_layers[index]),
+                    relevances[index]
+                ))
+
+    async def stop(self):
+        """워커 종료"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def get_stats(self) -> Dict:
+        stats = self.stats.to_dict(self._queue.qsize() if self._queue is not None else 0)
+        stats['max_batch_size'] = self.max_batch_size
+        stats['max_wait_ms'] = self.max_wait * 1000
+        return stats
@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+from datasets import Dataset
+from torch import nn
+from transformers import (
+    AutoModelForSequenceClassification, AutoTokenizer, DataCollatorWithPadding, Trainer, TrainingArguments
+)
+
+from app.models.model_artifact import write_artifact
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STUDENT_MODEL = "monologg/koelectra-small-v3-discriminator"
+REPORT_FILE = "distillation_report.json"
+
+
+class DistillationTrainer(Trainer):
+    """교사 소프트 라벨(온도 T)과 정답 라벨을 함께 사용하는 Trainer
+
+    라벨이 없는 샘플(labels = -100)은 교사 분포에 대한 KL 손실만 사용합니다.
+    """
+
+    def __init__(self, *args, temperature: float = 2.0, alpha: float = 0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.temperature = temperature
+        self.alpha = alpha  # 정답 라벨 손실 비중 (나머지는 교사 분포 손실)
+
+    def compute_loss(self, model, inputs, return_outputs=False, **kwargs):
+        teacher_logits = inputs.pop("teacher_logits")
+        labels = inputs.pop("labels")
+        outputs = model(**inputs)
+        logits = outputs.logits
+
+        t = self.temperature
+        distill_loss = nn.functional.kl_div(
+            nn.functional.log_softmax(logits / t, dim=-1),
+            nn.functional.softmax(teacher_logits / t, dim=-1),
+            reduction="batchmean"
+        ) * (t * t)
+
+        labeled = labels != -100
+        if labeled.any():
+            label_loss = nn.functional.cross_entropy(logits[labeled], labels[labeled])
+            loss = self.alpha * label_loss + (1 - self.alpha) * distill_loss
+        else:
+            loss = distill_loss
+        return (loss, outputs) if return_outputs else loss
+
+
+class DistillationService:
+    """파인튜닝된 모델(교사)을 작은 학생 모델로 증류"""
+
+    def __init__(self, teacher_dir: str = "./models/fallacy_detector"):
+        self.teacher_dir = teacher_dir
+
+    def _load_label_mapping(self) -> Dict:
+        with open(f"{self.teacher_dir}/label_mapping.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _teacher_logits(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """교사 모델 로짓 (길이순 정렬 후 배치별 동적 패딩)"""
+        tokenizer = AutoTokenizer.from_pretrained(self.teacher_dir)
+        teacher = AutoModelForSequenceClassification.from_pretrained(self.teacher_dir)
+        teacher.eval()
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        logits = np.zeros((len(texts), teacher.config.num_labels), dtype=np.float32)
+        with torch.no_grad():
+            for start in range(0, len(order), batch_size):
+                indices = order[start:start + batch_size]
+                inputs = tokenizer(
+                    [texts[i] for i in indices],
+                    truncation=True,
+                    padding="longest",
+                    max_length=512,
+                    return_tensors="pt"
+                )
+                logits[indices] = teacher(**inputs).logits.float().numpy()
+        return logits
+
+    def _build_student(self, num_labels: int, student_model: Optional[str], student_layers: Optional[int]):
+        """학생 모델 생성 (교사 레이어 일부를 복사한 축소 모델 또는 사전학습된 작은 모델)"""
+        if student_layers:
+            student = AutoModelForSequenceClassification.from_pretrained(self.teacher_dir)
+            layers = student.base_model.encoder.layer
+            # 교사 레이어를 고르게 선택 (첫 레이어와 마지막 레이어 포함)
+            keep = sorted({int(round(i)) for i in np.linspace(0, len(layers) - 1, student_layers)})
+            student.base_model.encoder.layer = nn.ModuleList([layers[i] for i in keep])
+            student.config.num_hidden_layers = len(keep)
+            logger.info(f"Student initialised from teacher layers {keep}")
+            return student, AutoTokenizer.from_pretrained(self.teacher_dir)
+
+        name = student_model or DEFAULT_STUDENT_MODEL
+        logger.info(f"Student initialised from {name}")
+        student = AutoModelForSequenceClassification.from_pretrained(name, num_labels=num_labels)
+        return student, AutoTokenizer.from_pretrained(name)
+
+    def distill(self, labeled_data: List[Dict], unlabeled_texts: Optional[List[str]] = None,
+                output_dir: str = "./models/fallacy_detector_student", student_model: Optional[str] = None,
+                student_layers: Optional[int] = None, temperature: float = 2.0, alpha: float = 0.5,
+                num_epochs: int = 3, batch_size: int = 16, learning_rate: float = 5e-5) -> str:
+        """교사 소프트 라벨(라벨 데이터 + 라벨 없는 논증)로 학생 모델 학습 후 FallacyDetector가 로드할 수 있는 형태로 저장"""
+        mapping = self._load_label_mapping()
+        label_to_id = mapping["label_to_id"]
+        labeled = [item for item in labeled_data if item.get("label") in label_to_id]
+        unlabeled_texts = unlabeled_texts or []
+        texts = [item["text"] for item in labeled] + list(unlabeled_texts)
+        if not texts:
+            raise ValueError("Distillation data is empty")
+        labels = [label_to_id[item["label"]] for item in labeled] + [-100] * len(unlabeled_texts)
+        logger.info(f"Distilling with {len(labeled)} labeled and {len(unlabeled_texts)} unlabeled samples")
+
+        started = time.time()
+        teacher_logits = self._teacher_logits(texts)
+        logger.info(f"Teacher soft labels computed in {time.time() - started:.1f}s")
+
+        student, tokenizer = self._build_student(len(label_to_id), student_model, student_layers)
+        student.config.id2label = {int(k): v for k, v in mapping["id_to_label"].items()}
+        student.config.label2id = label_to_id
+
+        dataset = Dataset.from_dict({"text": texts, "labels": labels, "teacher_logits": teacher_logits.tolist()})
+        dataset = dataset.map(
+            lambda examples: tokenizer(examples["text"], truncation=True, max_length=512),
+            batched=True,
+            remove_columns=["text"]
+        )
+
+        use_cpu = not torch.cuda.is_available() or torch.backends.mps.is_available()
+        training_args = TrainingArguments(
+            output_dir=output_dir,
+            num_train_epochs=num_epochs,
+            per_device_train_batch_size=min(batch_size, len(texts)),
+            learning_rate=learning_rate,
+            weight_decay=0.01,
+            logging_steps=max(1, len(texts) // (batch_size * 10)),
+            save_steps=1000,
+            eval_strategy="no",
+            report_to="none",
+            save_total_limit=1,
+            remove_unused_columns=False,  # teacher_logits 컬럼 유지
+            use_cpu=use_cpu
+        )
+
+        trainer = DistillationTrainer(
+            model=student,
+            args=training_args,
+            train_dataset=dataset,
+            data_collator=DataCollatorWithPadding(tokenizer),
+            tokenizer=tokenizer,
+            temperature=temperature,
+            alpha=alpha
+        )
+        trainer.train()
+        trainer.save_model()
+
+        # 교사와 같은 라벨 매핑 저장 (FallacyDetector가 일반 모델 경로로 로드)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(f"{output_dir}/label_mapping.json", "w", encoding="utf-8") as f:
+            json.dump(mapping, f, indent=2, ensure_ascii=False)
+        write_artifact(output_dir)
+
+        logger.info(f"Student model saved: {output_dir} ({time.time() - started:.1f}s)")
+        return output_dir
+
+    def evaluate(self, student_dir: str, eval_data: List[Dict], batch_size: int = 16) -> Dict:
+        """교사/학생 정확도, 라벨 일치율, 샘플당 지연 시간, 파라미터 수 비교 리포트 (학생 디렉토리에 저장)"""
+        from app.models.fallacy_detector import FallacyDetector
+
+        texts = [item["text"] for item in eval_data]
+        gold = [item.get("label") for item in eval_data]
+        report = {"samples": len(texts), "teacher_dir": self.teacher_dir, "student_dir": student_dir}
+
+        predictions = {}
+        for role, model_dir in (("teacher", self.teacher_dir), ("student", student_dir)):
+            detector = FallacyDetector(model_path=model_dir)
+            if detector.model is None:
+                raise RuntimeError(f"Could not load {role} model from {model_dir}")
+            detector.predict_proba(texts[:batch_size])  # 워밍업
+
+            labels = []
+            begin = time.perf_counter()
+            for start in range(0, len(texts), batch_size):
+                probabilities = detector.predict_proba(texts[start:start + batch_size])
+                labels.extend(detector.id_to_label.get(int(i), "no_fallacy") for i in np.argmax(probabilities, axis=1))
+            latency_ms = (time.perf_counter() - begin) * 1000 / max(1, len(texts))
+
+            predictions[role] = labels
+            report[role] = {
+                "latency_ms_per_sample": latency_ms,
+                "parameters": sum(p.numel() for p in detector.model.parameters())
+            }
+            if all(label is not None for label in gold):
+                report[role]["accuracy"] = sum(a == b for a, b in zip(labels, gold)) / max(1, len(texts))
+
+        report["agreement"] = sum(
+            a == b for a, b in zip(predictions["teacher"], predictions["student"])
+        ) / max(1, len(texts))
+        report["speedup"] = report["teacher"]["latency_ms_per_sample"] / max(report["student"]["latency_ms_per_sample"], 1e-6)
+        report["parameter_ratio"] = report["student"]["parameters"] / max(1, report["teacher"]["parameters"])
+
+        with open(os.path.join(student_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Distillation report saved: {os.path.join(student_dir, REPORT_FILE)}")
+        return report
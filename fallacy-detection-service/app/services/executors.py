@@ -0,0 +1,100 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusyError(RuntimeError):
+    """대기 작업 수가 한도를 넘어 새 작업을 받을 수 없는 경우"""
+
+
+class BoundedExecutor:
+    """작업자 수와 대기 작업 수가 제한된 스레드 풀 (이벤트 루프에서 블로킹 작업을 분리)"""
+
+    def __init__(self, name: str, max_workers: int = 1, max_pending: int = 0):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending  # 0 이하이면 제한 없음
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _acquire(self):
+        with self._lock:
+            if 0 < self.max_pending <= self._pending:
+                raise ExecutorBusyError(f"{self.name} executor is busy ({self._pending} pending tasks)")
+            self._pending += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """작업을 스레드 풀에서 실행하고 결과를 기다림 (호출자가 취소돼도 슬롯은 작업 종료 시 반환)"""
+        self._acquire()
+        try:
+            future = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending
+        }
+
+
+def configure_torch_threads(intra_op_threads: int = 0, inter_op_threads: int = 0):
+    """torch 스레드 수 설정 (0이면 torch 기본값 유지)"""
+    import torch
+
+    if intra_op_threads > 0:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads > 0:
+        try:
+            # inter-op 스레드 수는 병렬 작업이 시작되기 전에 한 번만 설정 가능
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError as e:
+            logger.warning(f"Could not set torch inter-op threads: {e}")
+    logger.info(f"Torch threads: intra-op={torch.get_num_threads()}, inter-op={torch.get_num_interop_threads()}")
+
+
+# 전역 실행기 (추론용, 재학습용)
+inference_executor: Optional[BoundedExecutor] = None
+training_executor: Optional[BoundedExecutor] = None
+
+
+def initialize_executors(inference_workers: int = 1, inference_max_pending: int = 0,
+                         intra_op_threads: int = 0, inter_op_threads: int = 0, configure_torch: bool = True):
+    """추론/재학습 실행기 초기화"""
+    global inference_executor, training_executor
+
+    if configure_torch:
+        configure_torch_threads(intra_op_threads, inter_op_threads)
+    if inference_executor is None:
+        inference_executor = BoundedExecutor("inference", inference_workers, inference_max_pending)
+    if training_executor is None:
+        # 재학습은 한 번에 하나만 실행하고 추론 스레드와 분리
+        training_executor = BoundedExecutor("training", max_workers=1, max_pending=1)
+
+
+def shutdown_executors():
+    """실행기 종료"""
+    global inference_executor, training_executor
+
+    for executor in (inference_executor, training_executor):
+        if executor is not None:
+            executor.shutdown(wait=False)
+    inference_executor = None
+    training_executor = None
@@ -0,0 +1,34 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없음 (단일 프로세스 서빙만 안전)
+    fcntl = None
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+@contextmanager
+def file_lock(path: str):
+    """잠금 파일 기준 배타 잠금 (prefork 워커 프로세스 간 + 같은 프로세스의 스레드 간)
+
+    같은 디렉토리의 상태 파일을 여러 프로세스가 읽고 고쳐 쓸 때 읽기-수정-쓰기 구간을 감쌉니다.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _thread_lock(path):
+        with open(path, "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,401 @@
+import asyncio
+import gc
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.models.fallacy_detector import ANALYSIS_ERROR_EXPLANATION, FallacyDetector
+from app.models.model_artifact import ArtifactError, verify_artifact
+from app.services.executors import BoundedExecutor
+from app.services.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "registry.json"
+MANIFEST_LOCK_FILE = "registry.lock"
+# 다른 워커가 바꾼 활성 버전을 확인하는 간격 (prefork 서빙에서 모든 워커가 같은 버전을 서빙하도록)
+MANIFEST_POLL_SECONDS = 2.0
+VERSIONS_DIR = "versions"
+BASE_VERSION = "base"
+
+# 워밍업 입력 (짧은 논증, 일반 토론 논증, 청크 분할되는 긴 논증으로 길이 버킷과 청크 경로를 모두 거침)
+DEFAULT_WARMUP_TEXTS = [
+    "모든 사람이 그렇게 생각하니까 이 주장은 옳다.",
+    "토론 주제: 대중교통 무료화\n\n다음은 위 주제에 대한 논증입니다: 대중교통을 무료로 하면 자가용 이용이 줄어 "
+    "교통 체증이 완화됩니다. 하지만 재원 마련 방안이 없다면 다른 공공 서비스 예산이 줄어들 수 있습니다. "
+    "따라서 단계적 도입과 효과 검증이 필요합니다.",
+    "\n\n".join(
+        "이 정책에 반대하는 사람들은 모두 기득권을 지키려는 사람들입니다. 그러므로 그들의 주장은 들을 가치가 없습니다. "
+        "또한 지난 몇 년간의 사례를 보면 비슷한 정책이 실패한 적이 없습니다. 결론적으로 이 정책은 반드시 시행되어야 합니다."
+        for _ in range(8)
+    ),
+]
+
+
+class ModelActivationError(RuntimeError):
+    """후보 모델 로드/워밍업 실패 (서빙 중인 모델은 그대로 유지)"""
+
+
+class ServingModel:
+    """서빙 중이거나 드레인 중인 모델 버전과 이 모델을 사용 중인 요청 수"""
+
+    def __init__(self, version: str, path: Optional[str], detector: FallacyDetector):
+        self.version = version
+        self.path = path
+        self.detector = detector
+        self.activated_at = time.time()
+        self.inflight = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> "ServingModel":
+        with self._lock:
+            self.inflight += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version,
+            "path": self.path,
+            "model_version": self.detector.model_version,
+            "activated_at": self.activated_at,
+            "inflight": self.inflight
+        }
+
+
+class ModelRegistry:
+    """버전별 모델 디렉토리 저장소와 서빙 포인터 (무중단 교체, 워밍업, 드레인, 롤백)
+
+    재학습 결과는 root_dir/versions/<버전> 아래에 저장하고 매니페스트(registry.json)에 활성 버전과
+    활성화 이력을 기록합니다. 후보 모델은 재학습 실행기에서 로드/워밍업한 뒤 이벤트 루프에서 한 번에 교체하고,
+    이전 모델은 사용 중인 요청이 끝날 때까지(또는 drain_timeout까지) 유지한 뒤 해제합니다.
+    매니페스트는 파일 잠금 안에서 다시 읽은 뒤 고쳐 쓰므로 여러 워커가 같은 매니페스트를 덮어쓰지 않고,
+    각 워커는 매니페스트의 활성 버전을 주기적으로 확인하여 다른 워커가 교체/롤백한 버전으로 따라 교체합니다.
+    """
+
+    def __init__(self, root_dir: str, detector_factory: Callable[[Optional[str]], FallacyDetector],
+                 executor: BoundedExecutor, warmup_texts: Optional[List[str]] = None, keep_versions: int = 3,
+                 drain_timeout: float = 30.0):
+        self.root_dir = root_dir
+        self.detector_factory = detector_factory
+        self.executor = executor
+        self.warmup_texts = warmup_texts or DEFAULT_WARMUP_TEXTS
+        self.keep_versions = max(1, keep_versions)
+        self.drain_timeout = drain_timeout
+        self.active: Optional[ServingModel] = None
+        self.draining: List[ServingModel] = []
+        self.last_activation: Optional[Dict] = None
+        self._swap_callbacks: List[Callable[[FallacyDetector], None]] = []
+        self._activation_lock: Optional[asyncio.Lock] = None
+        self._drain_tasks = set()
+        self._follow_task: Optional[asyncio.Task] = None
+        self._follow_failed: Optional[str] = None
+        self._manifest = self._load_manifest()
+
+    # ----- 매니페스트 -----
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root_dir, MANIFEST_FILE)
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"active": None, "history": [], "versions": {}}
+        except Exception as e:
+            logger.warning(f"Could not read model registry manifest, starting empty: {e}")
+            return {"active": None, "history": [], "versions": {}}
+
+    def _save_manifest(self):
+        """매니페스트 저장 (임시 파일에 쓴 뒤 교체, _update_manifest의 잠금 안에서만 호출)"""
+        os.makedirs(self.root_dir, exist_ok=True)
+        path = self._manifest_path()
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _update_manifest(self, mutate: Callable[[Dict], None]):
+        """잠금 안에서 매니페스트를 다시 읽어 수정 후 저장 (다른 워커의 기록을 오래된 메모리 사본으로 덮어쓰지 않음)"""
+        with file_lock(os.path.join(self.root_dir, MANIFEST_LOCK_FILE)):
+            self._manifest = self._load_manifest()
+            mutate(self._manifest)
+            self._save_manifest()
+
+    def _refresh_manifest(self) -> Dict:
+        """다른 워커가 기록한 내용 반영 (파일은 교체 방식으로 쓰므로 잠금 없이 읽음)"""
+        self._manifest = self._load_manifest()
+        return self._manifest
+
+    def new_version(self) -> Dict:
+        """재학습 결과를 저장할 새 버전 ID와 디렉토리"""
+        self._refresh_manifest()
+        version_id = time.strftime("v%Y%m%d-%H%M%S")
+        suffix = 1
+        while version_id in self._manifest["versions"] or os.path.exists(os.path.join(self.root_dir, VERSIONS_DIR, version_id)):
+            suffix += 1
+            version_id = f"{time.strftime('v%Y%m%d-%H%M%S')}-{suffix}"
+        return {"version": version_id, "path": os.path.join(self.root_dir, VERSIONS_DIR, version_id)}
+
+    def register(self, version_id: str, path: Optional[str], managed: bool = True, **metadata) -> str:
+        """모델 디렉토리를 버전으로 등록 (managed이면 오래된 버전 정리 시 디렉토리 삭제 대상)"""
+        entry = {
+            "path": path,
+            "managed": managed,
+            "status": "registered",
+            "created_at": time.time(),
+            **metadata
+        }
+        self._update_manifest(lambda manifest: manifest["versions"].__setitem__(version_id, entry))
+        return version_id
+
+    def get_version(self, version_id: str) -> Optional[Dict]:
+        return self._refresh_manifest()["versions"].get(version_id)
+
+    # ----- 로드/워밍업 -----
+
+    def _warm_up(self, detector: FallacyDetector) -> float:
+        """대표 입력으로 워밍업 (첫 요청의 지연 시간 제거, 추론 오류가 나면 실패)"""
+        started = time.time()
+        results = detector.predict_batch(self.warmup_texts)
+        if any(result.explanation == ANALYSIS_ERROR_EXPLANATION for result in results):
+            raise ModelActivationError("Warm-up inference failed")
+        return time.time() - started
+
+    def _load_and_warm_up(self, path: Optional[str]) -> Dict:
+        """후보 모델 해시 검증, 로드 후 워밍업 (블로킹, 재학습 실행기에서 실행)"""
+        started = time.time()
+        if path:
+            try:
+                verify_artifact(path, check_hashes=True)
+            except ArtifactError as e:
+                raise ModelActivationError(str(e)) from e
+        detector = self.detector_factory(path)
+        if detector.model is None:
+            raise ModelActivationError(f"Model could not be loaded from {path}")
+        load_seconds = time.time() - started
+        return {
+            "detector": detector,
+            "load_seconds": load_seconds,
+            "warmup_seconds": self._warm_up(detector)
+        }
+
+    def load_initial(self, fallback_path: Optional[str]) -> FallacyDetector:
+        """시작 시 활성 버전 로드 (매니페스트에 활성 버전이 없으면 fallback_path를 기본 버전으로 등록)"""
+        version_id = self._manifest.get("active")
+        entry = self._manifest["versions"].get(version_id) if version_id else None
+        if entry is None or (entry["path"] and not os.path.isdir(entry["path"])):
+            if version_id:
+                logger.warning(f"Active model version {version_id} is missing, using {fallback_path}")
+            version_id = BASE_VERSION
+            if BASE_VERSION not in self._manifest["versions"] or self._manifest["versions"][BASE_VERSION]["path"] != fallback_path:
+                self.register(BASE_VERSION, fallback_path, managed=False)
+            entry = self._manifest["versions"][BASE_VERSION]
+
+        started = time.time()
+        detector = self.detector_factory(entry["path"])
+        load_seconds = time.time() - started
+        warmup_seconds = None
+        if detector.model is not None:
+            try:
+                warmup_seconds = self._warm_up(detector)
+                logger.info(f"Model version {version_id} loaded in {load_seconds:.1f}s, warm-up {warmup_seconds:.1f}s")
+            except ModelActivationError as e:
+                logger.warning(f"Model version {version_id}: {e}")
+        # 모델을 로드하지 못해도 폴백 모드로 서빙하던 기존 동작 유지
+
+        self.active = ServingModel(version_id, entry["path"], detector)
+        self._mark_active(version_id, record_history=True)
+        # 워밍업에 실패하면 warmup_seconds는 None (시작 보고서/준비 상태에서 사용)
+        self.last_activation = {
+            "version": version_id,
+            "previous_version": None,
+            "rollback": False,
+            "load_seconds": load_seconds,
+            "warmup_seconds": warmup_seconds,
+            "total_seconds": time.time() - started,
+            "activated_at": self.active.activated_at
+        }
+        return detector
+
+    # ----- 서빙 포인터 -----
+
+    def add_swap_callback(self, callback: Callable[[FallacyDetector], None]):
+        """서빙 모델이 바뀔 때 호출 (스케줄러, 토픽 저장소 등의 탐지기 참조 교체)"""
+        self._swap_callbacks.append(callback)
+
+    def acquire(self) -> Optional[ServingModel]:
+        """현재 서빙 모델 사용 시작 (요청이 끝나면 release 호출, 교체 후에도 이 요청은 같은 모델로 완료)"""
+        active = self.active
+        return active.acquire() if active is not None else None
+
+    def _mark_active(self, version_id: str, record_history: bool = True, rollback: bool = False):
+        def mark(manifest: Dict):
+            versions = manifest["versions"]
+            previous = manifest.get("active")
+            if previous in versions and previous != version_id:
+                versions[previous]["status"] = "retired"
+            versions[version_id]["status"] = "active"
+            versions[version_id].pop("error", None)
+            versions[version_id]["activated_at"] = time.time()
+            manifest["active"] = version_id
+            history = manifest["history"]
+            if rollback and history[-2:-1] == [version_id]:
+                history.pop()
+            elif record_history and history[-1:] != [version_id]:
+                history.append(version_id)
+            self._prune()
+
+        self._update_manifest(mark)
+
+    async def activate(self, version_id: str, rollback: bool = False, follow: bool = False) -> Dict:
+        """후보 버전 로드/워밍업 후 서빙 포인터 교체, 이전 모델은 백그라운드에서 드레인
+
+        follow는 다른 워커가 이미 매니페스트에 기록한 활성 버전을 이 워커에 반영하는 교체입니다 (매니페스트는 수정하지 않음).
+        """
+        if self._activation_lock is None:
+            self._activation_lock = asyncio.Lock()
+        async with self._activation_lock:
+            entry = self._refresh_manifest()["versions"].get(version_id)
+            if entry is None:
+                raise KeyError(version_id)
+            if self.active is not None and self.active.version == version_id:
+                return self.active.to_dict()
+
+            started = time.time()
+            try:
+                loaded = await self.executor.run(self._load_and_warm_up, entry["path"])
+            except Exception as e:
+                if not follow:
+                    def mark_failed(manifest: Dict):
+                        if version_id in manifest["versions"]:
+                            manifest["versions"][version_id].update(status="failed", error=str(e))
+                    self._update_manifest(mark_failed)
+                logger.error(f"Activation of model version {version_id} failed, keeping {self.active.version if self.active else None}: {e}")
+                raise ModelActivationError(str(e)) from e
+
+            # 이벤트 루프 안에서 await 없이 한 번에 교체 (이후 요청부터 새 모델 사용)
+            previous = self.active
+            self.active = ServingModel(version_id, entry["path"], loaded["detector"])
+            for callback in self._swap_callbacks:
+                callback(self.active.detector)
+            if not follow:
+                self._mark_active(version_id, rollback=rollback)
+
+            if previous is not None:
+                self.draining.append(previous)
+                task = asyncio.get_running_loop().create_task(self._drain(previous))
+                self._drain_tasks.add(task)
+                task.add_done_callback(self._drain_tasks.discard)
+
+            self.last_activation = {
+                "version": version_id,
+                "previous_version": previous.version if previous is not None else None,
+                "rollback": rollback,
+                "load_seconds": loaded["load_seconds"],
+                "warmup_seconds": loaded["warmup_seconds"],
+                "total_seconds": time.time() - started,
+                "activated_at": self.active.activated_at
+            }
+            logger.info(f"Model version {version_id} is now serving: {self.last_activation}")
+            return self.active.to_dict()
+
+    async def rollback(self) -> Dict:
+        """직전 활성 버전으로 되돌림 (디렉토리가 남아 있는 버전만)"""
+        history = self._refresh_manifest()["history"]
+        if len(history) < 2:
+            raise ModelActivationError("No previous model version to roll back to")
+        target = history[-2]
+        entry = self._manifest["versions"].get(target)
+        if entry is None or (entry["path"] and not os.path.isdir(entry["path"])):
+            raise ModelActivationError(f"Previous model version {target} is no longer available")
+        return await self.activate(target, rollback=True)
+
+    def start_following(self):
+        """다른 워커가 바꾼 활성 버전을 따라가는 작업 시작 (이벤트 루프 안에서 호출, prefork 워커마다 하나)"""
+        if self._follow_task is None or self._follow_task.done():
+            self._follow_task = asyncio.get_running_loop().create_task(self._follow_active())
+
+    def stop_following(self):
+        if self._follow_task is not None:
+            self._follow_task.cancel()
+            self._follow_task = None
+
+    async def _follow_active(self):
+        """매니페스트의 활성 버전이 이 워커의 서빙 버전과 다르면 그 버전으로 교체
+
+        재시작된 워커는 부모 프로세스가 시작 시 로드한 모델을 물려받으므로, 이 확인으로 현재 활성 버전으로 바뀝니다.
+        """
+        while True:
+            await asyncio.sleep(MANIFEST_POLL_SECONDS)
+            version_id = None
+            try:
+                manifest = await asyncio.to_thread(self._load_manifest)
+                version_id = manifest.get("active")
+                current = self.active.version if self.active is not None else None
+                if not version_id or version_id == current or version_id == self._follow_failed:
+                    continue
+                if self._activation_lock is not None and self._activation_lock.locked():
+                    continue  # 이 워커에서 교체 중 (끝난 뒤 다시 확인)
+                logger.info(f"Model version {version_id} was activated by another worker, switching from {current}")
+                await self.activate(version_id, follow=True)
+                self._follow_failed = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 같은 버전으로 계속 재시도하지 않고 매니페스트의 활성 버전이 다시 바뀔 때까지 현재 모델로 서빙
+                self._follow_failed = version_id
+                logger.error(f"Could not switch to model version {version_id} activated by another worker: {e}")
+
+    async def _drain(self, serving: ServingModel):
+        """이전 모델을 사용 중인 요청이 끝날 때까지 대기한 뒤 해제"""
+        started = time.time()
+        while serving.inflight > 0 and time.time() - started < self.drain_timeout:
+            await asyncio.sleep(0.05)
+        if serving.inflight > 0:
+            logger.warning(f"Model version {serving.version} drained with {serving.inflight} requests still running")
+        else:
+            logger.info(f"Model version {serving.version} drained in {time.time() - started:.2f}s")
+        self.draining.remove(serving)
+        serving.detector = None
+        gc.collect()
+
+    def _prune(self):
+        """활성화 이력의 최근 keep_versions개와 아직 활성화하지 않은 후보를 제외한 관리 버전 디렉토리 삭제
+
+        남는 어댑터 버전이 참조하는 기본 모델 버전도 함께 보관합니다.
+        """
+        versions = self._manifest["versions"]
+        keep = set(self._manifest["history"][-self.keep_versions:])
+        keep.add(self._manifest.get("active"))
+        keep.update(version_id for version_id, entry in versions.items() if entry["status"] in ("registered", "active"))
+        keep.update([versions[version_id].get("base_version") for version_id in keep if version_id in versions])
+        for version_id, entry in list(versions.items()):
+            if version_id in keep or not entry.get("managed"):
+                continue
+            if entry["path"] and os.path.isdir(entry["path"]):
+                shutil.rmtree(entry["path"], ignore_errors=True)
+            del self._manifest["versions"][version_id]
+            logger.info(f"Removed old model version {version_id}")
+
+    def list_versions(self) -> Dict:
+        self._refresh_manifest()
+        return {
+            "active": self._manifest.get("active"),
+            "history": list(self._manifest["history"]),
+            "versions": self._manifest["versions"]
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            "active": self.active.to_dict() if self.active is not None else None,
+            "draining": [serving.to_dict() for serving in self.draining if serving.detector is not None],
+            "last_activation": self.last_activation
+        }
@@ -0,0 +1,249 @@
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+# (입력 행 번호, 논증 ID, 텍스트, 토픽 제목, 토픽 설명)
+ArgumentRow = Tuple[int, Optional[str], str, Optional[str], Optional[str]]
+
+# 워커 프로세스별 탐지기 (워커 초기화 시 한 번 로드)
+_worker_detector = None
+
+
+def iter_arguments(path: str, text_field: str = "text", id_field: str = "id",
+                   title_field: str = "topic_title", description_field: str = "topic_description",
+                   skip: int = 0) -> Iterator[ArgumentRow]:
+    """JSONL/CSV 내보내기 파일에서 논증을 한 행씩 읽음 (파일 전체를 메모리에 올리지 않음, 앞의 skip행은 건너뜀)"""
+    is_csv = path.lower().endswith(".csv")
+    with open(path, "r", encoding="utf-8", newline="" if is_csv else None) as f:
+        if is_csv:
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for index, row in enumerate(rows):
+            if index < skip:
+                continue
+            text = row.get(text_field) or ""
+            row_id = row.get(id_field)
+            yield (
+                index,
+                str(row_id) if row_id is not None else None,
+                text,
+                row.get(title_field) or None,
+                row.get(description_field) or None
+            )
+
+
+def _init_worker(model_path: str, detector_options: Dict, threads: int):
+    """워커 프로세스 초기화: 추론 스레드 예산 설정 후 탐지기 로드"""
+    global _worker_detector
+    from app.models.fallacy_detector import FallacyDetector
+
+    if detector_options.get("backend") == "onnx":
+        detector_options = {**detector_options, "intra_op_threads": threads}
+    else:
+        import torch
+        torch.set_num_threads(threads)
+    _worker_detector = FallacyDetector(model_path=model_path, **detector_options)
+    logger.info(f"Rescoring worker (pid={os.getpid()}) ready: model_version={_worker_detector.model_version}")
+
+
+def _score_block(rows: List[ArgumentRow]) -> List[Dict]:
+    """블록 하나를 길이 버킷별 배치 추론으로 점수화 (워커 프로세스에서 실행)
+
+    배치 추론이 실패하면 행마다 다시 추론하여 실패한 행만 가려내고, 그 행은 점수 없이 error를 기록합니다.
+    """
+    from app.models.fallacy_detector import ANALYSIS_ERROR_EXPLANATION
+
+    detector = _worker_detector
+    texts = [text for _, _, text, _, _ in rows]
+    topics = [(title, description) for _, _, _, title, description in rows]
+    # 토픽 컨텍스트는 접두어로 따로 인코딩 (주제 연관성은 논증만으로 계산, 같은 토픽은 블록 안에서 한 번만 토크나이징)
+    encoded = {}
+    prefixes = []
+    for topic in topics:
+        if topic not in encoded:
+            encoded[topic] = detector.context_prefix(*topic)
+        prefixes.append(encoded[topic])
+    results = detector.predict_batch(texts, topics, prefixes)
+    if any(result.explanation == ANALYSIS_ERROR_EXPLANATION for result in results):
+        logger.warning(f"Batch of {len(rows)} rows starting at row {rows[0][0]} failed, retrying row by row")
+        results = [
+            detector.predict_batch([text], [topic], [prefix])[0]
+            for text, topic, prefix in zip(texts, topics, prefixes)
+        ]
+
+    records = []
+    for (index, row_id, _, _, _), result in zip(rows, results):
+        if result.explanation == ANALYSIS_ERROR_EXPLANATION:
+            # 실패한 행은 점수 필드를 비워 "오류 없음, 신뢰도 0"으로 읽히지 않도록 함
+            records.append({
+                "row": index,
+                "id": row_id,
+                "error": result.explanation,
+                "model_version": detector.model_version
+            })
+            continue
+        records.append({
+            "row": index,
+            "id": row_id,
+            "has_fallacy": result.has_fallacy,
+            "fallacy_type": result.fallacy_type,
+            "confidence": result.confidence,
+            "topic_relevance": result.topic_relevance,
+            "exit_layer": result.exit_layer,
+            "model_version": detector.model_version
+        })
+    return records
+
+
+class RescoringService:
+    """논증 아카이브 일괄 재점수화 (워커 프로세스 분산, 입력 순서대로 증분 저장, 체크포인트로 재개)
+
+    입력은 블록 단위로 워커에 넘기고, 동시에 처리 중인 블록 수를 제한하여 행 수와 관계없이 메모리 사용량이 일정합니다.
+    결과는 입력 순서대로 기록하므로 체크포인트는 "앞에서부터 완료된 행 수 + 출력 파일 크기"만 저장합니다.
+    """
+
+    def __init__(self, model_path: str, detector_options: Optional[Dict] = None, workers: int = 2,
+                 threads_per_worker: int = 0, block_size: int = 256, max_inflight_blocks: int = 0,
+                 progress_interval: float = 10.0):
+        self.model_path = model_path
+        self.detector_options = detector_options or {}
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.block_size = max(1, block_size)
+        # 워커당 2블록이면 워커가 블록을 끝내자마자 다음 블록을 받을 수 있음
+        self.max_inflight_blocks = max_inflight_blocks or self.workers * 2
+        self.progress_interval = progress_interval
+
+    @staticmethod
+    def checkpoint_path(output_path: str) -> str:
+        return output_path + CHECKPOINT_SUFFIX
+
+    def _load_checkpoint(self, input_path: str, output_path: str) -> Dict:
+        """재개 위치 (체크포인트 이후에 기록된 불완전한 출력은 잘라냄)"""
+        path = self.checkpoint_path(output_path)
+        if not os.path.exists(path):
+            # 체크포인트 없이 남은 출력은 이어 쓸 수 없으므로 처음부터 다시 기록
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return {"rows_done": 0, "rows_failed": 0, "output_bytes": 0}
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("input") != os.path.abspath(input_path):
+            raise ValueError(f"Checkpoint {path} belongs to another input: {checkpoint.get('input')}")
+        if os.path.exists(output_path) and os.path.getsize(output_path) > checkpoint["output_bytes"]:
+            with open(output_path, "r+b") as f:
+                f.truncate(checkpoint["output_bytes"])
+        logger.info(f"Resuming from checkpoint: {checkpoint['rows_done']} rows already scored")
+        return checkpoint
+
+    def _save_checkpoint(self, input_path: str, output_path: str, rows_done: int, rows_failed: int, output_bytes: int):
+        """체크포인트 저장 (임시 파일에 쓴 뒤 교체하여 중간에 죽어도 이전 체크포인트 유지)"""
+        path = self.checkpoint_path(output_path)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "input": os.path.abspath(input_path),
+                "rows_done": rows_done,
+                "rows_failed": rows_failed,
+                "output_bytes": output_bytes,
+                "updated_at": time.time()
+            }, f)
+        os.replace(path + ".tmp", path)
+
+    def _blocks(self, rows: Iterator[ArgumentRow]) -> Iterator[List[ArgumentRow]]:
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) >= self.block_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def rescore(self, input_path: str, output_path: str, resume: bool = True, **field_names) -> Dict:
+        """입력 파일 전체를 재점수화하여 JSONL로 저장 (resume이면 체크포인트 이후부터)"""
+        if not resume:
+            for path in (output_path, self.checkpoint_path(output_path)):
+                if os.path.exists(path):
+                    os.remove(path)
+        checkpoint = self._load_checkpoint(input_path, output_path)
+        rows_done = checkpoint["rows_done"]
+        rows_failed = checkpoint.get("rows_failed", 0)
+        started_rows = rows_done
+        started_failed = rows_failed
+        blocks = self._blocks(iter_arguments(input_path, skip=rows_done, **field_names))
+
+        started = time.time()
+        last_report = started
+        # spawn: 부모의 torch/토크나이저 스레드 상태를 물려받지 않도록 새 인터프리터에서 워커 시작
+        context = multiprocessing.get_context("spawn")
+        with open(output_path, "ab") as out, ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.model_path, self.detector_options, self.threads_per_worker)
+        ) as pool:
+            inflight = {}  # future -> 블록 순번
+            finished: Dict[int, List[Dict]] = {}  # 순서를 기다리는 완료 블록
+            submitted = 0
+            next_to_write = 0
+            exhausted = False
+
+            while True:
+                while not exhausted and len(inflight) + len(finished) < self.max_inflight_blocks:
+                    block = next(blocks, None)
+                    if block is None:
+                        exhausted = True
+                        break
+                    inflight[pool.submit(_score_block, block)] = submitted
+                    submitted += 1
+                if not inflight:
+                    break
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[inflight.pop(future)] = future.result()
+
+                # 앞 블록부터 순서대로 기록
+                wrote = False
+                while next_to_write in finished:
+                    records = finished.pop(next_to_write)
+                    out.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8"))
+                    rows_done = records[-1]["row"] + 1
+                    rows_failed += sum(1 for record in records if "error" in record)
+                    next_to_write += 1
+                    wrote = True
+                if wrote:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    self._save_checkpoint(input_path, output_path, rows_done, rows_failed, out.tell())
+
+                now = time.time()
+                if now - last_report >= self.progress_interval:
+                    rate = (rows_done - started_rows) / max(now - started, 1e-6)
+                    logger.info(
+                        f"Rescored {rows_done} rows ({rate:.1f} rows/s, {rows_failed} failed, {len(inflight)} blocks in flight)"
+                    )
+                    last_report = now
+
+        elapsed = time.time() - started
+        summary = {
+            "rows_scored": rows_done - started_rows,
+            "rows_total": rows_done,
+            "rows_failed": rows_failed - started_failed,
+            "rows_failed_total": rows_failed,
+            "elapsed_seconds": elapsed,
+            "rows_per_second": (rows_done - started_rows) / max(elapsed, 1e-6),
+            "output": output_path
+        }
+        logger.info(f"Rescoring finished: {summary}")
+        return summary
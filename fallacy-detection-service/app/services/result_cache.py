@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """캐시 키용 정규화 (유니코드 NFC, 공백 축약, 앞뒤 공백 제거)"""
+    if not text:
+        return ""
+    return WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class ResultCache:
+    """탐지 결과 캐시 (프로세스 내 LRU + 선택적 Redis 공유 계층)
+
+    키는 (모델 버전, 정규화된 텍스트, 토픽 제목, 토픽 설명, 언어)의 해시이므로
+    모델이 바뀌면 이전 결과는 자동으로 조회되지 않습니다.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 2**20, ttl_seconds: float = 3600,
+                 redis_url: Optional[str] = None, namespace: str = "fallacy:result"):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes  # 0 이하이면 크기 제한 없음
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # key -> (만료 시각, JSON)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evicted": 0,
+            "shared_errors": 0
+        }
+        self.shared = self._connect_shared(redis_url) if redis_url else None
+
+    def _connect_shared(self, redis_url: str):
+        """Redis 공유 계층 연결 (redis 패키지가 없거나 연결 실패 시 로컬 캐시만 사용)"""
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.5)
+            client.ping()
+            logger.info(f"Result cache shared tier connected: {redis_url}")
+            return client
+        except Exception as e:
+            logger.warning(f"Result cache shared tier unavailable, using local cache only: {e}")
+            return None
+
+    @staticmethod
+    def make_key(model_version: str, text: str, topic_title: Optional[str] = None,
+                 topic_description: Optional[str] = None, language: str = "ko") -> str:
+        """탐지 요청의 내용 기반 캐시 키"""
+        payload = json.dumps([
+            model_version or "",
+            normalize_text(text),
+            normalize_text(topic_title),
+            normalize_text(topic_description),
+            (language or "").lower()
+        ], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get_local(self, key: str) -> Optional[Dict]:
+        """프로세스 내 LRU 조회 (만료된 항목은 제거)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self._stats["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["local_hits"] += 1
+        return json.loads(payload)
+
+    def _put_payload(self, key: str, payload: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._bytes += len(payload)
+            # 항목 수/바이트 한도를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+            while self._entries and (
+                len(self._entries) > self.max_entries or 0 < self.max_bytes < self._bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evicted"] += 1
+
+    def _remove(self, key: str):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def _get_shared(self, key: str) -> Optional[str]:
+        try:
+            payload = self.shared.get(self._shared_key(key))
+            return payload.decode("utf-8") if payload is not None else None
+        except Exception as e:
+            self._stats["shared_errors"] += 1
+            logger.warning(f"Result cache shared lookup failed: {e}")
+            return None
+
+    def _set_shared(self, key: str, payload: str):
+        try:
+            self.shared.set(self._shared_key(key), payload, ex=max(1, int(self.ttl_seconds)))
+        except Exception as e:
+            self._stats["shared_errors"] += 1
+            logger.warning(f"Result cache shared store failed: {e}")
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """로컬 → 공유 계층 순서로 조회 (공유 계층 히트는 로컬에도 저장)"""
+        value = self.get_local(key)
+        if value is not None:
+            return value
+        if self.shared is not None:
+            # 네트워크 I/O는 이벤트 루프 밖에서 실행
+            payload = await asyncio.to_thread(self._get_shared, key)
+            if payload is not None:
+                self._put_payload(key, payload)
+                self._stats["shared_hits"] += 1
+                return json.loads(payload)
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Dict):
+        """로컬과 공유 계층에 저장"""
+        payload = json.dumps(value, ensure_ascii=False)
+        self._put_payload(key, payload)
+        self._stats["stores"] += 1
+        if self.shared is not None:
+            await asyncio.to_thread(self._set_shared, key, payload)
+
+    def clear(self):
+        """로컬 캐시 비우기 (공유 계층 항목은 모델 버전이 키에 포함되어 TTL로 만료)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict:
+        lookups = self._stats["local_hits"] + self._stats["shared_hits"] + self._stats["misses"]
+        hits = self._stats["local_hits"] + self._stats["shared_hits"]
+        return {
+            **self._stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "shared_tier": self.shared is not None
+        }
@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 시작 상태 (starting → loading → ready / degraded)
+STARTING = "starting"
+LOADING = "loading"
+READY = "ready"
+DEGRADED = "degraded"  # 모델 로드/워밍업 실패 (폴백 모드로 서빙)
+
+
+class StartupReport:
+    """서비스 시작 단계별 소요 시간(import, 가중치 로드, 워밍업 등)과 준비 상태"""
+
+    def __init__(self):
+        self.state = STARTING
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.phases: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """블록 실행 시간을 단계 이름으로 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: Optional[float]):
+        if seconds is None:
+            return
+        with self._lock:
+            self.phases[name] = seconds
+
+    def begin_loading(self) -> bool:
+        """로드 시작 (이미 시작했거나 끝났으면 False)"""
+        with self._lock:
+            if self.state != STARTING:
+                return False
+            self.state = LOADING
+            return True
+
+    def finish(self, warmed_up: bool, error: Optional[str] = None):
+        """로드 완료 (워밍업 추론까지 성공해야 ready)"""
+        with self._lock:
+            self.state = READY if warmed_up else DEGRADED
+            self.error = error
+            self.ready_at = time.time()
+        logger.info(f"Startup finished: {self.state} in {self.ready_at - self.started_at:.2f}s {dict(self.phases)}")
+
+    @property
+    def loading(self) -> bool:
+        return self.state in (STARTING, LOADING)
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state,
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "seconds_to_ready": round(self.ready_at - self.started_at, 3) if self.ready_at else None,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "error": self.error
+        }
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from datasets import Dataset, concatenate_datasets, load_from_disk
+
+logger = logging.getLogger(__name__)
+
+SHARD_PREFIX = "shard-"
+HASH_COLUMN = "sample_hash"
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """토크나이저 내용 해시 (어휘/정규화/특수 토큰이 같으면 같은 값)"""
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        # truncation/padding 설정은 호출마다 바뀌는 내부 상태이므로 해시에서 제외
+        backend.no_truncation()
+        backend.no_padding()
+        payload = backend.to_str()
+    else:
+        payload = json.dumps(sorted(tokenizer.get_vocab().items()), ensure_ascii=False)
+    payload += json.dumps([type(tokenizer).__name__, tokenizer.all_special_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def sample_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TokenizedDatasetCache:
+    """토크나이징 결과를 Arrow 파일로 보관하여 재학습마다 바뀐 샘플만 토크나이징
+
+    (토크나이저 해시, max_length)별 디렉토리 아래에 재학습마다 새로 토크나이징한 샘플을 샤드로 추가하고,
+    기존 샤드는 memory-map으로 읽습니다. 이번 학습 데이터에 없는 샘플은 샤드를 합칠 때 제거하므로 캐시는
+    마지막 학습 데이터 크기를 넘어 계속 커지지 않습니다. 토큰 ID는 패딩 없이(truncation만) 저장하고 패딩은 collator가 담당하므로
+    패딩 전략이 바뀌어도 캐시를 그대로 사용할 수 있습니다. 라벨은 재학습마다 매핑이 달라질 수 있어 저장하지 않습니다.
+    """
+
+    def __init__(self, root_dir: Optional[str], tokenizer, max_length: int = 512, max_shards: int = 16):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.max_shards = max(1, max_shards)
+        self.cache_dir = (
+            os.path.join(root_dir, f"{tokenizer_fingerprint(tokenizer)}-{max_length}") if root_dir else None
+        )
+        self.stats: Dict = {}
+
+    def _shard_paths(self) -> List[str]:
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return []
+        return sorted(
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+            if name.startswith(SHARD_PREFIX) and not name.endswith(".tmp")
+        )
+
+    def _tokenize(self, hashes: List[str], texts: List[str]) -> Dataset:
+        def tokenize_function(examples):
+            return self.tokenizer(
+                examples["text"],
+                truncation=True,
+                max_length=self.max_length,
+                return_attention_mask=False,
+                return_token_type_ids=False
+            )
+
+        dataset = Dataset.from_dict({HASH_COLUMN: hashes, "text": texts})
+        return dataset.map(tokenize_function, batched=True, remove_columns=["text"])
+
+    def _save_shard(self, dataset: Dataset) -> Dataset:
+        """샤드 저장 후 memory-map으로 다시 열기 (임시 디렉토리에 쓴 뒤 이름 변경)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 같은 초에 합친 샤드와 새 샤드를 저장해도 이름이 겹치지 않도록 임의 접미사 추가
+        path = os.path.join(
+            self.cache_dir,
+            f"{SHARD_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{len(dataset)}-{uuid.uuid4().hex[:8]}"
+        )
+        dataset.save_to_disk(path + ".tmp")
+        os.replace(path + ".tmp", path)
+        return load_from_disk(path)
+
+    def _compact(self, shards: List[Dataset], paths: List[str], keep: Set[str]) -> List[Dataset]:
+        """샤드를 하나로 합치면서 keep에 없는 샘플과 중복 샘플 제거 (샤드 수와 캐시 크기 제한)"""
+        combined = concatenate_datasets(shards) if len(shards) > 1 else shards[0]
+        rows, seen = [], set()
+        for row, hash_value in enumerate(combined[HASH_COLUMN]):
+            if hash_value in keep and hash_value not in seen:
+                seen.add(hash_value)
+                rows.append(row)
+        merged = self._save_shard(combined.select(rows))
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+        logger.info(f"Compacted {len(paths)} tokenized shards ({len(merged)} samples kept, {len(combined) - len(rows)} removed)")
+        return [merged]
+
+    def build(self, texts: List[str]) -> Dataset:
+        """texts 순서대로 input_ids 컬럼을 가진 데이터셋 (캐시에 없는 샘플만 토크나이징)"""
+        started = time.time()
+        hashes = [sample_hash(text) for text in texts]
+
+        paths = self._shard_paths()
+        shards = []
+        for path in paths:
+            try:
+                shards.append(load_from_disk(path))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable tokenized shard {path}: {e}")
+        known = set()
+        for shard in shards:
+            known.update(shard[HASH_COLUMN])
+        needed = set(hashes)
+        stale = len(known - needed)
+
+        missing: Dict[str, str] = {}
+        for hash_value, text in zip(hashes, texts):
+            if hash_value not in known:
+                missing.setdefault(hash_value, text)
+        if missing:
+            tokenized = self._tokenize(list(missing.keys()), list(missing.values()))
+            shards.append(self._save_shard(tokenized) if self.cache_dir is not None else tokenized)
+            if self.cache_dir is not None:
+                paths = self._shard_paths()
+        if self.cache_dir is not None and (stale or len(shards) > self.max_shards):
+            # 이번 학습 데이터에 없는 샘플은 제거 (삭제/수정된 학습 데이터가 캐시에 계속 쌓이지 않도록)
+            shards = self._compact(shards, paths, needed)
+
+        combined = concatenate_datasets(shards) if len(shards) > 1 else shards[0]
+        row_of: Dict[str, int] = {}
+        for row, hash_value in enumerate(combined[HASH_COLUMN]):
+            row_of.setdefault(hash_value, row)
+        dataset = combined.select([row_of[hash_value] for hash_value in hashes]).remove_columns([HASH_COLUMN])
+
+        unique = len(set(hashes))
+        self.stats = {
+            "samples": len(texts),
+            "cached": unique - len(missing),
+            "tokenized": len(missing),
+            "pruned": stale if self.cache_dir is not None else 0,
+            "seconds": time.time() - started,
+            "cache_dir": self.cache_dir
+        }
+        logger.info(f"Tokenized dataset ready: {self.stats}")
+        return dataset
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+
+from app.models.fallacy_detector import FallacyDetector, TopicPrefix, build_context_prefix
+from app.services.executors import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+TOPICS_DIR = "topics"
+
+
+@dataclass
+class TopicArtifacts:
+    """등록된 토픽의 미리 계산된 산출물 (컨텍스트 접두어 토큰, 키워드 bigram, 연관성 임베딩)"""
+    topic_id: str
+    title: Optional[str]
+    description: Optional[str]
+    prefix: TopicPrefix
+    keywords: FrozenSet[str]
+    has_embedding: bool
+    model_version: Optional[str]
+    registered_at: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "topic_id": self.topic_id,
+            "title": self.title,
+            "description": self.description,
+            "prefix_token_count": len(self.prefix.input_ids),
+            "keyword_count": len(self.keywords),
+            "has_embedding": self.has_embedding,
+            "registered_at": self.registered_at
+        }
+
+
+class FileTopicStore:
+    """Redis가 없을 때 쓰는 파일 기반 공유 계층 (같은 호스트의 prefork 워커 간 토픽 정의 공유)
+
+    Redis 클라이언트의 get/set/delete만 흉내 내며, 키마다 파일 하나를 임시 파일에 쓴 뒤 교체하므로 잠금 없이 읽습니다.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: str):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> int:
+        try:
+            os.remove(self._path(key))
+            return 1
+        except FileNotFoundError:
+            return 0
+
+
+class TopicRegistry:
+    """토픽 ID별 산출물 저장소 (프로세스 내 LRU + Redis 또는 FileTopicStore 공유 계층)
+
+    공유 계층에는 토픽 정의(제목, 설명)만 저장하고, 각 워커는 처음 조회할 때 산출물을 만들어 둡니다.
+    공유 계층이 있으면 조회마다 정의를 확인하므로 다른 워커의 수정/삭제도 바로 반영됩니다.
+    """
+
+    def __init__(self, detector: FallacyDetector, executor: BoundedExecutor, max_topics: int = 10000,
+                 shared=None, namespace: str = "fallacy:topic"):
+        self.detector = detector
+        self.executor = executor
+        self.max_topics = max(1, max_topics)
+        self.shared = shared
+        self.namespace = namespace
+        self._topics: "OrderedDict[str, TopicArtifacts]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build(self, topic_id: str, title: Optional[str], description: Optional[str]) -> TopicArtifacts:
+        """접두어 토크나이징, 키워드 bigram, 토픽 임베딩 계산 (블로킹, 추론 실행기에서 실행)"""
+        detector = self.detector
+        scorer = detector.relevance_scorer
+        key = scorer.topic_key(title, description)
+        has_embedding = False
+        if key is not None and scorer.model is not None:
+            scorer.topic_embedding(key)  # scorer의 토픽 캐시를 미리 채움
+            has_embedding = True
+        return TopicArtifacts(
+            topic_id=topic_id,
+            title=title,
+            description=description,
+            prefix=detector.encode_prefix(build_context_prefix(title, description)),
+            keywords=scorer.topic_bigrams(key) if key is not None else frozenset(),
+            has_embedding=has_embedding,
+            model_version=detector.model_version,
+            registered_at=time.time()
+        )
+
+    def _store(self, artifacts: TopicArtifacts):
+        with self._lock:
+            self._topics[artifacts.topic_id] = artifacts
+            self._topics.move_to_end(artifacts.topic_id)
+            while len(self._topics) > self.max_topics:
+                self._topics.popitem(last=False)
+
+    def _get_local(self, topic_id: str) -> Optional[TopicArtifacts]:
+        with self._lock:
+            artifacts = self._topics.get(topic_id)
+            if artifacts is not None:
+                self._topics.move_to_end(topic_id)
+            return artifacts
+
+    def _shared_key(self, topic_id: str) -> str:
+        return f"{self.namespace}:{topic_id}"
+
+    async def register(self, topic_id: str, title: Optional[str], description: Optional[str]) -> TopicArtifacts:
+        """토픽 등록/수정 (산출물을 다시 계산하고 공유 계층에 정의 저장)"""
+        artifacts = await self.executor.run(self._build, topic_id, title, description)
+        self._store(artifacts)
+        if self.shared is not None:
+            definition = json.dumps({"title": title, "description": description}, ensure_ascii=False)
+            try:
+                await asyncio.to_thread(self.shared.set, self._shared_key(topic_id), definition)
+            except Exception as e:
+                logger.warning(f"Could not store topic {topic_id} in shared tier: {e}")
+        return artifacts
+
+    async def get(self, topic_id: str) -> Optional[TopicArtifacts]:
+        """토픽 산출물 조회 (공유 계층 정의와 다르거나 모델이 바뀌었으면 다시 계산)"""
+        artifacts = self._get_local(topic_id)
+        title = artifacts.title if artifacts is not None else None
+        description = artifacts.description if artifacts is not None else None
+
+        if self.shared is not None:
+            try:
+                payload = await asyncio.to_thread(self.shared.get, self._shared_key(topic_id))
+            except Exception as e:
+                logger.warning(f"Topic shared lookup failed, using local copy: {e}")
+                return artifacts
+            if payload is None:
+                # 다른 워커에서 삭제됨
+                if artifacts is not None:
+                    self._remove_local(topic_id)
+                return None
+            definition = json.loads(payload)
+            title, description = definition.get("title"), definition.get("description")
+
+        if artifacts is None and title is None and description is None:
+            return None
+        if (
+            artifacts is None
+            or artifacts.title != title
+            or artifacts.description != description
+            or artifacts.model_version != self.detector.model_version
+        ):
+            artifacts = await self.executor.run(self._build, topic_id, title, description)
+            self._store(artifacts)
+        return artifacts
+
+    def _remove_local(self, topic_id: str) -> bool:
+        with self._lock:
+            return self._topics.pop(topic_id, None) is not None
+
+    async def evict(self, topic_id: str) -> bool:
+        """토픽 삭제 (로컬과 공유 계층)"""
+        removed = self._remove_local(topic_id)
+        if self.shared is not None:
+            try:
+                removed = bool(await asyncio.to_thread(self.shared.delete, self._shared_key(topic_id))) or removed
+            except Exception as e:
+                logger.warning(f"Could not delete topic {topic_id} from shared tier: {e}")
+        return removed
+
+    def get_stats(self) -> Dict:
+        return {
+            "topics": len(self._topics),
+            "max_topics": self.max_topics,
+            "shared_tier": self.shared is not None,
+            "shared_tier_type": "file" if isinstance(self.shared, FileTopicStore) else ("redis" if self.shared is not None else None)
+        }
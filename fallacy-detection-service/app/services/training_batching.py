@@ -0,0 +1,156 @@
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+from torch.utils.data import DataLoader
+from transformers import Trainer, TrainerCallback
+
+logger = logging.getLogger(__name__)
+
+# 학습 배치 구성 방식
+PADDED = "padded"                  # 모든 샘플을 max_length까지 패딩, 고정 배치 크기 (기존 방식)
+LENGTH_GROUPED = "length_grouped"  # 길이가 비슷한 샘플끼리 묶고 배치 내 최장 길이까지만 패딩
+TOKEN_BUDGET = "token_budget"      # 길이 그룹 + 배치당 토큰 수(최장 길이 × 샘플 수) 상한으로 배치 크기 결정
+BATCHING_MODES = (PADDED, LENGTH_GROUPED, TOKEN_BUDGET)
+
+TRAINING_REPORT_FILE = "training_report.json"
+
+
+class TokenBudgetBatchSampler:
+    """길이순으로 정렬한 샘플을 패딩 포함 토큰 수가 max_tokens를 넘지 않게 배치로 묶음
+
+    짧은 샘플은 많이, 긴 샘플은 적게 묶이므로 step마다 계산량이 비슷합니다.
+    배치 구성은 한 번만 정하고 epoch마다 배치 순서만 섞으므로 배치 수(Trainer의 max_steps 계산)가 고정됩니다.
+    """
+
+    def __init__(self, lengths: Sequence[int], max_tokens: int, max_batch_size: int = 0, seed: int = 42):
+        rng = random.Random(seed)
+        # 같은 길이끼리는 무작위 순서 (원본 데이터 순서에 따라 배치가 고정되지 않도록)
+        order = sorted(range(len(lengths)), key=lambda index: (lengths[index], rng.random()))
+        self.batches: List[List[int]] = []
+        current: List[int] = []
+        longest = 0
+        for index in order:
+            length = max(1, lengths[index])
+            full = max_batch_size > 0 and len(current) >= max_batch_size
+            if current and (full or max(longest, length) * (len(current) + 1) > max_tokens):
+                self.batches.append(current)
+                current, longest = [], 0
+            current.append(index)
+            longest = max(longest, length)
+        if current:
+            self.batches.append(current)
+        self.seed = seed
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        return len(self.batches)
+
+    def __iter__(self):
+        order = list(range(len(self.batches)))
+        random.Random(self.seed + self.epoch).shuffle(order)
+        self.epoch += 1
+        for index in order:
+            yield self.batches[index]
+
+
+class TokenCountingCollator:
+    """collator 래퍼: 배치의 실제 토큰 수(attention_mask 합)와 패딩 포함 토큰 수 집계
+
+    DataLoader worker 없이(dataloader_num_workers=0) 학습 프로세스에서 호출될 때만 집계됩니다.
+    """
+
+    def __init__(self, collator):
+        self.collator = collator
+        self.tokens = 0
+        self.padded_tokens = 0
+        self.batches = 0
+
+    def __call__(self, features):
+        batch = self.collator(features)
+        mask = batch["attention_mask"]
+        self.tokens += int(mask.sum())
+        self.padded_tokens += mask.numel()
+        self.batches += 1
+        return batch
+
+
+class ThroughputCallback(TrainerCallback):
+    """epoch별 학습 시간과 초당 토큰 수 (실제 토큰/패딩 포함 토큰) 기록"""
+
+    def __init__(self, counter: TokenCountingCollator):
+        self.counter = counter
+        self.epochs: List[Dict] = []
+        self.train_started: Optional[float] = None
+        self.train_seconds = 0.0
+        self._epoch_started = 0.0
+        self._epoch_counts = (0, 0, 0)
+
+    def _counts(self):
+        return self.counter.tokens, self.counter.padded_tokens, self.counter.batches
+
+    def tokens_per_second(self) -> Optional[float]:
+        if self.train_started is None:
+            return None
+        elapsed = time.perf_counter() - self.train_started
+        return self.counter.tokens / elapsed if elapsed > 0 else None
+
+    def on_train_begin(self, args, state, control, **kwargs):
+        self.train_started = time.perf_counter()
+
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self._epoch_started = time.perf_counter()
+        self._epoch_counts = self._counts()
+
+    def on_epoch_end(self, args, state, control, **kwargs):
+        seconds = time.perf_counter() - self._epoch_started
+        tokens, padded_tokens, batches = (now - before for now, before in zip(self._counts(), self._epoch_counts))
+        self.epochs.append({
+            "epoch": len(self.epochs) + 1,
+            "seconds": round(seconds, 3),
+            "batches": batches,
+            "tokens": tokens,
+            "padded_tokens": padded_tokens,
+            "tokens_per_second": round(tokens / seconds, 1) if seconds > 0 else None,
+            "padding_ratio": round(1 - tokens / padded_tokens, 4) if padded_tokens else None
+        })
+        logger.info(f"Epoch {len(self.epochs)} finished: {self.epochs[-1]}")
+
+    def on_train_end(self, args, state, control, **kwargs):
+        if self.train_started is not None:
+            self.train_seconds = time.perf_counter() - self.train_started
+
+    def summary(self) -> Dict:
+        tokens, padded_tokens = self.counter.tokens, self.counter.padded_tokens
+        return {
+            "train_seconds": round(self.train_seconds, 3),
+            "steps": self.counter.batches,
+            "tokens": tokens,
+            "padded_tokens": padded_tokens,
+            "tokens_per_second": round(tokens / self.train_seconds, 1) if self.train_seconds > 0 else None,
+            "padded_tokens_per_second": round(padded_tokens / self.train_seconds, 1) if self.train_seconds > 0 else None,
+            "padding_ratio": round(1 - tokens / padded_tokens, 4) if padded_tokens else None,
+            "epochs": self.epochs
+        }
+
+
+class BatchSamplerTrainer(Trainer):
+    """학습 DataLoader에 배치 샘플러를 사용하는 Trainer (토큰 예산 배치용, 없으면 기본 동작)"""
+
+    def __init__(self, *args, train_batch_sampler=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.train_batch_sampler = train_batch_sampler
+
+    def get_train_dataloader(self):
+        if self.train_batch_sampler is None:
+            return super().get_train_dataloader()
+        dataset = self._remove_unused_columns(self.train_dataset, description="training")
+        dataloader = DataLoader(
+            dataset,
+            batch_sampler=self.train_batch_sampler,
+            collate_fn=self.data_collator,
+            num_workers=self.args.dataloader_num_workers,
+            pin_memory=self.args.dataloader_pin_memory
+        )
+        return self.accelerator.prepare(dataloader)
@@ -0,0 +1,607 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.models.adapters import adapter_base, is_adapter_dir
+from app.services.executors import ExecutorBusyError
+from app.services.file_lock import file_lock
+from app.services.model_registry import ModelActivationError, ModelRegistry
+from app.services.training_modes import ADAPTER, FULL, TRAINING_MODES, WARM_START
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태 (queued → running → activating → succeeded / failed / cancelled)
+QUEUED = "queued"
+RUNNING = "running"
+ACTIVATING = "activating"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# 취소 요청 후 학습 프로세스가 스스로 종료하기를 기다리는 시간 (초과하면 강제 종료)
+CANCEL_GRACE_SECONDS = 10.0
+POLL_INTERVAL_SECONDS = 0.5
+# 대기열 확인 간격 (다른 워커가 등록한 작업이나 다른 워커의 학습이 끝난 뒤 대기 작업을 가져감)
+CLAIM_INTERVAL_SECONDS = 2.0
+
+# 작업 저장소 (모델 레지스트리 디렉토리 아래, prefork 워커들이 같은 작업 목록과 대기열을 공유)
+JOBS_DIR = "training_jobs"
+JOBS_FILE = "jobs.json"
+JOBS_LOCK_FILE = "jobs.lock"
+
+
+def training_cores(cpu_cores: int) -> List[int]:
+    """재학습 프로세스에 줄 코어 (사용 가능한 코어의 뒤쪽부터, 0이면 절반)
+
+    prefork 서버는 앞쪽 코어부터 워커에 배정하므로 뒤쪽 코어를 사용하면 겹침이 최소화됩니다.
+    """
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    count = cpu_cores if cpu_cores > 0 else len(available) // 2
+    count = min(max(1, count), len(available))
+    return available[-count:]
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_training_report(model_path: str) -> Optional[Dict]:
+    from app.services.training_batching import TRAINING_REPORT_FILE
+
+    try:
+        with open(os.path.join(model_path, TRAINING_REPORT_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read training report: {e}")
+        return None
+
+
+def _run_training_job(training_data: List[Dict], output_dir: str, train_options: Dict, cores: List[int],
+                      nice: int, events, cancel_event):
+    """재학습 프로세스: 코어 고정/우선순위 조정 후 학습, 진행 상황과 결과를 이벤트 큐로 전달"""
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError as e:
+            logger.warning(f"Could not pin training process to cores {cores}: {e}")
+    if nice > 0:
+        try:
+            os.nice(nice)
+        except OSError as e:
+            logger.warning(f"Could not lower training process priority: {e}")
+
+    try:
+        import torch
+        from app.services.training_service import TrainingCancelled, TrainingService
+
+        torch.set_num_threads(len(cores))
+        model_path = TrainingService().train_model(
+            training_data,
+            output_dir=output_dir,
+            progress_callback=lambda progress: events.put(("progress", progress)),
+            should_stop=cancel_event.is_set,
+            **train_options
+        )
+        events.put(("result", {"model_path": model_path, "training_report": _read_training_report(model_path)}))
+    except TrainingCancelled:
+        events.put(("cancelled", {}))
+    except Exception as e:
+        events.put(("error", {"error": f"{type(e).__name__}: {e}"}))
+
+
+class TrainingJob:
+    """재학습 작업 하나의 상태, 진행 상황, 결과"""
+
+    # 작업 저장소에 기록하는 필드 (학습 데이터는 작업별 파일에 따로 저장)
+    STATE_FIELDS = (
+        "job_id", "samples", "status", "phase", "step", "max_steps", "epoch", "loss", "tokens_per_second",
+        "training_report", "version", "model_path", "activation", "error", "created_at", "started_at",
+        "training_started_at", "finished_at", "cancel_requested", "owner_pid"
+    )
+
+    def __init__(self, training_data: Optional[List[Dict]]):
+        self.job_id = uuid.uuid4().hex
+        self.training_data = training_data
+        self.samples = len(training_data) if training_data else 0
+        self.status = QUEUED
+        self.phase: Optional[str] = None
+        self.step = 0
+        self.max_steps = 0
+        self.epoch = 0.0
+        self.loss: Optional[float] = None
+        self.tokens_per_second: Optional[float] = None
+        self.training_report: Optional[Dict] = None
+        self.version: Optional[str] = None
+        self.model_path: Optional[str] = None
+        self.activation: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.training_started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+        self.owner_pid: Optional[int] = None  # 작업을 실행 중인 서빙 프로세스
+        self._cancel_event = None
+        self._process = None
+
+    def to_state(self) -> Dict:
+        return {field: getattr(self, field) for field in self.STATE_FIELDS}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "TrainingJob":
+        job = cls(None)
+        for field in cls.STATE_FIELDS:
+            if field in state:
+                setattr(job, field, state[field])
+        return job
+
+    def update_progress(self, progress: Dict):
+        self.phase = progress.get("phase", self.phase)
+        if "step" in progress:
+            if self.training_started_at is None:
+                self.training_started_at = time.time()
+            self.step = progress["step"]
+            self.max_steps = progress.get("max_steps") or self.max_steps
+            self.epoch = progress.get("epoch", self.epoch)
+        if progress.get("loss") is not None:
+            self.loss = progress["loss"]
+        if progress.get("tokens_per_second") is not None:
+            self.tokens_per_second = progress["tokens_per_second"]
+
+    def eta_seconds(self) -> Optional[float]:
+        """지금까지의 step 속도로 계산한 남은 학습 시간 (첫 step 전에는 None)"""
+        if self.status != RUNNING or not self.step or not self.max_steps or self.training_started_at is None:
+            return None
+        elapsed = time.time() - self.training_started_at
+        return elapsed / self.step * max(0, self.max_steps - self.step)
+
+    def to_dict(self) -> Dict:
+        finished_or_now = self.finished_at or time.time()
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "samples": self.samples,
+            "progress": {
+                "phase": self.phase,
+                "step": self.step,
+                "max_steps": self.max_steps,
+                "epoch": self.epoch,
+                "loss": self.loss,
+                "tokens_per_second": self.tokens_per_second,
+                "eta_seconds": self.eta_seconds()
+            },
+            "version": self.version,
+            "model_path": self.model_path,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": finished_or_now - self.started_at if self.started_at else None
+        }
+
+    def result(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "version": self.version,
+            "model_path": self.model_path,
+            "training_report": self.training_report,
+            "activation": self.activation,
+            "error": self.error
+        }
+
+
+class TrainingJobStore:
+    """재학습 작업 상태 파일 저장소 (prefork 워커가 어느 워커로 요청이 가도 같은 작업을 보도록 공유)
+
+    작업 상태는 jobs.json 하나에, 학습 데이터는 작업별 파일에 저장합니다. 상태 수정은 파일 잠금 안에서
+    읽기-수정-쓰기로 하고, 파일은 임시 파일에 쓴 뒤 교체하므로 읽기는 잠금 없이 합니다.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._path = os.path.join(root_dir, JOBS_FILE)
+        self._lock_path = os.path.join(root_dir, JOBS_LOCK_FILE)
+
+    def _read(self) -> "OrderedDict[str, Dict]":
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return OrderedDict((state["job_id"], state) for state in json.load(f)["jobs"])
+        except FileNotFoundError:
+            return OrderedDict()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read training job store, starting empty: {e}")
+            return OrderedDict()
+
+    def _write_json(self, path: str, payload):
+        os.makedirs(self.root_dir, exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def jobs(self) -> "OrderedDict[str, Dict]":
+        """작업 상태 (등록 순서)"""
+        return self._read()
+
+    def update(self, mutate):
+        """잠금 안에서 작업 상태를 읽어 mutate(jobs)로 수정 후 저장하고 mutate의 반환값 반환 (예외가 나면 저장하지 않음)"""
+        with file_lock(self._lock_path):
+            jobs = self._read()
+            before = json.dumps(list(jobs.values()), sort_keys=True)
+            result = mutate(jobs)
+            if json.dumps(list(jobs.values()), sort_keys=True) != before:
+                self._write_json(self._path, {"jobs": list(jobs.values())})
+            return result
+
+    def _data_path(self, job_id: str) -> str:
+        return os.path.join(self.root_dir, f"{job_id}.data.json")
+
+    def save_data(self, job_id: str, training_data: List[Dict]):
+        self._write_json(self._data_path(job_id), training_data)
+
+    def load_data(self, job_id: str) -> Optional[List[Dict]]:
+        try:
+            with open(self._data_path(job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def delete_data(self, job_id: str):
+        try:
+            os.remove(self._data_path(job_id))
+        except FileNotFoundError:
+            pass
+
+
+class TrainingJobManager:
+    """재학습 작업 대기열 (한 번에 하나씩 별도 프로세스에서 학습 후 모델 레지스트리에 등록/활성화)
+
+    학습은 spawn한 자식 프로세스에서 지정된 코어에만 고정하여 실행하므로 서빙 프로세스의 추론 스레드와
+    코어를 다투지 않습니다. 진행 상황은 Trainer 콜백이 이벤트 큐로 보내고, 이벤트 루프에서 주기적으로 읽습니다.
+    작업 목록과 대기열은 모델 레지스트리 디렉토리의 작업 저장소에 두므로 prefork 워커 중 어느 워커로 조회해도
+    같은 작업이 보이고, 대기 작업은 한 워커만 가져가 실행하여 워커 수와 관계없이 학습은 항상 하나씩 실행됩니다.
+    """
+
+    def __init__(self, model_registry: ModelRegistry, train_options: Optional[Dict] = None, cpu_cores: int = 0,
+                 nice: int = 10, max_queued: int = 4, history: int = 20, mode: str = FULL,
+                 store_dir: Optional[str] = None):
+        self.model_registry = model_registry
+        self.train_options = train_options or {}
+        if mode not in TRAINING_MODES:
+            logger.warning(f"Unknown training mode '{mode}', using {FULL}")
+            mode = FULL
+        self.mode = mode
+        self.cores = training_cores(cpu_cores)
+        self.nice = nice
+        self.max_queued = max(1, max_queued)
+        self.history = max(1, history)
+        self.store = TrainingJobStore(store_dir or os.path.join(model_registry.root_dir, JOBS_DIR))
+        self._current: Optional[TrainingJob] = None  # 이 프로세스가 실행 중인 작업 (학습 프로세스 핸들 보관)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._context = multiprocessing.get_context("spawn")
+
+    def start(self):
+        """대기열 워커 시작 (이벤트 루프 안에서 호출, prefork 워커는 시작 시 호출하여 다른 워커가 등록한 작업도 실행)"""
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        """이벤트 루프 안에서 처음 호출될 때 대기열 워커 시작"""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, training_data: List[Dict]) -> TrainingJob:
+        """재학습 작업 등록 (대기 중인 작업이 한도를 넘으면 ExecutorBusyError)"""
+        if not training_data:
+            raise ValueError("Training data is empty")
+        self._ensure_worker()
+        job = await asyncio.to_thread(self._enqueue, training_data)
+        self._wakeup.set()
+        return job
+
+    def _enqueue(self, training_data: List[Dict]) -> TrainingJob:
+        job = TrainingJob(training_data)
+        # 학습 데이터를 먼저 저장 (어느 워커가 작업을 가져가도 읽을 수 있도록)
+        self.store.save_data(job.job_id, training_data)
+
+        def add(jobs):
+            queued = sum(1 for state in jobs.values() if state["status"] == QUEUED)
+            if queued >= self.max_queued:
+                raise ExecutorBusyError(f"Training queue is full ({queued} jobs queued)")
+            jobs[job.job_id] = job.to_state()
+            return queued
+
+        try:
+            queued = self.store.update(add)
+        except ExecutorBusyError:
+            self.store.delete_data(job.job_id)
+            raise
+        logger.info(f"Training job {job.job_id} queued ({job.samples} samples, {queued} jobs ahead)")
+        return job
+
+    async def get(self, job_id: str) -> Optional[TrainingJob]:
+        state = (await asyncio.to_thread(self.store.jobs)).get(job_id)
+        return TrainingJob.from_state(state) if state is not None else None
+
+    async def cancel(self, job_id: str) -> Optional[TrainingJob]:
+        """작업 취소 (대기 중이면 즉시, 학습 중이면 다음 step에서 중단, 끝난 작업은 그대로)
+
+        다른 워커가 학습 중인 작업은 저장소에 취소 요청만 기록하고, 실행 중인 워커가 상태를 동기화할 때 반영합니다.
+        """
+        def request_cancel(jobs):
+            state = jobs.get(job_id)
+            if state is None or state["status"] in FINISHED_STATES:
+                return state
+            state["cancel_requested"] = True
+            if state["status"] == QUEUED:
+                state.update(status=CANCELLED, finished_at=time.time())
+            logger.info(f"Cancellation requested for training job {job_id} ({state['status']})")
+            return dict(state)
+
+        state = await asyncio.to_thread(self.store.update, request_cancel)
+        if state is None:
+            return None
+        if state["status"] == CANCELLED:
+            await asyncio.to_thread(self.store.delete_data, job_id)
+        current = self._current
+        if current is not None and current.job_id == job_id and current._cancel_event is not None:
+            current.cancel_requested = True
+            current._cancel_event.set()
+        return TrainingJob.from_state(state)
+
+    def _sync(self, job: TrainingJob):
+        """이 프로세스가 실행 중인 작업의 상태를 저장소에 기록하고 다른 워커가 받은 취소 요청 반영"""
+        def sync(jobs):
+            stored = jobs.get(job.job_id)
+            if stored is not None and stored.get("cancel_requested"):
+                job.cancel_requested = True
+            jobs[job.job_id] = job.to_state()
+
+        self.store.update(sync)
+        if job.cancel_requested and job._cancel_event is not None and not job._cancel_event.is_set():
+            job._cancel_event.set()
+
+    def _store_finished(self, job: TrainingJob):
+        """끝난 작업 기록 후 오래된 작업 정리 (끝난 작업은 최근 history개만 보관, 학습 데이터 파일 삭제)"""
+        def finish(jobs):
+            jobs[job.job_id] = job.to_state()
+            finished = [job_id for job_id, state in jobs.items() if state["status"] in FINISHED_STATES]
+            trimmed = finished[:max(0, len(finished) - self.history)]
+            for job_id in trimmed:
+                del jobs[job_id]
+            return trimmed
+
+        for job_id in [job.job_id] + self.store.update(finish):
+            self.store.delete_data(job_id)
+
+    async def _finish(self, job: TrainingJob, status: str, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.training_data = None  # 끝난 작업은 학습 데이터를 보관하지 않음
+        await asyncio.to_thread(self._store_finished, job)
+
+    def _claim(self) -> Optional[TrainingJob]:
+        """가장 오래된 대기 작업을 이 프로세스 소유로 가져옴 (다른 워커가 학습 중이면 None → 학습은 한 번에 하나)"""
+        reaped = []
+
+        def claim(jobs):
+            for state in jobs.values():
+                if state["status"] not in (RUNNING, ACTIVATING):
+                    continue
+                if _process_alive(state.get("owner_pid")):
+                    return None
+                # 작업을 실행하던 워커가 종료됨 (재시작된 워커는 학습을 이어서 하지 않음)
+                state.update(status=FAILED, error="재학습 작업을 실행하던 서빙 프로세스가 종료되었습니다",
+                             finished_at=time.time())
+                reaped.append(state["job_id"])
+            for state in jobs.values():
+                if state["status"] == QUEUED:
+                    state.update(status=RUNNING, owner_pid=os.getpid(), started_at=time.time())
+                    return dict(state)
+            return None
+
+        state = self.store.update(claim)
+        for job_id in reaped:
+            logger.warning(f"Training job {job_id} failed: its serving process exited")
+            self.store.delete_data(job_id)
+        if state is None:
+            return None
+        job = TrainingJob.from_state(state)
+        job.training_data = self.store.load_data(job.job_id)
+        return job
+
+    async def _run(self):
+        """작업 워커 루프 (저장소의 대기열 순서대로 하나씩 실행, 다른 워커가 학습 중이면 끝날 때까지 대기)"""
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.warning(f"Could not read training job queue: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), CLAIM_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._current = job
+            try:
+                if job.training_data is None:
+                    await self._finish(job, FAILED, "재학습 데이터를 찾을 수 없습니다")
+                else:
+                    await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Training job {job.job_id} failed: {e}", exc_info=True)
+                if job.status not in FINISHED_STATES:
+                    await self._finish(job, FAILED, str(e))
+            finally:
+                self._current = None
+
+    def _start_point(self) -> Tuple[Dict, Dict]:
+        """증분 재학습의 학습 옵션과 버전 메타데이터 (서빙 중인 버전이 어댑터면 그 기본 모델과 어댑터에서 시작)
+        
+        어댑터 위에서 warm_start하면 학습 프로세스가 어댑터를 기본 모델에 병합한 뒤 전체 가중치를 학습합니다.
+        """
+        if self.mode == FULL:
+            return {"lora_rank": 0}, {}
+        active = self.model_registry.active
+        if active is None or not active.path:
+            logger.info("No fine-tuned model is serving, retraining from the pretrained model")
+            return {"lora_rank": 0}, {}
+
+        if is_adapter_dir(active.path):
+            base_path = adapter_base(active.path)["path"]
+            base_version = (self.model_registry.get_version(active.version) or {}).get("base_version")
+            adapter_path = active.path
+        else:
+            base_path, base_version, adapter_path = active.path, active.version, None
+        options = {"init_model_path": base_path, "init_adapter_path": adapter_path, "lora_rank": 0}
+        if self.mode == ADAPTER:
+            options["lora_rank"] = self.train_options.get("lora_rank", 0)
+        return options, {"init_version": active.version, "base_version": base_version}
+
+    async def _run_job(self, job: TrainingJob):
+        # 재학습 결과는 새 버전 디렉토리에 저장 (서빙 중인 모델 디렉토리는 건드리지 않음)
+        candidate = self.model_registry.new_version()
+        job.version = candidate["version"]
+        start_options, start_metadata = self._start_point()
+
+        events = self._context.Queue()
+        job._cancel_event = self._context.Event()
+        job._process = self._context.Process(
+            target=_run_training_job,
+            args=(job.training_data, candidate["path"], {**self.train_options, **start_options}, self.cores, self.nice,
+                  events, job._cancel_event),
+            name=f"training-{job.job_id[:8]}",
+            daemon=True
+        )
+        job._process.start()
+        logger.info(f"Training job {job.job_id} started (pid={job._process.pid}, cores={self.cores}, version={job.version})")
+        await asyncio.to_thread(self._sync, job)
+
+        outcome = await self._watch(job, events)
+        job._process = None
+        job._cancel_event = None
+
+        kind, payload = outcome
+        if kind == "cancelled":
+            await self._finish(job, CANCELLED)
+            logger.info(f"Training job {job.job_id} cancelled")
+            return
+        if kind == "error":
+            await self._finish(job, FAILED, payload["error"])
+            logger.error(f"Training job {job.job_id} failed: {payload['error']}")
+            return
+
+        job.model_path = payload["model_path"]
+        job.training_report = payload.get("training_report")
+        metadata = {"init_version": start_metadata.get("init_version")}
+        if is_adapter_dir(job.model_path):
+            # 어댑터 버전은 기본 모델 버전이 정리되지 않도록 참조를 기록
+            metadata.update(kind=ADAPTER, base_version=start_metadata.get("base_version"))
+        self.model_registry.register(job.version, job.model_path, samples=job.samples, job_id=job.job_id, **metadata)
+        # 워밍업을 마친 뒤 서빙 포인터를 교체하고 이전 모델은 진행 중인 요청이 끝나면 해제
+        job.status = ACTIVATING
+        await asyncio.to_thread(self._sync, job)
+        try:
+            job.activation = await self.model_registry.activate(job.version)
+        except (ModelActivationError, ExecutorBusyError) as e:
+            await self._finish(job, FAILED, f"학습은 완료되었지만 활성화하지 못했습니다 (이전 모델로 계속 서빙): {e}")
+            return
+        await self._finish(job, SUCCEEDED)
+        logger.info(f"Training job {job.job_id} finished in {job.finished_at - job.started_at:.1f}s (version {job.version})")
+
+    async def _watch(self, job: TrainingJob, events):
+        """학습 프로세스의 이벤트를 읽어 진행 상황 갱신, 종료 이벤트 반환"""
+        process = job._process
+        cancel_deadline = None
+        while True:
+            try:
+                while True:
+                    kind, payload = events.get_nowait()
+                    if kind == "progress":
+                        job.update_progress(payload)
+                    else:
+                        # 프로세스 종료 대기는 블로킹이므로 이벤트 루프 밖에서 실행
+                        await asyncio.to_thread(process.join, 5)
+                        return kind, payload
+            except queue.Empty:
+                pass
+
+            if not process.is_alive():
+                # 종료 직전에 보낸 이벤트가 아직 파이프에 남아 있을 수 있음 (대기는 이벤트 루프 밖에서)
+                try:
+                    while True:
+                        kind, payload = await asyncio.to_thread(events.get, True, 1)
+                        if kind != "progress":
+                            return kind, payload
+                except queue.Empty:
+                    pass
+                # 이벤트를 남기지 못하고 종료 (OOM 등)
+                if job.cancel_requested:
+                    return "cancelled", {}
+                return "error", {"error": f"Training process exited with code {process.exitcode}"}
+
+            if job.cancel_requested:
+                # 토크나이징/ONNX 내보내기 중에는 step 콜백이 없으므로 유예 시간 후 강제 종료
+                cancel_deadline = cancel_deadline or time.time() + CANCEL_GRACE_SECONDS
+                if time.time() >= cancel_deadline:
+                    process.terminate()
+                    await asyncio.to_thread(process.join, 5)
+                    return "cancelled", {}
+            # 진행 상황을 저장소에 기록하고 다른 워커로 들어온 취소 요청 확인
+            await asyncio.to_thread(self._sync, job)
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    async def stop(self):
+        """워커 종료 (이 프로세스에서 학습 중인 작업은 종료하고 실패로 기록)"""
+        job = self._current
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if job is not None and job.status not in FINISHED_STATES:
+            if job._process is not None and job._process.is_alive():
+                job._process.terminate()
+            await self._finish(job, FAILED, "서비스 종료로 재학습 작업이 중단되었습니다")
+
+    async def list_jobs(self) -> List[Dict]:
+        jobs = await asyncio.to_thread(self.store.jobs)
+        return [TrainingJob.from_state(state).to_dict() for state in reversed(jobs.values())]
+
+    async def get_stats(self) -> Dict:
+        jobs = (await asyncio.to_thread(self.store.jobs)).values()
+        return {
+            "mode": self.mode,
+            "cores": self.cores,
+            "nice": self.nice,
+            "max_queued": self.max_queued,
+            "queued": sum(1 for state in jobs if state["status"] == QUEUED),
+            "running": next((state["job_id"] for state in jobs if state["status"] in (RUNNING, ACTIVATING)), None)
+        }
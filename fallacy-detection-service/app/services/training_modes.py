@@ -0,0 +1,6 @@
+# 재학습 시작점 (full: 기본 사전학습 모델, warm_start: 서빙 중인 체크포인트, adapter: 서빙 중인 체크포인트 위 LoRA 어댑터)
+# 학습 프로세스(training_service)와 작업 관리자(training_jobs)가 함께 사용하므로 무거운 의존성 없이 분리
+FULL = "full"
+WARM_START = "warm_start"
+ADAPTER = "adapter"
+TRAINING_MODES = (FULL, WARM_START, ADAPTER)
@@ -1,27 +1,73 @@
 import logging
-from typing import List, Dict
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, Trainer, TrainingArguments
+from typing import Callable, List, Dict, Optional, Sequence
+from transformers import (
+    AutoTokenizer, AutoModelForSequenceClassification, DataCollatorWithPadding, TrainerCallback, TrainingArguments
+)
 from datasets import Dataset
 import torch
 import json
 import os
 
+from app.models.adapters import DEFAULT_TARGET_MODULES, load_adapter_model
+from app.models.model_artifact import write_adapter_artifact, write_artifact
+from app.services.tokenized_cache import TokenizedDatasetCache
+from app.services.training_batching import (
+    BATCHING_MODES, LENGTH_GROUPED, PADDED, TOKEN_BUDGET, TRAINING_REPORT_FILE,
+    BatchSamplerTrainer, ThroughputCallback, TokenBudgetBatchSampler, TokenCountingCollator
+)
+from app.services.training_modes import ADAPTER, FULL, WARM_START
+
 logger = logging.getLogger(__name__)
 
+class TrainingCancelled(RuntimeError):
+    """재학습 작업 취소 요청으로 학습 중단"""
+
+class _ProgressCallback(TrainerCallback):
+    """Trainer 진행 상황(step, loss, epoch, 초당 토큰 수) 전달 및 취소 요청 확인"""
+    
+    def __init__(self, report: Optional[Callable[[Dict], None]], should_stop: Optional[Callable[[], bool]],
+                 throughput: Optional[ThroughputCallback] = None):
+        self.report = report
+        self.should_stop = should_stop
+        self.throughput = throughput
+        self.loss = None
+    
+    def on_train_begin(self, args, state, control, **kwargs):
+        if self.report:
+            self.report({"phase": "training", "step": 0, "max_steps": state.max_steps, "epoch": 0.0})
+    
+    def on_log(self, args, state, control, logs=None, **kwargs):
+        if logs and "loss" in logs:
+            self.loss = float(logs["loss"])
+    
+    def on_step_end(self, args, state, control, **kwargs):
+        if self.should_stop is not None and self.should_stop():
+            raise TrainingCancelled("Training cancelled")
+        if self.report:
+            self.report({
+                "phase": "training",
+                "step": state.global_step,
+                "max_steps": state.max_steps,
+                "epoch": float(state.epoch or 0.0),
+                "loss": self.loss,
+                "tokens_per_second": self.throughput.tokens_per_second() if self.throughput else None
+            })
+
 class TrainingService:
     def __init__(self, model_name: str = "monologg/koelectra-base-v3-discriminator"):
         self.model_name = model_name
         self.tokenizer = None
         self.model = None
     
-    def prepare_training_data(self, training_data: List[Dict]) -> tuple:
-        """재학습 데이터 준비"""
+    def prepare_training_data(self, training_data: List[Dict], label_to_id: Optional[Dict[str, int]] = None) -> tuple:
+        """재학습 데이터 준비 (label_to_id를 주면 그 매핑 사용, 이어서 학습할 모델의 분류 헤드와 맞추기 위함)"""
         if not training_data:
             raise ValueError("Training data is empty")
         
         # 라벨 매핑 생성
-        unique_labels = list(set([item["label"] for item in training_data]))
-        label_to_id = {label: idx for idx, label in enumerate(unique_labels)}
+        if label_to_id is None:
+            unique_labels = list(set([item["label"] for item in training_data]))
+            label_to_id = {label: idx for idx, label in enumerate(unique_labels)}
         
         # 데이터 변환
         processed_data = []
@@ -35,51 +81,136 @@ class TrainingService:
         
         return dataset, label_to_id
     
-    def train_model(self, training_data: List[Dict], output_dir: str = "./models/fallacy_detector"):
-        """모델 재학습"""
+    def _checkpoint_label_mapping(self, model_path: str, training_data: List[Dict]) -> Optional[Dict[str, int]]:
+        """이어서 학습할 체크포인트의 라벨 매핑 (없거나 학습 데이터에 모르는 라벨이 있으면 None)"""
+        try:
+            with open(os.path.join(model_path, "label_mapping.json"), "r", encoding="utf-8") as f:
+                label_to_id = json.load(f)["label_to_id"]
+        except Exception as e:
+            logger.warning(f"Could not read label mapping of {model_path}, retraining from {self.model_name}: {e}")
+            return None
+        unknown = {item["label"] for item in training_data} - set(label_to_id)
+        if unknown:
+            logger.warning(f"Training data has labels unknown to {model_path} ({sorted(unknown)}), "
+                           f"retraining from {self.model_name}")
+            return None
+        return label_to_id
+    
+    def _attach_lora(self, model, rank: int, target_modules: Sequence[str], init_adapter_path: Optional[str] = None):
+        """LoRA 어댑터 부착 (기본 모델 가중치는 고정, init_adapter_path가 있으면 그 어댑터에서 이어서 학습)"""
+        try:
+            from peft import LoraConfig, PeftModel, TaskType, get_peft_model
+        except ImportError as e:
+            raise RuntimeError("Adapter training requires the peft package (pip install peft)") from e
+        
+        if init_adapter_path:
+            model = PeftModel.from_pretrained(model, init_adapter_path, is_trainable=True)
+        else:
+            # SEQ_CLS 작업은 분류 헤드를 어댑터와 함께 전체 학습/저장
+            config = LoraConfig(
+                task_type=TaskType.SEQ_CLS,
+                r=rank,
+                lora_alpha=rank * 2,
+                lora_dropout=0.1,
+                target_modules=list(target_modules)
+            )
+            model = get_peft_model(model, config)
+        trainable = sum(p.numel() for p in model.parameters() if p.requires_grad)
+        total = sum(p.numel() for p in model.parameters())
+        logger.info(f"LoRA adapter: {trainable:,} trainable of {total:,} parameters ({trainable / total:.2%})")
+        return model
+    
+    def train_model(self, training_data: List[Dict], output_dir: str = "./models/fallacy_detector",
+                    export_onnx: bool = True, early_exit_layers: Optional[Sequence[int]] = None,
+                    progress_callback: Optional[Callable[[Dict], None]] = None,
+                    should_stop: Optional[Callable[[], bool]] = None,
+                    tokenized_cache_dir: Optional[str] = None, batching: str = LENGTH_GROUPED,
+                    max_tokens_per_batch: int = 0, init_model_path: Optional[str] = None,
+                    init_adapter_path: Optional[str] = None, lora_rank: int = 0,
+                    lora_target_modules: Sequence[str] = DEFAULT_TARGET_MODULES):
+        """모델 재학습 (early_exit_layers를 지정하면 중간 레이어 조기 종료 헤드도 학습)
+        
+        tokenized_cache_dir을 지정하면 토크나이징 결과를 Arrow 파일로 보관하여 다음 재학습에서 재사용합니다.
+        batching은 배치 구성 방식입니다 (padded: 512 토큰 고정 패딩, length_grouped: 길이별 묶음 + 동적 패딩,
+        token_budget: 배치당 max_tokens_per_batch 토큰 상한). epoch별 시간과 초당 토큰 수는 training_report.json에 기록합니다.
+        init_model_path를 지정하면 그 체크포인트에서 이어서 학습하고(warm start), lora_rank도 지정하면 체크포인트는
+        고정한 채 LoRA 어댑터(와 분류 헤드)만 학습하여 어댑터 아티팩트로 저장합니다. init_adapter_path는 체크포인트 위
+        어댑터로, LoRA 학습은 그 어댑터에서 이어서 학습하고 warm start는 어댑터를 병합한 모델에서 시작합니다. 학습 데이터에 체크포인트가 모르는
+        라벨이 있으면 기본 사전학습 모델에서 전체 학습합니다.
+        progress_callback은 단계/step/loss를 받고, should_stop이 True를 반환하면 다음 step에서 TrainingCancelled로 중단합니다.
+        """
+        def report(progress: Dict):
+            if progress_callback is not None:
+                progress_callback(progress)
+        
+        if batching not in BATCHING_MODES:
+            raise ValueError(f"Unknown batching mode: {batching} (expected one of {BATCHING_MODES})")
+        if batching == TOKEN_BUDGET and max_tokens_per_batch < 512:
+            raise ValueError("Token-budget batching needs max_tokens_per_batch of at least 512 (one full-length sample)")
+        
         try:
             logger.info(f"Starting retraining with {len(training_data)} samples")
             
+            # 학습 시작점 (이어서 학습할 체크포인트가 있으면 그 분류 헤드의 라벨 매핑 유지)
+            # (어댑터에서 시작하면 어댑터와 함께 학습한 분류 헤드의 라벨 매핑)
+            label_to_id = (
+                self._checkpoint_label_mapping(init_adapter_path or init_model_path, training_data)
+                if init_model_path else None
+            )
+            if label_to_id is None:
+                mode, model_source = FULL, self.model_name
+            else:
+                mode, model_source = (ADAPTER if lora_rank > 0 else WARM_START), init_model_path
+            logger.info(f"Training mode: {mode} (from {model_source})")
+            
             # 데이터 준비
-            dataset, label_to_id = self.prepare_training_data(training_data)
+            dataset, label_to_id = self.prepare_training_data(training_data, label_to_id)
             
             # 토크나이저 초기화
-            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            report({"phase": "tokenizing"})
+            tokenizer = AutoTokenizer.from_pretrained(model_source)
             
             # 토크나이징 (한국어 모델, max_length 512로 증가)
-            def tokenize_function(examples):
-                tokenized = tokenizer(
-                    examples["text"],
-                    truncation=True,
-                    padding="max_length",
-                    max_length=512  # 한국어 모델은 512 토큰 지원
-                )
-                # labels는 그대로 유지
-                tokenized["labels"] = examples["labels"]
-                return tokenized
-            
-            tokenized_dataset = dataset.map(
-                tokenize_function,
-                batched=True,
-                remove_columns=["text", "label"] if "label" in dataset.column_names else ["text"]
-            )
-            
-            # Tensor 포맷 설정 (labels는 long)
-            tokenized_dataset.set_format(
-                type="torch",
-                columns=["input_ids", "attention_mask", "labels"],
-                output_all_columns=False
-            )
+            # 이전 재학습에서 토크나이징한 샘플은 Arrow 캐시에서 memory-map으로 읽고 새 샘플만 토크나이징
+            token_cache = TokenizedDatasetCache(tokenized_cache_dir, tokenizer, max_length=512)
+            tokenized_dataset = token_cache.build(dataset["text"]).add_column("labels", dataset["labels"])
+            lengths = [len(input_ids) for input_ids in tokenized_dataset["input_ids"]]
+            # 캐시에는 패딩 없는 토큰 ID만 있으므로 배치를 만들 때 패딩 (attention_mask도 함께 생성)
+            if batching == PADDED:
+                collator = DataCollatorWithPadding(tokenizer, padding="max_length", max_length=512)
+            else:
+                # 배치 내 최장 길이까지만 패딩 (8의 배수로 맞춰 커널 형태 수 제한)
+                tokenized_dataset = tokenized_dataset.add_column("length", lengths)
+                collator = DataCollatorWithPadding(tokenizer, padding="longest", pad_to_multiple_of=8)
+            data_collator = TokenCountingCollator(collator)
+            throughput = ThroughputCallback(data_collator)
             
             # 모델 초기화
-            model = AutoModelForSequenceClassification.from_pretrained(
-                self.model_name,
-                num_labels=len(label_to_id)
-            )
+            if mode == WARM_START and init_adapter_path:
+                # 서빙 중인 어댑터를 기본 모델에 병합한 가중치에서 전체 학습 (병합하지 않으면 어댑터 학습분이 사라짐)
+                logger.info(f"Merging serving adapter {init_adapter_path} before warm-start training")
+                model = load_adapter_model(init_adapter_path, mmap_weights=False)
+                for parameter in model.parameters():
+                    parameter.requires_grad_(True)
+            else:
+                model = AutoModelForSequenceClassification.from_pretrained(
+                    model_source,
+                    num_labels=len(label_to_id)
+                )
+            if mode == ADAPTER:
+                model = self._attach_lora(model, lora_rank, lora_target_modules, init_adapter_path)
             
             # 학습 인수 (작은 데이터셋의 경우 더 적은 epoch로)
             num_samples = len(training_data)
             num_epochs = 3 if num_samples >= 100 else 1  # 작은 데이터셋은 1 epoch
+            batch_size = min(16, num_samples)  # 데이터보다 큰 batch size 방지
+            
+            # 토큰 예산 배치: 짧은 샘플은 더 크게 묶되 샘플 수가 기존 배치의 4배를 넘지 않게 제한
+            batch_sampler = None
+            if batching == TOKEN_BUDGET:
+                batch_sampler = TokenBudgetBatchSampler(lengths, max_tokens_per_batch, max_batch_size=batch_size * 4)
+                logger.info(f"Token-budget batching: {len(batch_sampler)} batches per epoch "
+                            f"(max {max_tokens_per_batch} tokens per batch)")
             
             # MPS (Apple Silicon) 호환성을 위해 CPU 사용 강제
             use_cpu = not torch.cuda.is_available() or torch.backends.mps.is_available()
@@ -87,8 +218,10 @@ class TrainingService:
             training_args = TrainingArguments(
                 output_dir=output_dir,
                 num_train_epochs=num_epochs,
-                per_device_train_batch_size=min(16, num_samples),  # 데이터보다 큰 batch size 방지
-                learning_rate=3e-5,
+                per_device_train_batch_size=batch_size,
+                group_by_length=batching == LENGTH_GROUPED,  # 비슷한 길이끼리 배치 (무작위 묶음 단위로 정렬)
+                # 이어서 학습할 때는 기존 학습 내용을 덜 잊도록 낮게, 어댑터는 작은 행렬만 학습하므로 높게
+                learning_rate={FULL: 3e-5, WARM_START: 2e-5, ADAPTER: 3e-4}[mode],
                 weight_decay=0.01,
                 logging_steps=max(1, num_samples // 10),  # 최소 1 step
                 save_steps=1000,  # 작은 데이터셋에서는 저장 스킵
@@ -99,17 +232,36 @@ class TrainingService:
             )
             
             # 트레이너 설정
-            trainer = Trainer(
+            trainer = BatchSamplerTrainer(
                 model=model,
                 args=training_args,
                 train_dataset=tokenized_dataset,
-                tokenizer=tokenizer
+                data_collator=data_collator,
+                tokenizer=tokenizer,
+                callbacks=[throughput, _ProgressCallback(progress_callback, should_stop, throughput)],
+                train_batch_sampler=batch_sampler
             )
             
             # 학습 실행
             trainer.train()
             trainer.save_model()
             
+            # 학습 처리량 기록 (배치 방식별 epoch 시간/초당 토큰 수 비교용)
+            training_report = {
+                "mode": mode,
+                "batching": batching,
+                "max_tokens_per_batch": max_tokens_per_batch if batching == TOKEN_BUDGET else None,
+                "samples": num_samples,
+                "mean_length": round(sum(lengths) / len(lengths), 1),
+                "max_length": max(lengths),
+                **throughput.summary()
+            }
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, TRAINING_REPORT_FILE), "w", encoding="utf-8") as f:
+                json.dump(training_report, f, indent=2)
+            logger.info(f"Training throughput: {training_report['tokens_per_second']} tokens/s, "
+                        f"padding {training_report['padding_ratio']}, {training_report['train_seconds']}s")
+            
             # 라벨 매핑 저장
             id_to_label = {idx: label for label, idx in label_to_id.items()}
             os.makedirs(output_dir, exist_ok=True)
@@ -119,9 +271,104 @@ class TrainingService:
                     "id_to_label": id_to_label
                 }, f, indent=2, ensure_ascii=False)
             
+            if mode == ADAPTER:
+                # 어댑터 아티팩트 (수 MB, 서빙 시 기본 모델 위에 병합하므로 조기 종료 헤드/ONNX는 만들지 않음)
+                write_adapter_artifact(output_dir, init_model_path)
+                logger.info(f"Adapter training completed: {output_dir}")
+                return output_dir
+            
+            # 서빙 아티팩트로 정리 (safetensors 가중치 + 해시 매니페스트, Trainer 체크포인트 제거)
+            # 파생 산출물(조기 종료 헤드, ONNX)이 정리된 가중치의 모델 버전을 기록하도록 먼저 실행
+            write_artifact(output_dir)
+            
+            # 조기 종료 헤드 학습 (실패해도 학습 결과는 유지, 서빙은 전체 레이어로 동작)
+            if early_exit_layers:
+                report({"phase": "early_exit_heads"})
+                try:
+                    self.train_early_exit_heads(training_data, output_dir, early_exit_layers)
+                except Exception as e:
+                    logger.warning(f"Early-exit head training failed: {e}")
+            
+            # ONNX 그래프 내보내기 (ONNX 백엔드 서빙용, 실패해도 학습 결과는 유지)
+            if export_onnx:
+                report({"phase": "onnx_export"})
+                try:
+                    from app.models.inference_backend import export_onnx as export_onnx_model
+                    export_onnx_model(output_dir)
+                except Exception as e:
+                    logger.warning(f"ONNX export failed: {e}")
+            
             logger.info(f"Model training completed: {output_dir}")
             return output_dir
             
+        except TrainingCancelled:
+            logger.info("Training cancelled")
+            raise
         except Exception as e:
             logger.error(f"Training failed: {e}", exc_info=True)
             raise
+    
+    def train_early_exit_heads(self, training_data: List[Dict], model_dir: str,
+                               exit_layers: Sequence[int] = (3, 6, 9), epochs: int = 20,
+                               batch_size: int = 16, learning_rate: float = 1e-3) -> Dict:
+        """학습된 모델의 중간 레이어에 조기 종료 분류 헤드 학습
+        
+        백본은 고정하고 종료 레이어별 [CLS] 표현을 한 번만 계산한 뒤 헤드만 학습합니다.
+        """
+        from app.models.early_exit import build_exit_heads, collect_cls_states, save_exit_heads
+        
+        with open(f"{model_dir}/label_mapping.json", "r", encoding="utf-8") as f:
+            label_to_id = json.load(f)["label_to_id"]
+        samples = [item for item in training_data if item.get("label") in label_to_id]
+        if not samples:
+            raise ValueError("No training samples with known labels")
+        
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        num_layers = model.config.num_hidden_layers
+        exit_layers = sorted({layer for layer in exit_layers if 0 < layer < num_layers})
+        if not exit_layers:
+            raise ValueError(f"Exit layers must be between 1 and {num_layers - 1}")
+        logger.info(f"Training early-exit heads on layers {exit_layers} with {len(samples)} samples")
+        
+        # 배치별 동적 패딩으로 [CLS] 표현 수집
+        batches = []
+        for start in range(0, len(samples), batch_size):
+            batches.append(tokenizer(
+                [item["text"] for item in samples[start:start + batch_size]],
+                truncation=True,
+                padding="longest",
+                max_length=512,
+                return_tensors="pt"
+            ))
+        cls_states = collect_cls_states(model, batches, exit_layers)
+        labels = torch.tensor([label_to_id[item["label"]] for item in samples], dtype=torch.long)
+        
+        heads = build_exit_heads(model, exit_layers)
+        optimizer = torch.optim.AdamW(heads.parameters(), lr=learning_rate, weight_decay=0.01)
+        loss_fn = torch.nn.CrossEntropyLoss()
+        
+        heads.train()
+        for _ in range(epochs):
+            permutation = torch.randperm(len(labels))
+            for start in range(0, len(labels), batch_size):
+                indices = permutation[start:start + batch_size]
+                loss = sum(
+                    loss_fn(heads[str(layer)](cls_states[layer][indices]), labels[indices])
+                    for layer in exit_layers
+                )
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+        heads.eval()
+        
+        # 레이어별 학습 데이터 정확도 (임계값 선택 참고용)
+        metrics = {}
+        with torch.no_grad():
+            for layer in exit_layers:
+                predictions = heads[str(layer)](cls_states[layer]).argmax(dim=-1)
+                metrics[str(layer)] = {"train_accuracy": float((predictions == labels).float().mean())}
+        
+        save_exit_heads(model_dir, heads, exit_layers, metrics)
+        logger.info(f"Early-exit heads trained: {metrics}")
+        return metrics
@@ -24,10 +24,71 @@ class Settings:
     # 모델 설정
     FALLACY_MODEL_PATH: str = os.getenv("FALLACY_MODEL_PATH", "./models/fallacy_detector")
     DEFAULT_MODEL_NAME: str = os.getenv("DEFAULT_MODEL_NAME", "monologg/koelectra-base-v3-discriminator")  # 한국어 모델
+    MODEL_PRECISION: str = os.getenv("MODEL_PRECISION", "fp32").lower()  # fp32 / int8 (동적 양자화) / bf16
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "torch").lower()  # torch / onnx (ONNX Runtime)
+    ONNX_EXPORT_ON_TRAIN: bool = os.getenv("ONNX_EXPORT_ON_TRAIN", "true").lower() == "true"
+    MODEL_MMAP_WEIGHTS: bool = os.getenv("MODEL_MMAP_WEIGHTS", "true").lower() == "true"  # safetensors 가중치 읽기 전용 매핑 (torch 백엔드)
+    
+    # 조기 종료 설정 (중간 레이어 헤드 신뢰도가 임계값을 넘으면 남은 레이어 생략, torch 백엔드 전용)
+    EARLY_EXIT_THRESHOLD: float = float(os.getenv("EARLY_EXIT_THRESHOLD", "0"))  # 0이면 사용 안 함
+    EARLY_EXIT_LAYERS: str = os.getenv("EARLY_EXIT_LAYERS", "3,6,9")  # 재학습 시 헤드를 학습할 레이어 (비우면 학습 안 함)
+    
+    # 마이크로 배칭 설정 (동시 요청을 모아 한 번의 forward pass로 처리)
+    BATCHING_ENABLED: bool = os.getenv("BATCHING_ENABLED", "true").lower() == "true"
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "16"))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+    
+    # 동적 패딩 설정 (길이 버킷 경계, 버킷별 최대 배치 크기)
+    LENGTH_BUCKETS: str = os.getenv("LENGTH_BUCKETS", "32,64,128,256,512")
+    INFERENCE_MAX_BATCH_SIZE: int = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+    
+    # 추론 실행기 설정 (이벤트 루프와 분리된 스레드 풀, torch 스레드 수)
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "1"))
+    INFERENCE_MAX_PENDING: int = int(os.getenv("INFERENCE_MAX_PENDING", "64"))  # 초과 시 503 응답
+    TORCH_INTRA_OP_THREADS: int = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))  # 0이면 torch 기본값
+    TORCH_INTER_OP_THREADS: int = int(os.getenv("TORCH_INTER_OP_THREADS", "0"))
+    
+    # 주제 연관성 설정 (문장 임베딩 모델, 비우면 글자 bigram 겹침 사용)
+    TOPIC_RELEVANCE_MODEL: str = os.getenv("TOPIC_RELEVANCE_MODEL", "jhgan/ko-sroberta-multitask")
+    TOPIC_EMBEDDING_CACHE_SIZE: int = int(os.getenv("TOPIC_EMBEDDING_CACHE_SIZE", "1024"))
+    TOPIC_REGISTRY_MAX_TOPICS: int = int(os.getenv("TOPIC_REGISTRY_MAX_TOPICS", "10000"))  # 토픽 ID 등록 한도 (LRU)
+    
+    # 탐지 결과 캐시 설정 (프로세스 내 LRU, Redis URL 지정 시 워커 간 공유 계층)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESULT_CACHE_TTL_SECONDS: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+    RESULT_CACHE_REDIS_URL: str = os.getenv("RESULT_CACHE_REDIS_URL", "")
+    CHUNK_CACHE_MAX_ENTRIES: int = int(os.getenv("CHUNK_CACHE_MAX_ENTRIES", "20000"))  # 청크 확률 캐시 (0이면 사용 안 함)
+    
+    # 프로덕션 서빙 설정 (python -m app.server, 부모에서 모델 로드 후 워커 fork)
+    SERVING_WORKERS: int = int(os.getenv("SERVING_WORKERS", "2"))
+    SERVING_THREADS_PER_WORKER: int = int(os.getenv("SERVING_THREADS_PER_WORKER", "0"))  # 0이면 코어 수 / 워커 수
+    SERVING_PIN_CORES: bool = os.getenv("SERVING_PIN_CORES", "true").lower() == "true"
+    # 준비 상태(/ready): 모델 로드/워밍업에 실패해 폴백 모드로 서빙할 때도 준비 완료로 볼지 (false면 계속 503)
+    READINESS_REQUIRE_MODEL: bool = os.getenv("READINESS_REQUIRE_MODEL", "true").lower() == "true"
+    
+    # 모델 레지스트리 설정 (재학습 결과를 버전별 디렉토리에 저장, 무중단 교체/롤백)
+    MODEL_REGISTRY_DIR: str = os.getenv("MODEL_REGISTRY_DIR", "./models/registry")
+    MODEL_REGISTRY_KEEP_VERSIONS: int = int(os.getenv("MODEL_REGISTRY_KEEP_VERSIONS", "3"))  # 롤백용으로 보관할 최근 버전 수
+    MODEL_DRAIN_TIMEOUT_SECONDS: float = float(os.getenv("MODEL_DRAIN_TIMEOUT_SECONDS", "30"))  # 교체 후 이전 모델 요청 대기 시간
+    MODEL_WARMUP_FILE: str = os.getenv("MODEL_WARMUP_FILE", "")  # 워밍업 입력 JSON (비우면 내장 예시 사용)
     
     # 재학습 설정
     RETRAIN_THRESHOLD: int = int(os.getenv("RETRAIN_THRESHOLD", "100"))
     TRAINING_DATA_PATH: str = os.getenv("TRAINING_DATA_PATH", "./data/training")
+    TOKENIZED_CACHE_DIR: str = os.getenv("TOKENIZED_CACHE_DIR", "./data/tokenized_cache")  # 토크나이징 결과 Arrow 캐시 (비우면 사용 안 함)
+    
+    # 재학습 작업 설정 (별도 프로세스에서 지정한 코어에만 고정하여 실행, 서빙 코어 보호)
+    TRAINING_CPU_CORES: int = int(os.getenv("TRAINING_CPU_CORES", "0"))  # 0이면 사용 가능한 코어의 절반
+    TRAINING_NICE: int = int(os.getenv("TRAINING_NICE", "10"))  # 재학습 프로세스 우선순위 낮춤 (0이면 그대로)
+    TRAINING_MAX_QUEUED_JOBS: int = int(os.getenv("TRAINING_MAX_QUEUED_JOBS", "4"))  # 초과 시 409 응답
+    TRAINING_JOB_HISTORY: int = int(os.getenv("TRAINING_JOB_HISTORY", "20"))  # 보관할 끝난 작업 수
+    TRAINING_BATCHING: str = os.getenv("TRAINING_BATCHING", "length_grouped")  # padded / length_grouped / token_budget
+    TRAINING_MAX_TOKENS_PER_BATCH: int = int(os.getenv("TRAINING_MAX_TOKENS_PER_BATCH", "8192"))  # token_budget 배치당 토큰 상한
+    TRAINING_MODE: str = os.getenv("TRAINING_MODE", "full")  # full / warm_start (서빙 중인 체크포인트에서 이어서) / adapter (LoRA, peft 필요)
+    LORA_RANK: int = int(os.getenv("LORA_RANK", "8"))
+    LORA_TARGET_MODULES: str = os.getenv("LORA_TARGET_MODULES", "query,value")  # 어댑터를 붙일 Linear 모듈 이름 (쉼표 구분)
     
     # 번역 설정
     TRANSLATION_ENABLED: bool = os.getenv("TRANSLATION_ENABLED", "true").lower() == "true"
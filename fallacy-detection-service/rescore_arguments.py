@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+논증 아카이브 일괄 재점수화 스크립트 (재학습 후 실행)
+- JSONL/CSV 내보내기 파일을 한 행씩 읽어 워커 프로세스에 블록 단위로 분산
+- 워커마다 FallacyDetector 길이 버킷별 배치 추론
+- 결과를 입력 순서대로 JSONL에 증분 저장, 체크포인트로 중단 지점부터 재개
+- 진행률과 처리량(행/s) 주기적 출력
+
+사용법:
+    python rescore_arguments.py --input ./data/arguments_export.jsonl \\
+        --output ./data/arguments_scores.jsonl --workers 4
+
+    # CSV 내보내기 (컬럼 이름 지정)
+    python rescore_arguments.py --input ./data/arguments.csv --output ./data/scores.jsonl \\
+        --text-field content --id-field argument_id
+
+    # 같은 명령을 다시 실행하면 체크포인트(<output>.checkpoint.json) 이후부터 이어서 처리
+    # 처음부터 다시 하려면 --restart
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.rescoring_service import RescoringService
+from config.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="논증 아카이브 일괄 재점수화")
+    parser.add_argument("--input", required=True, help="논증 내보내기 파일 (.jsonl 또는 .csv)")
+    parser.add_argument("--output", required=True, help="결과 JSONL 경로")
+    parser.add_argument("--model-path", default=settings.FALLACY_MODEL_PATH, help="학습된 모델 경로")
+    parser.add_argument("--workers", type=int, default=2, help="워커 프로세스 수")
+    parser.add_argument("--threads-per-worker", type=int, default=0, help="워커별 추론 스레드 수 (0이면 코어 수 / 워커 수)")
+    parser.add_argument("--block-size", type=int, default=256, help="워커에 한 번에 넘기는 행 수")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--title-field", default="topic_title")
+    parser.add_argument("--description-field", default="topic_description")
+    parser.add_argument("--no-relevance", action="store_true", help="주제 연관성 임베딩 모델을 로드하지 않음 (bigram 겹침 사용)")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="진행률 출력 간격 (초)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 다시 처리")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    detector_options = {
+        "length_buckets": [int(b) for b in settings.LENGTH_BUCKETS.split(",") if b.strip()],
+        "max_batch_size": settings.INFERENCE_MAX_BATCH_SIZE,
+        "precision": settings.MODEL_PRECISION,
+        "backend": settings.INFERENCE_BACKEND,
+        "chunk_cache_size": 0,  # 아카이브는 같은 청크가 반복되지 않으므로 청크 캐시 사용 안 함
+        "early_exit_threshold": settings.EARLY_EXIT_THRESHOLD,
+        "relevance_model": None if args.no_relevance else (settings.TOPIC_RELEVANCE_MODEL or None),
+        "relevance_cache_size": settings.TOPIC_EMBEDDING_CACHE_SIZE,
+        "mmap_weights": settings.MODEL_MMAP_WEIGHTS
+    }
+
+    service = RescoringService(
+        model_path=args.model_path,
+        detector_options=detector_options,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        block_size=args.block_size,
+        progress_interval=args.progress_interval
+    )
+    summary = service.rescore(
+        args.input,
+        args.output,
+        resume=not args.restart,
+        text_field=args.text_field,
+        id_field=args.id_field,
+        title_field=args.title_field,
+        description_field=args.description_field
+    )
+
+    print("=" * 60)
+    print(f"이번 실행에서 처리: {summary['rows_scored']}행 (누적 {summary['rows_total']}행)")
+    if summary["rows_failed_total"]:
+        print(f"추론 실패: {summary['rows_failed']}행 (누적 {summary['rows_failed_total']}행, 결과에 error 필드로 기록)")
+    print(f"소요 시간: {summary['elapsed_seconds']:.1f}s, 처리량: {summary['rows_per_second']:.1f}행/s")
+    print(f"결과: {summary['output']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
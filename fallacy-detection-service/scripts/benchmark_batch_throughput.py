@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+일괄 탐지 처리량 측정 스크립트
+- /detect/batch 경로(FallacyDetector.predict_batch)의 처리량을 배치 크기별로 측정
+- 비교 기준: 항목마다 predict를 호출하는 기존 방식
+
+사용법:
+    python scripts/benchmark_batch_throughput.py --model-path ./models/fallacy_detector --batch-sizes 1,4,8,16,32,64
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.fallacy_detector import FallacyDetector
+
+TOPIC = ("가난과 사회복지", "가난한 사람들을 위한 사회복지 정책에 대한 토론")
+
+SENTENCES = [
+    "복지 정책은 장기적으로 사회 안정에 기여할 수 있다.",
+    "하지만 재정 부담을 고려하지 않은 확대는 위험하다.",
+    "여러 국가의 사례에서 조기 개입 프로그램의 효과가 입증되었다.",
+    "반대 측은 근거 없이 감정에 호소하고 있다.",
+    "모두가 찬성하니 이 정책은 옳다.",
+    "통계에 따르면 교육 기회의 차이가 소득 격차로 이어진다.",
+]
+
+
+def make_texts(count: int):
+    return [" ".join(random.choices(SENTENCES, k=random.randint(1, 8))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 크기별 일괄 탐지 처리량 측정")
+    parser.add_argument("--model-path", default=None, help="학습된 모델 경로 (없으면 기본 모델)")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16,32,64", help="측정할 배치 크기 (쉼표 구분)")
+    parser.add_argument("--items", type=int, default=128, help="배치 크기별 총 항목 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    detector = FallacyDetector(model_path=args.model_path)
+    if detector.model is None:
+        print("❌ 모델을 로드할 수 없습니다")
+        return
+
+    texts = make_texts(args.items)
+    topics = [TOPIC] * len(texts)
+
+    # 워밍업
+    detector.predict_batch(texts[:8], topics[:8])
+
+    begin = time.perf_counter()
+    for text, (title, description) in zip(texts, topics):
+        detector.predict(text, title, description)
+    loop_throughput = len(texts) / (time.perf_counter() - begin)
+
+    print("=" * 60)
+    print(f"{'배치 크기':>10}{'처리량(건/s)':>16}{'배치 지연(ms)':>16}{'기존 대비':>12}")
+    print("-" * 60)
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        latencies = []
+        begin = time.perf_counter()
+        for start in range(0, len(texts), batch_size):
+            batch_begin = time.perf_counter()
+            detector.predict_batch(texts[start:start + batch_size], topics[start:start + batch_size])
+            latencies.append((time.perf_counter() - batch_begin) * 1000)
+        throughput = len(texts) / (time.perf_counter() - begin)
+        print(f"{batch_size:>10}{throughput:>16.1f}{sum(latencies) / len(latencies):>16.1f}{throughput / loop_throughput:>11.2f}x")
+    print("-" * 60)
+    print(f"기존 방식(항목별 predict 호출): {loop_throughput:.1f}건/s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
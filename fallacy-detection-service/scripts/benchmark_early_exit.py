@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+조기 종료 임계값별 지연 시간/정확도 벤치마크
+- 전체 레이어 추론 대비 라벨 일치율
+- 라벨이 있는 경우 정확도
+- 샘플당 평균 지연 시간과 종료 레이어 분포
+
+사용법:
+    python scripts/benchmark_early_exit.py --model-path ./models/fallacy_detector \\
+        --data ./data/korean_training/heldout.json --thresholds 0.8,0.9,0.95,0.99
+
+    # 헤드가 없으면 학습 데이터로 먼저 학습
+    python scripts/benchmark_early_exit.py --model-path ./models/fallacy_detector \\
+        --data ./data/korean_training/heldout.json --train-data ./data/korean_training/train.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.models.fallacy_detector import FallacyDetector
+
+
+def run(detector: FallacyDetector, texts, batch_size: int):
+    """배치 단위 예측 라벨, 종료 레이어, 샘플당 평균 지연 시간(ms)"""
+    labels = []
+    exit_layers = []
+    begin = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        probabilities, layers = detector.predict_proba(texts[start:start + batch_size], return_exit_layers=True)
+        labels.extend(detector.id_to_label.get(int(i), "no_fallacy") for i in np.argmax(probabilities, axis=1))
+        if layers is not None:
+            exit_layers.extend(int(layer) for layer in layers)
+    return labels, exit_layers, (time.perf_counter() - begin) * 1000 / max(1, len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조기 종료 임계값별 지연 시간/정확도 비교")
+    parser.add_argument("--model-path", required=True, help="학습된 모델 경로")
+    parser.add_argument("--data", required=True, help='held-out 데이터 JSON ([{"text": ..., "label": ...}])')
+    parser.add_argument("--thresholds", default="0.8,0.9,0.95,0.99", help="비교할 신뢰도 임계값 목록")
+    parser.add_argument("--train-data", default=None, help="조기 종료 헤드 학습 데이터 JSON (지정 시 먼저 학습)")
+    parser.add_argument("--exit-layers", default="3,6,9", help="헤드를 학습할 레이어 목록")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.train_data:
+        from app.services.training_service import TrainingService
+        with open(args.train_data, "r", encoding="utf-8") as f:
+            training_data = json.load(f)
+        exit_layers = [int(layer) for layer in args.exit_layers.split(",") if layer.strip()]
+        TrainingService().train_early_exit_heads(training_data, args.model_path, exit_layers)
+
+    with open(args.data, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+    texts = [sample["text"] for sample in samples]
+    gold = [sample.get("label") for sample in samples]
+    has_gold = all(label is not None for label in gold)
+
+    thresholds = [float(t) for t in args.thresholds.split(",") if t.strip()]
+    detector = FallacyDetector(model_path=args.model_path, early_exit_threshold=max(thresholds))
+    if detector.model is None:
+        print("❌ 모델을 로드할 수 없습니다")
+        return
+    if detector.early_exit_threshold == 0:
+        print("❌ 조기 종료 헤드를 로드할 수 없습니다 (--train-data로 먼저 학습하세요)")
+        return
+    backend = detector.backend
+
+    # 워밍업 후 기준 (전체 레이어) 측정
+    detector.predict_proba(texts[:args.batch_size])
+    backend.early_exit_threshold = 1.01  # 어떤 헤드도 종료하지 않음
+    baseline_labels, _, baseline_latency = run(detector, texts, args.batch_size)
+
+    print("=" * 72)
+    print(f"샘플 수: {len(texts)}, 전체 레이어 지연 시간: {baseline_latency:.1f}ms/샘플")
+    if has_gold:
+        accuracy = sum(a == b for a, b in zip(baseline_labels, gold)) / max(1, len(texts))
+        print(f"전체 레이어 정확도: {accuracy:.2%}")
+    print("-" * 72)
+    print(f"{'임계값':>8} {'지연(ms)':>10} {'속도 향상':>10} {'일치율':>8} {'정확도':>8}  종료 레이어 분포")
+
+    for threshold in thresholds:
+        backend.early_exit_threshold = threshold
+        labels, exit_layers, latency = run(detector, texts, args.batch_size)
+        agreement = sum(a == b for a, b in zip(baseline_labels, labels)) / max(1, len(texts))
+        accuracy = sum(a == b for a, b in zip(labels, gold)) / max(1, len(texts)) if has_gold else None
+        distribution = ", ".join(
+            f"L{layer}: {count / len(exit_layers):.0%}" for layer, count in sorted(Counter(exit_layers).items())
+        )
+        print(f"{threshold:>8.2f} {latency:>10.1f} {baseline_latency / max(latency, 1e-6):>9.2f}x "
+              f"{agreement:>8.2%} {(f'{accuracy:.2%}' if accuracy is not None else '-'):>8}  {distribution}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
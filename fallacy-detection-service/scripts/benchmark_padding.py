@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+추론 패딩 방식 지연 시간 비교 스크립트
+- before: 모든 입력을 512 토큰까지 패딩 (padding="max_length")
+- after: 길이 버킷별 배치 + 배치 내 최장 길이까지만 패딩 (FallacyDetector.predict_proba)
+- 길이 분포: 짧은 논증 위주 / 실제 토론 논증 분포 / 긴 꼬리 분포
+
+사용법:
+    python scripts/benchmark_padding.py --model-path ./models/fallacy_detector --samples 64 --batch-size 16
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from app.models.fallacy_detector import FallacyDetector
+
+SENTENCES = [
+    "복지 정책은 장기적으로 사회 안정에 기여할 수 있다.",
+    "하지만 재정 부담을 고려하지 않은 확대는 위험하다.",
+    "여러 국가의 사례에서 조기 개입 프로그램의 효과가 입증되었다.",
+    "따라서 단계적인 도입이 필요하다고 생각한다.",
+    "반대 측은 근거 없이 감정에 호소하고 있다.",
+    "통계에 따르면 교육 기회의 차이가 소득 격차로 이어진다.",
+    "그러므로 교육 투자가 가장 효과적인 해결책이다.",
+]
+
+# (이름, 토큰 길이 샘플러)
+DISTRIBUTIONS = {
+    "short (20-60)": lambda: random.randint(20, 60),
+    "debate (30-150)": lambda: min(510, max(30, int(random.lognormvariate(4.3, 0.5)))),
+    "long-tail (30-500)": lambda: random.choice([random.randint(30, 150)] * 4 + [random.randint(300, 500)]),
+}
+
+
+def make_text(detector: FallacyDetector, target_tokens: int) -> str:
+    """목표 토큰 수에 가까운 텍스트 생성"""
+    parts: List[str] = []
+    while len(detector.tokenizer(" ".join(parts))["input_ids"]) < target_tokens:
+        parts.append(random.choice(SENTENCES))
+    return " ".join(parts)
+
+
+def run_max_length(detector: FallacyDetector, texts: List[str]):
+    """기존 방식: 512 토큰 고정 패딩"""
+    inputs = detector.tokenizer(texts, return_tensors="pt", truncation=True, padding="max_length", max_length=512)
+    with torch.no_grad():
+        detector.model(**inputs)
+
+
+def run_dynamic(detector: FallacyDetector, texts: List[str]):
+    """새 방식: 길이 버킷 + 동적 패딩"""
+    detector.predict_proba(texts)
+
+
+def measure(fn, detector: FallacyDetector, texts: List[str], batch_size: int, repeats: int) -> List[float]:
+    latencies = []
+    for _ in range(repeats):
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            begin = time.perf_counter()
+            fn(detector, batch)
+            latencies.append((time.perf_counter() - begin) * 1000 / len(batch))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="패딩 방식별 추론 지연 시간 비교")
+    parser.add_argument("--model-path", default=None, help="학습된 모델 경로 (없으면 기본 모델)")
+    parser.add_argument("--samples", type=int, default=64, help="분포별 샘플 수")
+    parser.add_argument("--batch-size", type=int, default=16, help="요청 배치 크기")
+    parser.add_argument("--repeats", type=int, default=3, help="반복 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    detector = FallacyDetector(model_path=args.model_path, max_batch_size=args.batch_size)
+    if detector.model is None:
+        print("❌ 모델을 로드할 수 없습니다")
+        return
+
+    print("=" * 78)
+    print(f"{'분포':<22}{'평균 토큰':>10}{'before p50':>12}{'after p50':>12}{'before p95':>12}{'after p95':>12}")
+    print("-" * 78)
+
+    for name, sampler in DISTRIBUTIONS.items():
+        texts = [make_text(detector, sampler()) for _ in range(args.samples)]
+        avg_tokens = statistics.mean(len(detector.tokenizer(t)["input_ids"]) for t in texts)
+
+        # 워밍업
+        run_dynamic(detector, texts[:args.batch_size])
+        run_max_length(detector, texts[:args.batch_size])
+
+        before = sorted(measure(run_max_length, detector, texts, args.batch_size, args.repeats))
+        after = sorted(measure(run_dynamic, detector, texts, args.batch_size, args.repeats))
+
+        def pct(values, q):
+            return values[min(len(values) - 1, int(len(values) * q))]
+
+        print(f"{name:<22}{avg_tokens:>10.1f}"
+              f"{pct(before, 0.5):>10.1f}ms{pct(after, 0.5):>10.1f}ms"
+              f"{pct(before, 0.95):>10.1f}ms{pct(after, 0.95):>10.1f}ms")
+
+    print("=" * 78)
+    print("※ 값은 샘플당 평균 지연 시간(ms)입니다.")
+
+
+if __name__ == "__main__":
+    main()
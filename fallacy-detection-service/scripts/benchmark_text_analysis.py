@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+텍스트 분석 마이크로벤치마크 (약 5000자 입력)
+- 이전 방식: 청크용 단락/문장 분할 + 논리 구조용 문장 재분할 + 문장 × 연결어 중첩 루프
+- 단일 스캔: TextAnalyzer 한 번으로 문장 구간, 단락 경계, 연결어 위치 추출
+
+모델/토크나이저 없이 실행됩니다.
+
+사용법:
+    python scripts/benchmark_text_analysis.py
+    python scripts/benchmark_text_analysis.py --chars 5000 --repeat 500
+"""
+
+import os
+import re
+import sys
+import timeit
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.text_analyzer import TextAnalyzer
+
+SENTENCES = [
+    "모든 전문가가 동의하므로 이 정책은 옳다",
+    "그러나 반대 의견을 가진 사람들의 근거도 살펴볼 필요가 있다",
+    "따라서 우리는 이 문제를 신중하게 검토해야 한다",
+    "또한 비용 문제도 함께 고려해야 한다",
+    "하지만 이 주장은 통계적으로 뒷받침되지 않는다",
+    "그리고 지난 10년간의 자료를 보면 추세가 분명하다",
+    "결론적으로 제안된 방안은 재검토가 필요하다",
+    "반면 일부 지역에서는 긍정적인 효과가 관찰되었다",
+    "요약하면 장단점이 모두 존재한다",
+    "그런데 이 사례가 전체를 대표한다고 볼 수 있을까",
+]
+ENDINGS = [".", ".", ".", "?", "!"]
+
+
+def make_text(chars: int, seed: int = 0) -> str:
+    """연결어와 빈 줄 단락이 섞인 지정 길이의 한국어 논증"""
+    rng = random.Random(seed)
+    paragraphs = []
+    total = 0
+    while total < chars:
+        paragraph = " ".join(rng.choice(SENTENCES) + rng.choice(ENDINGS) for _ in range(rng.randint(3, 8)))
+        paragraphs.append(paragraph)
+        total += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:chars]
+
+
+# ----- 이전 구현 (비교용 사본) -----
+
+LEGACY_SENTENCE_END = re.compile(r'[.!?。！？]\s*')
+LEGACY_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+LEGACY_CONNECTORS = ['따라서', '그러므로', '그런데', '하지만', '그러나', '또한', '또', '그리고', '또한', '또한',
+                     '그러나', '하지만', '반면', '그러므로', '따라서', '결론적으로', '요약하면']
+
+
+def legacy_paragraph_spans(text):
+    spans = []
+    position = 0
+    for match in LEGACY_PARAGRAPH_BREAK.finditer(text):
+        if text[position:match.start()].strip():
+            spans.append((position, match.start()))
+        position = match.end()
+    if text[position:].strip():
+        spans.append((position, len(text)))
+    return spans
+
+
+def legacy_sentence_spans(text):
+    spans = []
+
+    def append_span(start, body_end, span_end):
+        while start < body_end and text[start].isspace():
+            start += 1
+        while body_end > start and text[body_end - 1].isspace():
+            body_end -= 1
+        if body_end - start > 1:
+            spans.append((start, max(span_end, body_end)))
+
+    position = 0
+    for match in LEGACY_SENTENCE_END.finditer(text):
+        append_span(position, match.start(), match.start() + 1)
+        position = match.end()
+    append_span(position, len(text), len(text))
+    return spans
+
+
+def legacy_chunk_sentences(text):
+    """청크 분할용 단락별 문장 구간"""
+    chunk_sentences = []
+    for paragraph_start, paragraph_end in legacy_paragraph_spans(text):
+        chunk_sentences.append([
+            (start + paragraph_start, end + paragraph_start)
+            for start, end in legacy_sentence_spans(text[paragraph_start:paragraph_end])
+        ])
+    return chunk_sentences
+
+
+def legacy_structure(text):
+    """논리 구조 분석 (문장 재분할 + 문장 × 연결어 중첩 루프)"""
+    sentences = [s.strip() for s in re.split(r'[.!?。！？]\s*', text) if s.strip() and len(s.strip()) > 1]
+    sentences = sentences or [text]
+    paragraphs = text.split('\n\n')
+    connector_count = sum(1 for s in sentences for connector in LEGACY_CONNECTORS if connector in s)
+    return {
+        'sentence_count': len(sentences),
+        'paragraph_count': len([p for p in paragraphs if p.strip()]),
+        'logical_connector_count': connector_count,
+        'avg_sentence_length': sum(len(s) for s in sentences) / len(sentences),
+        'text_length': len(text)
+    }
+
+
+def legacy_analyze(text):
+    return legacy_chunk_sentences(text), legacy_structure(text)
+
+
+def single_pass_analyze(analyzer: TextAnalyzer, text: str):
+    analysis = analyzer.analyze(text)
+    return analysis.sentences_by_paragraph(), analysis.logical_structure()
+
+
+def measure(fn, repeat: int, rounds: int = 5) -> float:
+    """호출당 시간 (마이크로초, 여러 라운드 중 최솟값으로 잡음 제거)"""
+    fn()  # 워밍업
+    return min(timeit.repeat(fn, number=repeat, repeat=rounds)) * 1e6 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단일 스캔 텍스트 분석 마이크로벤치마크")
+    parser.add_argument("--chars", type=int, default=5000, help="입력 길이 (글자 수)")
+    parser.add_argument("--repeat", type=int, default=200, help="라운드당 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    text = make_text(args.chars, args.seed)
+    analyzer = TextAnalyzer()
+
+    legacy_chunks, legacy_structure_result = legacy_analyze(text)
+    chunks, structure = single_pass_analyze(analyzer, text)
+
+    scenarios = [
+        ("긴 논증 (청크 분할 + 논리 구조)",
+         lambda: legacy_analyze(text), lambda: single_pass_analyze(analyzer, text)),
+        ("짧은 논증 (논리 구조만)",
+         lambda: legacy_structure(text), lambda: analyzer.analyze(text).logical_structure()),
+    ]
+
+    print("=" * 72)
+    print(f"입력 길이: {len(text)}자, 반복: {args.repeat}회")
+    print(f"청크용 문장 구간 일치: {'예' if legacy_chunks == chunks else '아니오'}")
+    print("-" * 72)
+    print(f"{'항목':<24} {'이전 방식':>14} {'단일 스캔':>14}")
+    for key in ('sentence_count', 'paragraph_count', 'logical_connector_count', 'avg_sentence_length'):
+        print(f"{key:<24} {legacy_structure_result[key]:>14.1f} {structure[key]:>14.1f}")
+    print("-" * 72)
+    print(f"{'시나리오':<28} {'이전(us)':>10} {'단일 스캔(us)':>14} {'속도 향상':>10}")
+    for name, legacy_fn, single_fn in scenarios:
+        legacy_us = measure(legacy_fn, args.repeat)
+        single_us = measure(single_fn, args.repeat)
+        print(f"{name:<28} {legacy_us:>10.1f} {single_us:>14.1f} {legacy_us / max(single_us, 1e-9):>9.2f}x")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+학습 배치 구성 방식별 처리량 비교 스크립트
+- padded: 모든 샘플을 512 토큰까지 패딩, 배치 16 (기존 방식)
+- length_grouped: 길이가 비슷한 샘플끼리 배치 + 배치 내 최장 길이까지만 패딩
+- token_budget: 길이 그룹 + 배치당 토큰 수 상한으로 배치 크기 결정
+- 같은 데이터/같은 샘플 수로 방식마다 학습하고 training_report.json의 epoch 시간과 초당 토큰 수를 비교
+
+사용법:
+    python scripts/benchmark_training_batching.py --data ./data/korean_training/korean_training_data.json --samples 200
+    python scripts/benchmark_training_batching.py --modes padded,token_budget --max-tokens 4096
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.training_batching import BATCHING_MODES, PADDED, TRAINING_REPORT_FILE
+from app.services.training_service import TrainingService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 배치 구성 방식별 epoch 시간/초당 토큰 수 비교")
+    parser.add_argument("--data", default="./data/korean_training/korean_training_data.json", help="학습 데이터 JSON")
+    parser.add_argument("--samples", type=int, default=200, help="사용할 샘플 수 (0이면 전체)")
+    parser.add_argument("--modes", default=",".join(BATCHING_MODES), help="비교할 방식 (쉼표 구분)")
+    parser.add_argument("--max-tokens", type=int, default=8192, help="token_budget 배치당 토큰 상한")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with open(args.data, "r", encoding="utf-8") as f:
+        training_data = json.load(f)
+    random.seed(args.seed)
+    if args.samples and len(training_data) > args.samples:
+        training_data = random.sample(training_data, args.samples)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+
+    reports = {}
+    for mode in modes:
+        output_dir = tempfile.mkdtemp(prefix=f"batching-{mode}-")
+        try:
+            print(f"▶ {mode} 학습 중 ({len(training_data)}개 샘플)...")
+            TrainingService().train_model(
+                training_data,
+                output_dir=output_dir,
+                export_onnx=False,
+                batching=mode,
+                max_tokens_per_batch=args.max_tokens
+            )
+            with open(os.path.join(output_dir, TRAINING_REPORT_FILE), "r", encoding="utf-8") as f:
+                reports[mode] = json.load(f)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    baseline = reports.get(PADDED)
+    print("=" * 92)
+    print(f"{'방식':<16}{'steps':>7}{'epoch(s)':>10}{'학습(s)':>10}{'tokens/s':>11}"
+          f"{'padded tok/s':>14}{'패딩 비율':>11}{'속도 향상':>11}")
+    print("-" * 92)
+    for mode, report in reports.items():
+        first_epoch = report["epochs"][0]["seconds"] if report["epochs"] else float("nan")
+        speedup = baseline["train_seconds"] / report["train_seconds"] if baseline and report["train_seconds"] else None
+        print(f"{mode:<16}{report['steps']:>7}{first_epoch:>10.1f}{report['train_seconds']:>10.1f}"
+              f"{report['tokens_per_second'] or 0:>11.1f}{report['padded_tokens_per_second'] or 0:>14.1f}"
+              f"{report['padding_ratio'] or 0:>11.1%}{f'{speedup:.2f}x' if speedup else '-':>11}")
+    print("=" * 92)
+    if reports:
+        report = next(iter(reports.values()))
+        print(f"※ 평균 토큰 길이 {report['mean_length']}, 최대 {report['max_length']} / "
+              f"tokens/s는 패딩을 제외한 실제 토큰 기준이며 속도 향상은 padded 대비 전체 학습 시간입니다.")
+
+
+if __name__ == "__main__":
+    main()
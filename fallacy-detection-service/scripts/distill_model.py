@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+지식 증류 스크립트
+- 파인튜닝된 모델(교사)의 소프트 라벨로 작은 학생 모델 학습
+- 라벨 데이터 + 라벨 없는 논증 텍스트 사용
+- 교사 대비 정확도/라벨 일치율/지연 시간 리포트 생성 (학생 디렉토리의 distillation_report.json)
+
+사용법:
+    python scripts/distill_model.py --teacher ./models/fallacy_detector \\
+        --labeled ./data/korean_training/train.json --unlabeled ./data/arguments.json \\
+        --eval ./data/korean_training/heldout.json --output ./models/fallacy_detector_student
+
+    # 교사 레이어 4개를 복사한 축소 모델을 학생으로 사용
+    python scripts/distill_model.py --teacher ./models/fallacy_detector --labeled ./data/train.json \\
+        --eval ./data/heldout.json --student-layers 4
+"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.distillation_service import DistillationService, DEFAULT_STUDENT_MODEL
+
+
+def load_texts(path: str):
+    """라벨 없는 논증 텍스트 (문자열 목록 또는 [{"text": ...}])"""
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    return [item["text"] if isinstance(item, dict) else item for item in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="교사 모델을 작은 학생 모델로 증류")
+    parser.add_argument("--teacher", default="./models/fallacy_detector", help="교사 모델 경로")
+    parser.add_argument("--labeled", required=True, help='라벨 데이터 JSON ([{"text": ..., "label": ...}])')
+    parser.add_argument("--unlabeled", default=None, help="라벨 없는 논증 텍스트 JSON")
+    parser.add_argument("--eval", default=None, help="리포트용 held-out 데이터 JSON")
+    parser.add_argument("--output", default="./models/fallacy_detector_student", help="학생 모델 저장 경로")
+    parser.add_argument("--student-model", default=DEFAULT_STUDENT_MODEL, help="사전학습된 작은 학생 모델")
+    parser.add_argument("--student-layers", type=int, default=None, help="지정 시 교사 레이어 일부를 복사한 축소 모델 사용")
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.5, help="정답 라벨 손실 비중 (나머지는 교사 분포 손실)")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    with open(args.labeled, "r", encoding="utf-8") as f:
+        labeled_data = json.load(f)
+    unlabeled_texts = load_texts(args.unlabeled) if args.unlabeled else []
+
+    service = DistillationService(teacher_dir=args.teacher)
+    output_dir = service.distill(
+        labeled_data,
+        unlabeled_texts,
+        output_dir=args.output,
+        student_model=args.student_model,
+        student_layers=args.student_layers,
+        temperature=args.temperature,
+        alpha=args.alpha,
+        num_epochs=args.epochs,
+        batch_size=args.batch_size
+    )
+    print(f"✅ 학생 모델 저장: {output_dir}")
+
+    if not args.eval:
+        return
+    with open(args.eval, "r", encoding="utf-8") as f:
+        eval_data = json.load(f)
+    report = service.evaluate(output_dir, eval_data, batch_size=args.batch_size)
+
+    print("=" * 60)
+    print(f"샘플 수: {report['samples']}")
+    for role in ("teacher", "student"):
+        stats = report[role]
+        accuracy = f", 정확도 {stats['accuracy']:.2%}" if "accuracy" in stats else ""
+        print(f"{role:>8}: {stats['latency_ms_per_sample']:.1f}ms/샘플, 파라미터 {stats['parameters'] / 1e6:.1f}M{accuracy}")
+    print(f"라벨 일치율: {report['agreement']:.2%}")
+    print(f"속도 향상: {report['speedup']:.2f}x (파라미터 비율 {report['parameter_ratio']:.0%})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+추론 정밀도 모드 평가 스크립트
+- fp32 모델과 int8/bf16 모델의 라벨 일치율 (held-out 데이터)
+- 라벨이 있는 경우 각 모드의 정확도
+- 샘플당 평균 지연 시간과 모델 크기
+
+사용법:
+    python scripts/evaluate_precision.py --model-path ./models/fallacy_detector \\
+        --data ./data/korean_training/heldout.json --precision int8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from app.models.fallacy_detector import FallacyDetector
+from app.models.quantization import model_size_bytes
+
+
+def predict_labels(detector: FallacyDetector, texts, batch_size: int):
+    """배치 단위 예측 라벨과 샘플당 평균 지연 시간(ms)"""
+    labels = []
+    begin = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        probabilities = detector.predict_proba(texts[start:start + batch_size])
+        labels.extend(detector.id_to_label.get(int(i), "no_fallacy") for i in np.argmax(probabilities, axis=1))
+    return labels, (time.perf_counter() - begin) * 1000 / max(1, len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정밀도 모드별 라벨 일치율/지연 시간/모델 크기 비교")
+    parser.add_argument("--model-path", required=True, help="학습된 모델 경로")
+    parser.add_argument("--data", required=True, help='held-out 데이터 JSON ([{"text": ..., "label": ...}])')
+    parser.add_argument("--precision", default="int8", choices=["int8", "bf16"])
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    with open(args.data, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+    texts = [sample["text"] for sample in samples]
+    gold = [sample.get("label") for sample in samples]
+
+    baseline = FallacyDetector(model_path=args.model_path, precision="fp32")
+    candidate = FallacyDetector(model_path=args.model_path, precision=args.precision)
+    if baseline.model is None or candidate.model is None:
+        print("❌ 모델을 로드할 수 없습니다")
+        return
+    if candidate.precision != args.precision:
+        print(f"⚠️ {args.precision} 모드를 사용할 수 없어 {candidate.precision}로 실행되었습니다")
+
+    # 워밍업
+    baseline.predict_proba(texts[:args.batch_size])
+    candidate.predict_proba(texts[:args.batch_size])
+
+    baseline_labels, baseline_latency = predict_labels(baseline, texts, args.batch_size)
+    candidate_labels, candidate_latency = predict_labels(candidate, texts, args.batch_size)
+
+    agreement = sum(a == b for a, b in zip(baseline_labels, candidate_labels)) / max(1, len(texts))
+
+    print("=" * 60)
+    print(f"샘플 수: {len(texts)}")
+    print(f"라벨 일치율 (fp32 vs {candidate.precision}): {agreement:.2%}")
+    if all(label is not None for label in gold):
+        for name, labels in (("fp32", baseline_labels), (candidate.precision, candidate_labels)):
+            accuracy = sum(a == b for a, b in zip(labels, gold)) / max(1, len(texts))
+            print(f"정확도 ({name}): {accuracy:.2%}")
+    print(f"지연 시간 (샘플당): fp32 {baseline_latency:.1f}ms / {candidate.precision} {candidate_latency:.1f}ms "
+          f"({baseline_latency / max(candidate_latency, 1e-6):.2f}x)")
+    baseline_size = model_size_bytes(baseline.model)
+    candidate_size = model_size_bytes(candidate.model)
+    print(f"모델 크기: fp32 {baseline_size / 2**20:.1f}MB / {candidate.precision} {candidate_size / 2**20:.1f}MB "
+          f"({candidate_size / baseline_size:.0%})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+서빙용 모델 아티팩트 내보내기/검증 스크립트
+- 학습 결과 디렉토리를 safetensors 가중치 + 토크나이저 + label_mapping.json + 해시 매니페스트(artifact.json)로 정리
+- pytorch_model.bin만 있는 기존 모델은 safetensors로 변환
+- --verify: 매니페스트의 파일 크기/sha256 확인
+- --compare-load: from_pretrained 로드와 읽기 전용 매핑 로드의 시간/상주 메모리 비교
+
+사용법:
+    # 다른 디렉토리로 내보내기 (원본 유지)
+    python scripts/export_model_artifact.py --model-dir ./models/fallacy_detector --output ./models/fallacy_detector_artifact
+
+    # 제자리 정리 (Trainer 체크포인트/옵티마이저 상태 삭제)
+    python scripts/export_model_artifact.py --model-dir ./models/fallacy_detector
+
+    python scripts/export_model_artifact.py --model-dir ./models/fallacy_detector_artifact --verify --compare-load
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.model_artifact import load_mmap_model, read_manifest, verify_artifact, write_artifact
+
+
+def rss_mb() -> float:
+    """현재 상주 메모리 (MB, Linux)"""
+    with open("/proc/self/statm", "r") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def measure_load(name: str, load):
+    """로드 시간과 로드 직후/첫 추론 후 상주 메모리 증가량 (매핑 로드의 RSS는 프로세스 간 공유되는 파일 페이지)"""
+    import torch
+
+    before = rss_mb()
+    started = time.perf_counter()
+    model = load()
+    model.eval()
+    load_seconds = time.perf_counter() - started
+    loaded = rss_mb()
+    with torch.no_grad():
+        model(input_ids=torch.ones((1, 16), dtype=torch.long), attention_mask=torch.ones((1, 16), dtype=torch.long))
+    print(f"{name:<16} load {load_seconds:6.2f}s | RSS +{loaded - before:7.1f}MB after load, "
+          f"+{rss_mb() - before:7.1f}MB after first inference")
+    del model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서빙용 모델 아티팩트 내보내기/검증")
+    parser.add_argument("--model-dir", required=True, help="학습된 모델 디렉토리")
+    parser.add_argument("--output", default=None, help="아티팩트를 쓸 디렉토리 (생략하면 제자리 정리)")
+    parser.add_argument("--verify", action="store_true", help="내보내지 않고 매니페스트 해시만 확인")
+    parser.add_argument("--compare-load", action="store_true", help="from_pretrained와 매핑 로드 비교")
+    args = parser.parse_args()
+
+    artifact_dir = args.model_dir
+    if args.verify:
+        manifest = verify_artifact(artifact_dir, check_hashes=True)
+        if manifest is None:
+            print(f"매니페스트가 없습니다: {artifact_dir}")
+            sys.exit(1)
+        print(f"검증 완료: {len(manifest['files'])}개 파일 (생성 {manifest['created_at']})")
+    else:
+        manifest = write_artifact(args.model_dir, args.output)
+        artifact_dir = args.output or args.model_dir
+        print("=" * 60)
+        for name, entry in manifest["files"].items():
+            print(f"{name:<28} {entry['size'] / 1024 / 1024:9.2f}MB  {entry['sha256'][:16]}")
+        print(f"아티팩트: {artifact_dir}")
+        print("=" * 60)
+
+    if args.compare_load:
+        from transformers import AutoModelForSequenceClassification
+
+        if read_manifest(artifact_dir) is None:
+            print("매니페스트가 없어 비교하지 않습니다")
+            return
+        # 같은 프로세스에서 비교하므로 두 번째 로드는 페이지 캐시가 데워진 상태
+        measure_load("from_pretrained", lambda: AutoModelForSequenceClassification.from_pretrained(artifact_dir))
+        measure_load("mmap", lambda: load_mmap_model(artifact_dir))
+
+
+if __name__ == "__main__":
+    main()
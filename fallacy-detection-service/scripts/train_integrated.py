@@ -226,7 +226,13 @@ def main():
     # 학습 실행
     print("\n모델 학습 시작...")
     trainer = TrainingService()
-    trainer.train_model(final_records, output_dir="./models/korean_trained_model")
+    trainer.train_model(
+        final_records,
+        output_dir="./models/korean_trained_model",
+        tokenized_cache_dir=settings.TOKENIZED_CACHE_DIR or None,
+        batching=settings.TRAINING_BATCHING,
+        max_tokens_per_batch=settings.TRAINING_MAX_TOKENS_PER_BATCH
+    )
     print("✅ 모델 학습 완료")
 
 
@@ -0,0 +1,80 @@
+import re
+import zlib
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.models.fallacy_detector import CHUNK_ANCHOR_MODULUS, FallacyDetector, TopicPrefix, build_context_prefix
+from app.models.text_analyzer import TextAnalyzer
+
+
+class _Tokenizer:
+    """공백 단위 토큰 ID와 오프셋을 만드는 토크나이저 대역"""
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def build_inputs_with_special_tokens(self, input_ids):
+        return [1] + list(input_ids) + [2]
+
+    def encode(self, text):
+        matches = list(re.finditer(r"\S+", text))
+        return [zlib.crc32(m.group().encode("utf-8")) % 30000 + 5 for m in matches], [m.span() for m in matches]
+
+
+def _detector() -> FallacyDetector:
+    detector = FallacyDetector.__new__(FallacyDetector)
+    detector.tokenizer = _Tokenizer()
+    detector.text_analyzer = TextAnalyzer()
+    return detector
+
+
+def _paragraph(index: int, extra: str = "") -> str:
+    words = " ".join(f"단어{index}-{i}" for i in range(18 + index % 7))
+    return f"{words} 첫 문장입니다. {words} 둘째 문장입니다{extra}."
+
+
+def _chunks(detector, paragraphs):
+    text = "\n\n".join(paragraphs)
+    input_ids, offsets = detector.tokenizer.encode(text)
+    return [tuple(chunk.input_ids) for chunk in detector._split_into_chunks(text, input_ids, offsets, 512)]
+
+
+def _is_anchor(detector, paragraph: str) -> bool:
+    from array import array
+    ids, _ = detector.tokenizer.encode(paragraph)
+    return zlib.crc32(array("q", ids).tobytes()) % CHUNK_ANCHOR_MODULUS == 0
+
+
+def test_editing_one_paragraph_keeps_other_chunks():
+    detector = _detector()
+    paragraphs = [_paragraph(i) for i in range(30)]
+    before = _chunks(detector, paragraphs)
+    assert len(before) > 3
+
+    # 단락을 크게 줄이는 수정 (길이만으로 묶으면 뒤쪽 경계가 모두 밀림)
+    # 경계 여부가 바뀌지 않는 수정을 고름 (바뀌면 바로 다음 묶음까지 달라지는 것이 정상)
+    edited_index = 3
+    paragraphs[edited_index] = next(
+        edited for edited in (f"짧게 고친 단락 {n}입니다." for n in range(100))
+        if _is_anchor(detector, edited) == _is_anchor(detector, paragraphs[edited_index])
+    )
+    after = _chunks(detector, paragraphs)
+
+    changed = [chunk for chunk in before if chunk not in after]
+    assert len(changed) == 1
+    assert [chunk for chunk in before if chunk in after] == [chunk for chunk in after if chunk in before]
+
+
+def test_long_prefix_is_cut_at_sentence_end_and_keeps_instruction():
+    detector = _detector()
+    text = build_context_prefix("주제", " ".join(f"설명{i}." for i in range(200)))
+    input_ids, offsets = detector.tokenizer.encode(text)
+    prefix = TopicPrefix(text, input_ids, offsets)
+
+    fitted = detector._fit_prefix(prefix, 512)
+    tail_ids, _ = detector.tokenizer.encode("다음은 위 주제에 대한 논증입니다: ")
+    assert len(fitted) <= 512 // 4
+    assert fitted[-len(tail_ids):] == tail_ids
+    assert detector._fit_prefix(prefix, 512) is fitted
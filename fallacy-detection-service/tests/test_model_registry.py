@@ -0,0 +1,69 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")  # model_registry → fallacy_detector
+
+from app.services import model_registry as registry_module
+from app.services.executors import BoundedExecutor
+from app.services.model_registry import BASE_VERSION, MANIFEST_FILE, ModelRegistry
+
+
+class _Detector:
+    """워밍업만 통과하는 탐지기 대역"""
+
+    model = object()
+    model_version = "test"
+
+    def predict_batch(self, texts):
+        return [SimpleNamespace(explanation="") for _ in texts]
+
+
+def _registry(root_dir) -> ModelRegistry:
+    registry = ModelRegistry(str(root_dir), lambda path: _Detector(), BoundedExecutor("test-load"))
+    registry.load_initial(None)
+    return registry
+
+
+def _manifest(root_dir):
+    with open(root_dir / MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_registrations_from_two_workers_are_kept(tmp_path):
+    first, second = _registry(tmp_path), _registry(tmp_path)
+    first.register("v1", None, managed=False)
+    second.register("v2", None, managed=False)
+
+    assert {"v1", "v2"} <= set(_manifest(tmp_path)["versions"])
+    assert set(first.list_versions()["versions"]) == set(_manifest(tmp_path)["versions"])
+
+
+def test_other_worker_follows_activation_and_rollback(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "MANIFEST_POLL_SECONDS", 0.01)
+    first, second = _registry(tmp_path), _registry(tmp_path)
+    first.register("v1", None, managed=False)
+
+    async def wait_for(registry, version_id):
+        for _ in range(200):
+            if registry.active.version == version_id:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"{registry.active.version} != {version_id}")
+
+    async def scenario():
+        second.start_following()
+        try:
+            await first.activate("v1")
+            await wait_for(second, "v1")
+            await first.rollback()
+            await wait_for(second, BASE_VERSION)
+        finally:
+            second.stop_following()
+
+    asyncio.run(scenario())
+    manifest = _manifest(tmp_path)
+    assert manifest["active"] == BASE_VERSION
+    assert manifest["history"] == [BASE_VERSION]
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("numpy")  # _score_block → fallacy_detector
+
+from app.models.fallacy_detector import ANALYSIS_ERROR_EXPLANATION, FallacyResult
+from app.services import rescoring_service
+
+
+class _Detector:
+    """"실패"가 들어간 텍스트가 배치에 있으면 배치 전체를 실패로 돌려주는 탐지기 대역"""
+
+    model_version = "test"
+
+    def context_prefix(self, title, description):
+        return None
+
+    def predict_batch(self, texts, topics=None, prefixes=None):
+        failed = any("실패" in text for text in texts)
+        return [
+            FallacyResult(text, False, None, 0.0, ANALYSIS_ERROR_EXPLANATION) if failed
+            else FallacyResult(text, True, "ad_hominem", 0.9, "")
+            for text in texts
+        ]
+
+
+def test_failed_rows_are_recorded_with_error(monkeypatch):
+    monkeypatch.setattr(rescoring_service, "_worker_detector", _Detector())
+    rows = [(0, "a", "정상 논증", None, None), (1, "b", "실패 논증", None, None), (2, "c", "정상 논증", None, None)]
+
+    records = rescoring_service._score_block(rows)
+
+    assert [record["row"] for record in records] == [0, 1, 2]
+    assert records[1]["error"] == ANALYSIS_ERROR_EXPLANATION
+    assert "has_fallacy" not in records[1] and "confidence" not in records[1]
+    assert all("error" not in records[i] and records[i]["has_fallacy"] for i in (0, 2))
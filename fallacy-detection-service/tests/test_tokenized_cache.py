@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip("datasets")
+
+from app.services.tokenized_cache import TokenizedDatasetCache
+
+
+class _Tokenizer:
+    """글자 단위 토큰 ID를 만드는 토크나이저 대역"""
+
+    all_special_tokens = []
+
+    def get_vocab(self):
+        return {}
+
+    def __call__(self, texts, truncation=True, max_length=512, **kwargs):
+        return {"input_ids": [[ord(char) for char in text][:max_length] for text in texts]}
+
+
+def _cached_samples(cache: TokenizedDatasetCache) -> int:
+    from datasets import load_from_disk
+    return sum(len(load_from_disk(path)) for path in cache._shard_paths())
+
+
+def test_build_prunes_samples_missing_from_current_texts(tmp_path):
+    cache = TokenizedDatasetCache(str(tmp_path), _Tokenizer())
+    first = [f"첫 번째 학습 데이터 {i}" for i in range(5)]
+    second = [f"두 번째 학습 데이터 {i}" for i in range(3)]
+
+    cache.build(first)
+    assert _cached_samples(cache) == 5
+
+    dataset = cache.build(second)
+    assert dataset["input_ids"] == [[ord(char) for char in text] for text in second]
+    assert cache.stats["pruned"] == 5
+    assert _cached_samples(cache) == 3
+    assert len(os.listdir(cache.cache_dir)) == 1
+
+    cache.build(second)
+    assert cache.stats["cached"] == 3
+    assert cache.stats["tokenized"] == 0
@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")  # topic_registry → fallacy_detector
+
+from app.services.executors import BoundedExecutor
+from app.services.topic_registry import FileTopicStore, TopicRegistry
+
+
+class _Scorer:
+    model = None
+
+    def topic_key(self, title, description):
+        return None
+
+
+class _Detector:
+    """토픽 산출물 계산에 필요한 부분만 있는 탐지기 대역"""
+
+    model_version = "test"
+    relevance_scorer = _Scorer()
+
+    def encode_prefix(self, prefix):
+        return SimpleNamespace(input_ids=list(range(len(prefix or ""))))
+
+
+def _registry(root_dir) -> TopicRegistry:
+    return TopicRegistry(_Detector(), BoundedExecutor("test-topics"), shared=FileTopicStore(str(root_dir)))
+
+
+def test_topic_registered_on_one_worker_is_found_on_another(tmp_path):
+    first, second = _registry(tmp_path), _registry(tmp_path)
+
+    async def scenario():
+        await first.register("topic-1", "토론 주제", "주제 설명")
+        seen = await second.get("topic-1")
+        assert seen is not None
+        assert (seen.title, seen.description) == ("토론 주제", "주제 설명")
+
+        await first.register("topic-1", "바뀐 주제", None)
+        assert (await second.get("topic-1")).title == "바뀐 주제"
+
+        assert await second.evict("topic-1")
+        assert await first.get("topic-1") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,84 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")  # training_jobs → model_registry → fallacy_detector
+
+from app.services.executors import ExecutorBusyError
+from app.services.training_jobs import CANCELLED, FAILED, QUEUED, RUNNING, TrainingJobManager
+
+SAMPLES = [{"text": "모든 사람이 그렇게 생각하니까 이 주장은 옳다.", "label": "bandwagon"}]
+
+
+class _Registry:
+    """작업 저장소 위치만 제공하는 모델 레지스트리 대역 (작업을 실행하지 않는 테스트용)"""
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+
+def _manager(root_dir, **kwargs) -> TrainingJobManager:
+    return TrainingJobManager(_Registry(str(root_dir)), **kwargs)
+
+
+def test_job_is_visible_through_second_manager(tmp_path):
+    first, second = _manager(tmp_path), _manager(tmp_path)
+    job = first._enqueue(SAMPLES)
+
+    seen = asyncio.run(second.get(job.job_id))
+    assert seen is not None
+    assert seen.status == QUEUED
+    assert seen.samples == len(SAMPLES)
+    assert [listed["job_id"] for listed in asyncio.run(second.list_jobs())] == [job.job_id]
+    assert asyncio.run(second.get_stats())["queued"] == 1
+
+
+def test_cancel_through_second_manager(tmp_path):
+    first, second = _manager(tmp_path), _manager(tmp_path)
+    job = first._enqueue(SAMPLES)
+
+    cancelled = asyncio.run(second.cancel(job.job_id))
+    assert cancelled.status == CANCELLED
+    assert asyncio.run(first.get(job.job_id)).status == CANCELLED
+    assert first.store.load_data(job.job_id) is None
+
+
+def test_queue_limit_is_shared(tmp_path):
+    first, second = _manager(tmp_path, max_queued=1), _manager(tmp_path, max_queued=1)
+    first._enqueue(SAMPLES)
+    with pytest.raises(ExecutorBusyError):
+        second._enqueue(SAMPLES)
+
+
+def test_only_one_job_runs_across_managers(tmp_path):
+    first, second = _manager(tmp_path), _manager(tmp_path)
+    first._enqueue(SAMPLES)
+    first._enqueue(SAMPLES)
+
+    claimed = first._claim()
+    assert claimed is not None
+    assert claimed.training_data == SAMPLES
+    # 첫 작업을 실행 중인 프로세스가 살아 있으므로 다른 관리자는 다음 작업을 가져가지 않음
+    assert second._claim() is None
+
+
+def test_job_of_exited_worker_is_failed_and_next_job_runs(tmp_path):
+    first, second = _manager(tmp_path), _manager(tmp_path)
+    orphan = first._enqueue(SAMPLES)
+    waiting = first._enqueue(SAMPLES)
+    first._claim()
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+
+    def move_owner(jobs):
+        jobs[orphan.job_id]["owner_pid"] = exited.pid
+    first.store.update(move_owner)
+
+    claimed = second._claim()
+    assert claimed.job_id == waiting.job_id
+    jobs = second.store.jobs()
+    assert jobs[orphan.job_id]["status"] == FAILED
+    assert jobs[waiting.job_id]["status"] == RUNNING
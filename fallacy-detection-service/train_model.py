@@ -12,6 +12,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.services.training_service import TrainingService
+from config.settings import settings
 
 def main():
     print("=" * 60)
@@ -54,7 +55,11 @@ def main():
     start_time = time.time()
     
     try:
-        model_path = training_service.train_model(training_data, output_dir)
+        # 토크나이징 결과는 캐시하여 다음 학습에서 바뀐 샘플만 다시 토크나이징
+        model_path = training_service.train_model(
+            training_data, output_dir, tokenized_cache_dir=settings.TOKENIZED_CACHE_DIR or None,
+            batching=settings.TRAINING_BATCHING, max_tokens_per_batch=settings.TRAINING_MAX_TOKENS_PER_BATCH
+        )
         
         elapsed_time = time.time() - start_time
         minutes = int(elapsed_time // 60)
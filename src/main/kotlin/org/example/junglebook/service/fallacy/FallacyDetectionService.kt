@@ -86,14 +86,22 @@ class FallacyDetectionService(
         }.orTimeout(timeout.toLong(), TimeUnit.MILLISECONDS)
     }
 
-    fun batchDetectFallacy(texts: List<String>, language: String = "ko"): List<FallacyDetectionResponse> {
+    fun batchDetectFallacy(
+        texts: List<String>,
+        language: String = "ko",
+        topicTitle: String? = null,
+        topicDescription: String? = null
+    ): List<FallacyDetectionResponse> {
         return try {
             val url = "$serviceUrl/detect/batch"
-            val request = mapOf(
-                "texts" to texts,
+            val request = mutableMapOf<String, Any>(
+                "items" to texts.map { mapOf("text" to it) },
                 "language" to language
             )
             
+            topicTitle?.let { request["topic_title"] = it }
+            topicDescription?.let { request["topic_description"] = it }
+            
             logger.debug("Calling batch fallacy detection service: $url")
             
             val response = restTemplate.postForObject(
@@ -7,9 +7,11 @@ import org.example.junglebook.repository.debate.DebateArgumentRepository
 import org.example.junglebook.service.fallacy.FallacyAppealService
 import org.slf4j.LoggerFactory
 import org.springframework.beans.factory.annotation.Value
+import org.springframework.scheduling.annotation.Scheduled
 import org.springframework.stereotype.Service
 import org.springframework.transaction.annotation.Isolation
 import org.springframework.transaction.annotation.Transactional
+import java.util.concurrent.ConcurrentHashMap
 
 @Service
 class FallacyRetrainingService(
@@ -23,9 +25,21 @@ class FallacyRetrainingService(
         private val logger = LoggerFactory.getLogger(FallacyRetrainingService::class.java)
     }
 
+    // 진행 중인 재학습 작업 (작업 ID -> 학습 데이터 ID, 등록 시각)
+    private data class PendingRetrainingJob(val trainingDataIds: List<Long>, val submittedAt: Long)
+
+    private val pendingJobs = ConcurrentHashMap<String, PendingRetrainingJob>()
+
     @Value("\${fallacy.detection.appeal.threshold:100}")
     private val retrainThreshold: Int = 100
 
+    @Value("\${fallacy.detection.service.url:http://localhost:8000/api/v1}")
+    private val serviceUrl: String = "http://localhost:8000/api/v1"
+
+    // 재학습 작업 최대 추적 시간 (CPU 재학습은 수 시간 걸릴 수 있음, 조회 간격은 pollRetrainingJobs의 poll-interval-ms)
+    @Value("\${fallacy.detection.retrain.timeout-ms:21600000}")
+    private val retrainTimeoutMs: Long = 21600000
+
     @Transactional(isolation = Isolation.REPEATABLE_READ, rollbackFor = [Exception::class])
     fun collectTrainingData() {
         val appealedArguments = fallacyAppealService.getAppealedArgumentsForRetraining()
@@ -64,17 +78,21 @@ class FallacyRetrainingService(
         return trainingDataRepository.countUnusedTrainingData()
     }
 
-    fun triggerRetraining() {
+    /**
+     * 재학습 작업을 등록하고 작업 ID를 바로 반환 (완료 여부는 pollRetrainingJobs에서 확인)
+     */
+    fun triggerRetraining(): String? {
         logger.info("Triggering retraining...")
         
         // 1. 재학습 데이터 수집
         collectTrainingData()
         
-        // 2. 미사용 학습 데이터 확인
-        val unusedData = getUnusedTrainingData()
+        // 2. 미사용 학습 데이터 확인 (진행 중인 작업에 넘긴 데이터는 제외)
+        val pendingIds = pendingJobs.values.flatMap { it.trainingDataIds }.toSet()
+        val unusedData = getUnusedTrainingData().filter { it.id !in pendingIds }
         if (unusedData.isEmpty()) {
             logger.warn("No unused training data available for retraining")
-            return
+            return null
         }
         
         logger.info("Found ${unusedData.size} unused training data samples")
@@ -87,41 +105,97 @@ class FallacyRetrainingService(
             )
         }
         
-        val retrainingResult = triggerPythonRetraining(trainingDataList)
+        val response = triggerPythonRetraining(trainingDataList) ?: run {
+            logger.warn("Retraining request failed, data not marked as used")
+            return null
+        }
         
-        if (retrainingResult) {
-            // 4. 사용된 데이터로 표시
-            markDataAsUsed(unusedData)
-            logger.info("Retraining triggered successfully")
+        // 재학습은 작업으로 등록되므로 작업 ID만 기록하고, 데이터는 작업이 성공으로 끝난 뒤 사용된 것으로 표시
+        val status = response["status"] as? String
+        val jobId = response["job_id"] as? String
+        if (status == "queued" && jobId != null) {
+            pendingJobs[jobId] = PendingRetrainingJob(unusedData.mapNotNull { it.id }, System.currentTimeMillis())
+            logger.info("Retraining job queued: jobId=$jobId, samples=${unusedData.size}")
+            return jobId
+        }
+        if (status == "success") {
+            // 작업 ID 없이 바로 끝나는 응답
+            markDataAsUsed(unusedData.mapNotNull { it.id })
+            logger.info("Retraining completed synchronously")
         } else {
-            logger.warn("Retraining failed, data not marked as used")
+            logger.warn("Retraining was not accepted (status=$status), data not marked as used")
         }
+        return null
     }
 
-    private fun triggerPythonRetraining(trainingData: List<Map<String, String>>): Boolean {
+    private fun triggerPythonRetraining(trainingData: List<Map<String, String>>): Map<*, *>? {
         return try {
-            val serviceUrl = "http://localhost:8000/api/v1"
             val url = "$serviceUrl/retrain"
             val request = mapOf("training_data" to trainingData)
             
             val restTemplate = org.springframework.web.client.RestTemplate()
-            val response = restTemplate.postForObject(
+            restTemplate.postForObject(
                 url,
                 request,
                 Map::class.java
             )
-            
-            val status = response?.get("status") as? String
-            status == "success"
         } catch (e: Exception) {
             logger.error("Failed to trigger Python retraining: ${e.message}", e)
-            false
+            null
+        }
+    }
+
+    /**
+     * 진행 중인 재학습 작업 상태를 주기적으로 조회
+     * - succeeded: 학습 데이터를 사용된 것으로 표시
+     * - failed / cancelled: 데이터는 미사용으로 남겨 다음 재학습에 포함
+     * - 조회 실패(일시적인 오류, 404 포함)는 다음 주기에 다시 조회하고, 최대 추적 시간이 지나면 추적만 중단
+     */
+    @Scheduled(fixedDelayString = "\${fallacy.detection.retrain.poll-interval-ms:10000}")
+    fun pollRetrainingJobs() {
+        if (pendingJobs.isEmpty()) {
+            return
+        }
+        val restTemplate = org.springframework.web.client.RestTemplate()
+        pendingJobs.forEach { (jobId, pending) ->
+            try {
+                val job = restTemplate.getForObject("$serviceUrl/retrain/jobs/$jobId", Map::class.java)
+                if (job != null) {
+                    handleRetrainingJobStatus(jobId, pending, job)
+                    return@forEach
+                }
+            } catch (e: Exception) {
+                logger.warn("Could not poll retraining job, retrying: jobId=$jobId, error=${e.message}")
+            }
+            if (System.currentTimeMillis() - pending.submittedAt > retrainTimeoutMs) {
+                pendingJobs.remove(jobId)
+                logger.warn("Stopped tracking retraining job after timeout, data not marked as used: jobId=$jobId")
+            }
+        }
+    }
+
+    private fun handleRetrainingJobStatus(jobId: String, pending: PendingRetrainingJob, job: Map<*, *>) {
+        val progress = job["progress"] as? Map<*, *>
+        when (val status = job["status"] as? String) {
+            "succeeded" -> {
+                markDataAsUsed(pending.trainingDataIds)
+                pendingJobs.remove(jobId)
+                logger.info("Retraining job completed: jobId=$jobId, version=${job["version"]}")
+            }
+            "failed", "cancelled" -> {
+                pendingJobs.remove(jobId)
+                logger.warn("Retraining job $status, data not marked as used: jobId=$jobId, error=${job["error"]}")
+            }
+            else -> logger.debug(
+                "Retraining job $status: jobId=$jobId, step=${progress?.get("step")}/${progress?.get("max_steps")}, " +
+                    "loss=${progress?.get("loss")}, eta=${progress?.get("eta_seconds")}s"
+            )
         }
     }
 
     @Transactional(isolation = Isolation.REPEATABLE_READ, rollbackFor = [Exception::class])
-    private fun markDataAsUsed(data: List<DebateArgumentFallacyTrainingDataEntity>) {
-        data.forEach { trainingData ->
+    private fun markDataAsUsed(trainingDataIds: List<Long>) {
+        trainingDataRepository.findAllById(trainingDataIds).forEach { trainingData ->
             trainingData.usedForTraining = true
             trainingDataRepository.save(trainingData)
         }
@@ -143,8 +143,10 @@ class DebateArgumentFallacyController(
     fun triggerRetraining(
         @AuthenticationPrincipal member: Member
     ): ResponseEntity<Map<String, String>> {
-        fallacyRetrainingService.triggerRetraining()
-        return ResponseEntity.ok(mapOf("status" to "retraining_triggered"))
+        // 재학습은 작업으로 등록되고 완료 여부는 백그라운드에서 조회 (작업 ID로 진행 상황 확인 가능)
+        val jobId = fallacyRetrainingService.triggerRetraining()
+            ?: return ResponseEntity.ok(mapOf("status" to "retraining_not_started"))
+        return ResponseEntity.ok(mapOf("status" to "retraining_triggered", "job_id" to jobId))
     }
 
     @Operation(summary = "재학습 데이터 수집 (관리자)")